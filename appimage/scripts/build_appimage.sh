@@ -27,7 +27,7 @@ echo "Criando AppImage (dependências do sistema serão usadas)..."
 
 # Copiar arquivos se necessário
 if [ ! -f "WaveControl.AppDir/usr/bin/main.py" ]; then
-    cp main.py WaveControl.AppDir/usr/bin/
+    cp *.py gestures.json WaveControl.AppDir/usr/bin/
 fi
 
 if [ ! -f "WaveControl.AppDir/usr/bin/WaveControl" ]; then
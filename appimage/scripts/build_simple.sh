@@ -14,7 +14,7 @@ mkdir -p WaveControl.AppDir/usr/share/applications
 mkdir -p WaveControl.AppDir/usr/share/icons/hicolor/256x256/apps
 
 # Copiar arquivos principais
-cp ../../main.py WaveControl.AppDir/
+cp ../../*.py ../../gestures.json WaveControl.AppDir/
 
 # Criar AppRun
 cat > WaveControl.AppDir/AppRun << 'EOF'
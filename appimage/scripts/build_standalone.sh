@@ -142,9 +142,75 @@ WaveControl.AppDir/usr/bin/pip3 install "PyGObject${PYGOBJECT_VERSION}" || {
 
 echo "✅ Dependências instaladas com sucesso!"
 
+# ===== Runtime enxuto =====
+# Só o modelo de mãos é carregado. Modelos das outras soluções do MediaPipe,
+# model_maker e as dependências pesadas que o pip traz junto (jax/jaxlib e
+# scipy só servem ao model_maker/conversores; matplotlib só ao plot_landmarks)
+# aumentam a imagem e o tempo de montagem/extração a cada partida.
+echo "✂️  Enxugando o runtime (só o modelo de mãos é usado)..."
+PY=WaveControl.AppDir/usr/bin/python3
+PYROOT=WaveControl.AppDir/usr/python3.11
+STDLIB="${PYROOT}/lib/python3.11"
+SITE="${STDLIB}/site-packages"
+MP="${SITE}/mediapipe"
+SIZE_BEFORE=$(du -sm WaveControl.AppDir | cut -f1)
+
+# drawing_utils importa matplotlib no topo, só para plot_landmarks (que o app
+# não usa): o import passa para dentro da função e o matplotlib pode sair
+if "${PY}" - "${MP}/python/solutions/drawing_utils.py" << 'PYEOF'
+import re
+import sys
+
+path = sys.argv[1]
+with open(path) as f:
+    source = f.read()
+top_import = "import matplotlib.pyplot as plt\n"
+plot = re.search(r'def plot_landmarks\(.*?\):\n(\s+)""".*?"""\n', source, re.S)
+if top_import not in source or plot is None:
+    sys.exit(1)
+source = source[:plot.end()] + f"{plot.group(1)}import matplotlib.pyplot as plt  # carregado só aqui (WaveControl)\n" + source[plot.end():]
+with open(path, "w") as f:
+    f.write(source.replace(top_import, "", 1))
+PYEOF
+then
+    WaveControl.AppDir/usr/bin/pip3 uninstall -y -q matplotlib contourpy cycler fonttools kiwisolver pillow
+else
+    echo "⚠️  drawing_utils.py mudou nesta versão do MediaPipe: mantendo o matplotlib"
+fi
+WaveControl.AppDir/usr/bin/pip3 uninstall -y -q jax jaxlib scipy ml-dtypes opt-einsum sounddevice
+
+# Modelos das soluções que não são de mãos (os .py ficam: o MediaPipe importa
+# os módulos de todas as soluções, mas só abre o modelo da que é criada)
+for solution in face_detection face_geometry face_landmark holistic_landmark iris_landmark \
+                objectron pose_detection pose_landmark selfie_segmentation; do
+    find "${MP}/modules/${solution}" -type f \( -name '*.tflite' -o -name '*.binarypb' \) -delete 2>/dev/null || true
+done
+rm -rf "${MP}/model_maker" "${MP}/examples"
+find "${MP}" -type d \( -name test -o -name testdata \) -prune -exec rm -rf {} +
+find "${MP}" -name '*_test.py' -delete
+find "${SITE}" -type d -name tests -prune -exec rm -rf {} +
+
+# Partes da biblioteca padrão e do Python que só servem para desenvolvimento
+rm -rf "${STDLIB}"/{test,idlelib,tkinter,turtledemo,ensurepip,lib2to3} "${STDLIB}"/config-3.11-*
+rm -rf "${PYROOT}"/include "${PYROOT}"/lib/{tcl8,tcl8.6,tk8.6,itcl4*,thread2*} "${PYROOT}"/lib/lib{tcl,tk}8*
+rm -f "${STDLIB}"/lib-dynload/_tkinter*.so
+
+# O runtime enxuto precisa continuar carregando tudo que o app usa
+"${PY}" -c "
+import cv2, mediapipe
+from mediapipe.tasks.python import vision
+mediapipe.solutions.hands.Hands(max_num_hands=1, model_complexity=0).close()
+" || {
+    echo "❌ Erro: o runtime enxuto não carrega o MediaPipe"
+    exit 1
+}
+WaveControl.AppDir/usr/bin/pip3 uninstall -y -q pip
+rm -f WaveControl.AppDir/usr/bin/pip3
+echo "✅ Runtime enxuto: ${SIZE_BEFORE} MB → $(du -sm WaveControl.AppDir | cut -f1) MB"
+
 # Copiar arquivo principal (SEMPRE a versão mais atual)
-echo "📋 Copiando main.py atual para o AppImage..."
-cp ../../main.py WaveControl.AppDir/usr/bin/
+echo "📋 Copiando main.py e módulos atuais para o AppImage..."
+cp ../../*.py ../../gestures.json WaveControl.AppDir/usr/bin/
 echo "✅ main.py copiado - versão: $(date '+%Y-%m-%d %H:%M:%S')"
 
 # Verificar se copiou corretamente
@@ -153,17 +219,41 @@ if [ ! -f "WaveControl.AppDir/usr/bin/main.py" ]; then
     exit 1
 fi
 
+# Versão (startup.py registra o tempo de partida por versão) e identificador
+# do build (chave dos caches do AppRun)
+VERSION=$(git -C ../.. describe --tags --always --dirty 2>/dev/null || date '+%Y%m%d')
+printf '%s\n%s\n' "${VERSION}" "${VERSION}-$(date '+%Y%m%d%H%M%S')" > WaveControl.AppDir/usr/bin/VERSION
+echo "🏷️  Versão: ${VERSION}"
+
+# ===== Bytecode pré-compilado =====
+# A imagem é só leitura: um .pyc que falta ou não confere é recompilado em
+# memória a cada partida. unchecked-hash também dispensa o stat do fonte.
+echo "⚙️  Pré-compilando bytecode..."
+"${PY}" -m compileall -q -f -j 0 --invalidation-mode unchecked-hash \
+    WaveControl.AppDir/usr/bin "${STDLIB}" >/dev/null || \
+    echo "⚠️  Alguns arquivos não foram compilados (serão compilados na partida)"
+
 # Criar AppRun totalmente autônomo
 cat > WaveControl.AppDir/AppRun << 'EOF'
 #!/bin/bash
 # AppRun totalmente autônomo com Python 3.11 embutido
 
-HERE="$(dirname "$(readlink -f "${0}")")"
+now_ns() {
+    if [ -n "${EPOCHREALTIME}" ]; then
+        echo "${EPOCHREALTIME/[.,]/}000"
+    else
+        date +%s%N
+    fi
+}
 
-# Configurar ambiente Python embutido
-export PYTHONHOME="${HERE}/usr/python3.11"
-export PYTHONPATH="${HERE}/usr/python3.11/lib/python3.11:${HERE}/usr/python3.11/lib/python3.11/site-packages"
-export LD_LIBRARY_PATH="${HERE}/usr/python3.11/lib:${LD_LIBRARY_PATH}"
+# Início do AppRun: startup.py separa a montagem do resto da partida
+export WAVECONTROL_APPRUN_NS="$(now_ns)"
+
+HERE="$(dirname "$(readlink -f "${0}")")"
+{ read -r WAVECONTROL_VERSION; read -r BUILD_ID; } < "${HERE}/usr/bin/VERSION"
+export WAVECONTROL_VERSION
+CACHE="${XDG_CACHE_HOME:-$HOME/.cache}/wavecontrol"
+BUILD_TAG="${BUILD_ID//[^A-Za-z0-9._-]/_}"
 export PATH="${HERE}/usr/bin:${PATH}"
 
 # Função para verificar se FUSE está disponível
@@ -175,81 +265,93 @@ check_fuse() {
     fi
 }
 
-# Função para extrair AppImage e executar
-run_extracted() {
-    echo "🔧 FUSE não disponível - Extraindo AppImage..."
-    
-    # Criar diretório temporário
-    TEMP_DIR=$(mktemp -d -t wavecontrol-XXXXXX)
-    trap "rm -rf '$TEMP_DIR'" EXIT
-    
-    # Extrair AppImage
-    cd "$TEMP_DIR"
-    "${HERE}/../" --appimage-extract >/dev/null 2>&1 || {
-        echo "❌ Erro ao extrair AppImage"
-        exit 1
-    }
-    
-    # Executar aplicação extraída
-    cd squashfs-root
-    export PYTHONHOME="${PWD}/usr/python3.11"
-    export PYTHONPATH="${PWD}/usr/python3.11/lib/python3.11:${PWD}/usr/python3.11/lib/python3.11/site-packages"
-    export LD_LIBRARY_PATH="${PWD}/usr/python3.11/lib:${LD_LIBRARY_PATH}"
-    
-    exec "${PWD}/usr/python3.11/bin/python3.11" "${PWD}/usr/bin/main.py" "$@"
+# Verifica GTK3 e as dependências empacotadas num único processo, só na
+# primeira execução de cada build (as seguintes vão direto para o app)
+check_deps() {
+    DEPS_STAMP="${CACHE}/deps-ok-${BUILD_TAG}"
+    [ -f "${DEPS_STAMP}" ] && return 0
+    echo "🔍 Primeira execução desta versão: verificando dependências..."
+    "$1/usr/python3.11/bin/python3.11" - << 'PYEOF' || exit 1
+import sys
+
+try:
+    import gi
+    gi.require_version('Gtk', '3.0')
+    from gi.repository import Gtk  # noqa: F401
+except (ImportError, ValueError):
+    print("")
+    print("⚠️  DEPENDÊNCIA FALTANDO: GTK3 (única dependência do sistema)")
+    print("")
+    print("Instale GTK3:")
+    print("Ubuntu/Debian: sudo apt install gir1.2-gtk-3.0")
+    print("Fedora:        sudo dnf install gtk3-devel")
+    print("Arch:          sudo pacman -S gtk3")
+    print("")
+    sys.exit(1)
+try:
+    import cv2
+    print(f"✅ OpenCV {cv2.__version__} OK")
+except ImportError:
+    print("❌ Erro: OpenCV não pôde ser carregado")
+    sys.exit(1)
+try:
+    import mediapipe  # noqa: F401
+    print("✅ MediaPipe OK")
+except ImportError:
+    print("❌ Erro: MediaPipe não pôde ser carregado")
+    sys.exit(1)
+PYEOF
+    mkdir -p "${CACHE}"
+    rm -f "${CACHE}"/deps-ok-*
+    touch "${DEPS_STAMP}"
 }
 
-echo "🚀 WaveControl Standalone"
-echo "   Python 3.11 embutido - Zero dependências!"
-
-# Verificar se PyGObject está disponível no sistema (ainda precisa do GTK3)
-if ! "${HERE}/usr/python3.11/bin/python3.11" -c "import gi; gi.require_version('Gtk', '3.0'); from gi.repository import Gtk" 2>/dev/null; then
-    echo ""
-    echo "⚠️  DEPENDÊNCIA FALTANDO: GTK3 (única dependência do sistema)"
-    echo ""
-    echo "Instale GTK3:"
-    echo "Ubuntu/Debian: sudo apt install gir1.2-gtk-3.0"
-    echo "Fedora:        sudo dnf install gtk3-devel"
-    echo "Arch:          sudo pacman -S gtk3"
-    echo ""
-    exit 1
-fi
-
-echo "🔍 Verificando dependências empacotadas..."
-
-# Testar dependências usando Python embutido
-if "${HERE}/usr/python3.11/bin/python3.11" -c "import cv2; print(f'✅ OpenCV {cv2.__version__} OK')" 2>/dev/null; then
-    echo "✅ OpenCV OK"
-else
-    echo "❌ Erro: OpenCV não pôde ser carregado"
-    exit 1
-fi
+# Executa o app a partir da raiz dada (montagem ou extração)
+run_app() {
+    ROOT="$1"
+    shift
+    export PYTHONHOME="${ROOT}/usr/python3.11"
+    export PYTHONPATH="${ROOT}/usr/python3.11/lib/python3.11:${ROOT}/usr/python3.11/lib/python3.11/site-packages"
+    export LD_LIBRARY_PATH="${ROOT}/usr/python3.11/lib:${LD_LIBRARY_PATH}"
+    cd "${ROOT}/usr/bin"
+    # -m usa o bytecode pré-compilado também para o módulo principal
+    if [ "$1" = "--startup-check" ]; then
+        shift
+        exec "${ROOT}/usr/python3.11/bin/python3.11" -m startup check "$@"
+    fi
+    check_deps "${ROOT}"
+    exec "${ROOT}/usr/python3.11/bin/python3.11" -m main "$@"
+}
 
-if "${HERE}/usr/python3.11/bin/python3.11" -c "import mediapipe as mp; print('✅ MediaPipe OK')" 2>/dev/null; then
-    echo "✅ MediaPipe OK"
-else
-    echo "❌ Erro: MediaPipe não pôde ser carregado"
-    exit 1
-fi
+# Sem FUSE: extrai uma vez por build para o cache do usuário e reaproveita
+run_extracted() {
+    EXTRACT_DIR="${CACHE}/appimage-${BUILD_TAG}"
+    if [ ! -f "${EXTRACT_DIR}/.ok" ]; then
+        echo "🔧 FUSE não disponível - Extraindo AppImage (só na primeira execução desta versão)..."
+        rm -rf "${CACHE}"/appimage-*
+        mkdir -p "${EXTRACT_DIR}"
+        cd "${EXTRACT_DIR}"
+        "${APPIMAGE}" --appimage-extract >/dev/null 2>&1 || {
+            rm -rf "${EXTRACT_DIR}"
+            echo "❌ Erro ao extrair AppImage"
+            exit 1
+        }
+        touch "${EXTRACT_DIR}/.ok"
+        export WAVECONTROL_EXTRACTED_NS="$(now_ns)"
+    fi
+    run_app "${EXTRACT_DIR}/squashfs-root" "$@"
+}
 
-echo "🚀 Todas as dependências OK! Iniciando WaveControl..."
+echo "🚀 WaveControl Standalone ${WAVECONTROL_VERSION}"
+echo "   Python 3.11 embutido - Zero dependências!"
 
 # Verificar se estamos sendo executados como AppImage ou extraído
-if [ -n "$APPIMAGE" ]; then
-    # Sendo executado como AppImage
-    if check_fuse; then
-        echo "✅ FUSE disponível - Executando normalmente"
-        cd "${HERE}/usr/bin"
-        exec "${HERE}/usr/python3.11/bin/python3.11" "${HERE}/usr/bin/main.py" "$@"
-    else
-        echo "⚠️  FUSE não disponível - Mudando para modo extraído"
-        run_extracted "$@"
-    fi
-else
-    # Já extraído ou sendo executado diretamente
-    cd "${HERE}/usr/bin"
-    exec "${HERE}/usr/python3.11/bin/python3.11" "${HERE}/usr/bin/main.py" "$@"
+if [ -n "$APPIMAGE" ] && ! check_fuse; then
+    echo "⚠️  FUSE não disponível - Mudando para modo extraído"
+    run_extracted "$@"
 fi
+# Montado pelo runtime do AppImage, já extraído ou executado diretamente
+run_app "${HERE}" "$@"
 EOF
 
 chmod +x WaveControl.AppDir/AppRun
@@ -314,6 +416,20 @@ fi
 
 echo "✅ AppImage criado e verificado com sucesso!"
 
+# ===== Tempo de partida =====
+# Lançamento → pronto sem câmera e sem janela (imports, modelo e primeira
+# inferência), anexado ao histórico versionado em appimage/startup_times.jsonl
+echo ""
+echo "⏱️  Medindo lançamento → pronto..."
+STARTUP_LOG="$(cd .. && pwd)/startup_times.jsonl"
+for run in 1 2 3; do
+    ../WaveControl-x86_64.AppImage --startup-check --log "${STARTUP_LOG}" 2>/dev/null | grep "Partida" || {
+        echo "⚠️  Não foi possível medir a partida (execução ${run})"
+        break
+    }
+done
+[ -f "${STARTUP_LOG}" ] && "${PY}" WaveControl.AppDir/usr/bin/startup.py summary --log "${STARTUP_LOG}"
+
 # Mostrar informações
 echo ""
 echo "=========================================================="
@@ -327,6 +443,7 @@ echo "   • Funciona COM FUSE (modo normal)"
 echo "   • Funciona SEM FUSE (extrai automaticamente)"
 echo "   • Detecta ambiente automaticamente"
 echo "   • Inclui TUDO: OpenCV, MediaPipe, PyGObject"
+echo "   • Runtime enxuto (só o modelo de mãos) e bytecode pré-compilado"
 echo ""
 echo "⚠️  ÚNICA DEPENDÊNCIA DO SISTEMA:"
 echo "   • GTK3 (para interface gráfica - disponível em qualquer Linux)"
@@ -38,7 +38,7 @@ pip3 install --target=WaveControl.AppDir/usr/lib/python3/site-packages \
 echo "Dependências instaladas com sucesso!"
 
 # Copiar arquivo principal
-cp ../../main.py WaveControl.AppDir/usr/bin/
+cp ../../*.py ../../gestures.json WaveControl.AppDir/usr/bin/
 
 # Criar script de extração e execução sem FUSE
 cat > WaveControl.AppDir/AppRun << 'EOF'
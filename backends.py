@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Backends de inferência de mãos do WaveControl.
+
+Todos os backends recebem um frame RGB e devolvem um ``HandsResult`` com a
+mesma estrutura do ``mp.solutions.hands`` (listas de landmarks normalizados
+e rótulos de lateralidade), de forma que ``classify_gesture`` e o desenho
+de landmarks funcionem sem mudanças.
+
+- ``solutions``: ``mp.solutions.hands.Hands`` (síncrono, padrão).
+- ``tasks``: ``HandLandmarker`` do MediaPipe Tasks em modo LIVE_STREAM. O
+  frame é enviado com timestamp e o resultado chega por callback, então o
+  loop de captura nunca espera o modelo; ``process`` devolve o resultado
+  mais recente ainda não entregue, ou ``None`` se nenhum chegou desde a
+  chamada anterior (o mesmo resultado nunca ocupa duas posições do filtro).
+- ``tflite``: interpretador TFLite direto com XNNPACK e número de threads
+  configurável (ver ``tflite_backend.py``).
+"""
+import os
+import threading
+import time
+
+import mediapipe as mp
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+# ===== Configurações =====
+MIN_DET = 0.6
+MIN_TRK = 0.6
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HAND_LANDMARKER_MODEL = os.path.join(BASE_DIR, "models", "hand_landmarker.task")
+HAND_LANDMARKER_URL = ("https://storage.googleapis.com/mediapipe-models/hand_landmarker/"
+                       "hand_landmarker/float16/latest/hand_landmarker.task")
+WARMUP_FRAMES = 5        # frames sintéticos processados no warm-up
+WARMUP_TIMEOUT_S = 5.0   # espera máxima por resultados assíncronos do warm-up
+
+
+class HandsResult:
+    """Resultado de inferência independente do backend"""
+
+    def __init__(self, multi_hand_landmarks, multi_handedness, timestamp_ms=None, latency_ms=None):
+        self.multi_hand_landmarks = multi_hand_landmarks  # lista de NormalizedLandmarkList
+        self.multi_handedness = multi_handedness          # lista de "Left"/"Right"
+        self.timestamp_ms = timestamp_ms                  # timestamp do frame de origem
+        self.latency_ms = latency_ms                      # envio do frame → resultado
+
+
+def to_landmark_list(points):
+    """Converte pontos com atributos x/y/z para ``NormalizedLandmarkList``"""
+    lm_list = landmark_pb2.NormalizedLandmarkList()
+    lm_list.landmark.extend(
+        landmark_pb2.NormalizedLandmark(x=p.x, y=p.y, z=p.z) for p in points
+    )
+    return lm_list
+
+
+def landmark_list_from_array(points):
+    """Converte um array (21, 3) normalizado para ``NormalizedLandmarkList``"""
+    lm_list = landmark_pb2.NormalizedLandmarkList()
+    lm_list.landmark.extend(
+        landmark_pb2.NormalizedLandmark(x=x, y=y, z=z) for x, y, z in points.tolist()
+    )
+    return lm_list
+
+
+class InferenceBackend:
+    """Interface comum dos backends de inferência"""
+    name = "base"
+    asynchronous = False
+    warmup_s = None  # duração do último warm-up (None = ainda não aquecido)
+
+    def process(self, rgb, timestamp_ms=None):
+        """Processa um frame RGB e retorna ``HandsResult`` (ou ``None`` se
+        nenhum resultado novo estiver disponível; o frame não deve contar)"""
+        raise NotImplementedError
+
+    def warmup(self, width, height, frames=WARMUP_FRAMES):
+        """Roda frames sintéticos na resolução de inferência para pagar a
+        montagem do grafo e a alocação de memória antes do primeiro frame real"""
+        # Ruído faz a detecção de palma rodar por completo, como no pior caso
+        rgb = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+        start = time.perf_counter()
+        for _ in range(frames):
+            self.process(rgb)
+        self._finish_warmup()
+        self.warmup_s = time.perf_counter() - start
+        return self.warmup_s
+
+    def _finish_warmup(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class BackendWarmup(threading.Thread):
+    """Executa o warm-up em paralelo (ex.: enquanto a câmera abre)"""
+
+    def __init__(self, backend, width, height, frames=WARMUP_FRAMES):
+        super().__init__(daemon=True)
+        self.backend = backend
+        self.size = (width, height)
+        self.frames = frames
+        self.elapsed = None
+
+    def run(self):
+        width, height = self.size
+        self.elapsed = self.backend.warmup(width, height, self.frames)
+
+    def wait(self):
+        """Aguarda o fim do warm-up e retorna sua duração em segundos"""
+        self.join()
+        return self.elapsed
+
+
+# ===== Backend legado (mp.solutions.hands) =====
+class SolutionsBackend(InferenceBackend):
+    name = "solutions"
+
+    def __init__(self, max_num_hands=1, model_complexity=0,
+                 min_detection_confidence=MIN_DET, min_tracking_confidence=MIN_TRK):
+        self.hands = mp.solutions.hands.Hands(
+            max_num_hands=max_num_hands,
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+        )
+
+    def process(self, rgb, timestamp_ms=None):
+        start = time.perf_counter()
+        res = self.hands.process(rgb)
+        latency_ms = (time.perf_counter() - start) * 1000
+        handedness = [h.classification[0].label for h in (res.multi_handedness or [])]
+        return HandsResult(list(res.multi_hand_landmarks or []), handedness, timestamp_ms, latency_ms)
+
+    def close(self):
+        self.hands.close()
+
+
+# ===== Backend MediaPipe Tasks (LIVE_STREAM) =====
+class TasksBackend(InferenceBackend):
+    name = "tasks"
+    asynchronous = True
+
+    def __init__(self, max_num_hands=1, model_path=HAND_LANDMARKER_MODEL,
+                 min_detection_confidence=MIN_DET, min_tracking_confidence=MIN_TRK):
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"Modelo HandLandmarker não encontrado em {model_path}. "
+                f"Baixe de {HAND_LANDMARKER_URL}"
+            )
+        vision = mp.tasks.vision
+        options = vision.HandLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=model_path),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=max_num_hands,
+            min_hand_detection_confidence=min_detection_confidence,
+            min_hand_presence_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=self._on_result,
+        )
+        self.lock = threading.Lock()
+        self.latest = None
+        self.sent_at = {}  # timestamp_ms -> perf_counter do envio
+        self.last_ts = -1
+        self.returned_ts = None  # timestamp do último resultado entregue
+        self.landmarker = vision.HandLandmarker.create_from_options(options)
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        with self.lock:
+            sent = self.sent_at.pop(timestamp_ms, None)
+            # descarta envios antigos que o grafo pulou
+            for ts in [ts for ts in self.sent_at if ts < timestamp_ms]:
+                del self.sent_at[ts]
+        latency_ms = (time.perf_counter() - sent) * 1000 if sent is not None else None
+        landmarks = [to_landmark_list(points) for points in result.hand_landmarks]
+        handedness = [cats[0].category_name for cats in result.handedness]
+        with self.lock:
+            self.latest = HandsResult(landmarks, handedness, timestamp_ms, latency_ms)
+
+    def process(self, rgb, timestamp_ms=None):
+        if timestamp_ms is None:
+            timestamp_ms = int(time.monotonic() * 1000)
+        # LIVE_STREAM exige timestamps estritamente crescentes
+        timestamp_ms = max(int(timestamp_ms), self.last_ts + 1)
+        self.last_ts = timestamp_ms
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        with self.lock:
+            self.sent_at[timestamp_ms] = time.perf_counter()
+        self.landmarker.detect_async(image, timestamp_ms)
+        with self.lock:
+            res = self.latest
+        if res is None or res.timestamp_ms == self.returned_ts:
+            return None
+        self.returned_ts = res.timestamp_ms
+        return res
+
+    def _finish_warmup(self):
+        # aguarda o resultado do último frame sintético e o descarta
+        deadline = time.perf_counter() + WARMUP_TIMEOUT_S
+        while time.perf_counter() < deadline:
+            with self.lock:
+                if self.latest is not None and self.latest.timestamp_ms >= self.last_ts:
+                    break
+            time.sleep(0.005)
+        with self.lock:
+            self.latest = None
+
+    def close(self):
+        self.landmarker.close()
+
+
+# ===== Fábrica =====
+INFERENCE_BACKENDS = ("solutions", "tasks", "tflite")
+
+def create_backend(name="solutions", **options):
+    """Cria o backend de inferência pelo nome"""
+    if name != "solutions":
+        options.pop("model_complexity", None)
+    if name != "tasks":
+        options.pop("model_path", None)
+    if name != "tflite":
+        options.pop("num_threads", None)
+    if name == "tasks":
+        return TasksBackend(**options)
+    if name == "tflite":
+        from tflite_backend import TFLiteBackend  # dependência opcional
+        return TFLiteBackend(**options)
+    return SolutionsBackend(**options)
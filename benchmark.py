@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Benchmark dos backends de inferência do WaveControl.
+
+Os frames são carregados em memória antes da medição (vídeo, câmera ou
+sintéticos), então o custo de captura não entra nos números. Para cada
+backend são reportados:
+
+- bloqueio: quanto tempo o loop fica parado em ``process`` por frame;
+- resultado: tempo do envio do frame até o resultado ficar disponível;
+- entregues: fração dos frames que geraram resultado.
+
+O backend ``tflite`` é medido uma vez para cada número de threads pedido e
+cada backend uma vez para cada ``--max-hands``. O custo por mão extra do
+rastreamento + classificação + filtro é medido com landmarks sintéticos.
+
+Uso:
+  python3 benchmark.py --video demo.mp4 --backend solutions tasks
+  python3 benchmark.py --device 0 --frames 300
+  python3 benchmark.py --backend tflite --threads 1 2 4
+  python3 benchmark.py --video duas_maos.mp4 --max-hands 1 2 4
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from backends import INFERENCE_BACKENDS, HandsResult, create_backend, landmark_list_from_array
+from replay import synthetic_hand
+from tracking import HandTracker
+
+# ===== Configurações =====
+BENCH_FRAMES = 300         # frames medidos por backend
+BENCH_WARMUP_FRAMES = 10   # frames descartados antes da medição
+BENCH_FPS = 30             # ritmo de envio (0 = o mais rápido possível)
+BENCH_DRAIN_S = 0.5        # espera final por resultados assíncronos
+BENCH_TRACKING_FRAMES = 2000  # frames sintéticos no benchmark de rastreamento
+
+
+def load_frames(video=None, device=None, count=BENCH_FRAMES, width=640, height=480):
+    """Carrega frames RGB espelhados, como no loop principal"""
+    frames = []
+    if video is not None or device is not None:
+        cap = cv2.VideoCapture(video if video is not None else device)
+        while len(frames) < count:
+            ok, frame = cap.read()
+            if not ok:
+                if video is None or not frames:
+                    break
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # repete o vídeo
+                continue
+            frame = cv2.flip(frame, 1)
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        cap.release()
+    else:
+        # Ruído fixo: força a detecção de palma em todos os frames (pior caso)
+        rng = np.random.default_rng(0)
+        base = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        frames = [base] * count
+    return frames
+
+
+def percentiles(values):
+    if not values:
+        return float("nan"), float("nan")
+    return float(np.percentile(values, 50)), float(np.percentile(values, 95))
+
+
+def run_backend(name, frames, fps=BENCH_FPS, label=None, **options):
+    """Mede um backend e retorna um dicionário com as estatísticas"""
+    backend = create_backend(name, **options)
+    interval = 1.0 / fps if fps > 0 else 0.0
+    block_ms = []
+    result_ms = {}
+    with_hands = set()
+    ts_base = int(time.monotonic() * 1000)
+
+    def collect(res):
+        if res is not None and res.timestamp_ms is not None and res.timestamp_ms not in result_ms:
+            result_ms[res.timestamp_ms] = res.latency_ms
+            if res.multi_hand_landmarks:
+                with_hands.add(res.timestamp_ms)
+
+    try:
+        warmup = frames[:BENCH_WARMUP_FRAMES]
+        for i, rgb in enumerate(warmup + frames):
+            t0 = time.perf_counter()
+            timestamp_ms = ts_base + int(i * interval * 1000) + i
+            res = backend.process(rgb, timestamp_ms)
+            elapsed = time.perf_counter() - t0
+            if i >= len(warmup):
+                block_ms.append(elapsed * 1000)
+                collect(res)
+            if interval > elapsed:
+                time.sleep(interval - elapsed)
+        if backend.asynchronous:
+            time.sleep(BENCH_DRAIN_S)
+            collect(backend.process(frames[-1]))
+    finally:
+        backend.close()
+
+    first_measured = ts_base + int(len(warmup) * interval * 1000) + len(warmup)
+    latencies = [ms for ts, ms in result_ms.items() if ts >= first_measured and ms is not None]
+    block_p50, block_p95 = percentiles(block_ms)
+    res_p50, res_p95 = percentiles(latencies)
+    return {
+        "backend": label or name,
+        "block_p50": block_p50,
+        "block_p95": block_p95,
+        "result_p50": res_p50,
+        "result_p95": res_p95,
+        "delivered": len(latencies) / len(frames),
+        "hands": len(with_hands) / len(frames),
+    }
+
+
+def run_tracking(hand_counts, frames=BENCH_TRACKING_FRAMES):
+    """Custo por frame de rastreamento + classificação + filtro por nº de mãos"""
+    rows = []
+    for n in hand_counts:
+        lists = [landmark_list_from_array(synthetic_hand(offset_x=0.25 * i - 0.25)) for i in range(n)]
+        res = HandsResult(lists, ["Right"] * n)
+        tracker = HandTracker("first")
+        start = time.perf_counter()
+        for _ in range(frames):
+            tracker.update(res)
+            tracker.active()
+        rows.append((n, (time.perf_counter() - start) / frames * 1e6))
+    return rows
+
+
+def print_report(rows):
+    print(f"{'backend':<16} {'bloqueio p50/p95 (ms)':>22} {'resultado p50/p95 (ms)':>23} {'entregues':>10} {'com mão':>8}")
+    for r in rows:
+        print(f"{r['backend']:<16} {r['block_p50']:>10.1f} /{r['block_p95']:>9.1f} "
+              f"{r['result_p50']:>11.1f} /{r['result_p95']:>9.1f} "
+              f"{r['delivered']:>9.0%} {r['hands']:>8.0%}")
+
+
+def print_tracking_report(rows):
+    print(f"\n{'mãos':<6} {'rastreamento+filtro (µs/frame)':>30} {'por mão extra':>14}")
+    base = rows[0][1] if rows else 0.0
+    for n, us in rows:
+        extra = (us - base) / (n - rows[0][0]) if n != rows[0][0] else 0.0
+        print(f"{n:<6} {us:>30.1f} {extra:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos backends de inferência do WaveControl")
+    parser.add_argument("--video", help="arquivo de vídeo de entrada")
+    parser.add_argument("--device", type=int, help="índice da câmera de entrada")
+    parser.add_argument("--backend", nargs="+", choices=INFERENCE_BACKENDS, default=list(INFERENCE_BACKENDS),
+                        help="backends a comparar (padrão: todos)")
+    parser.add_argument("--model", help="modelo .task do HandLandmarker (backend tasks)")
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, 2, 4],
+                        help="números de threads medidos no backend tflite (padrão: 1 2 4)")
+    parser.add_argument("--max-hands", nargs="+", type=int, default=[1],
+                        help="valores de max_num_hands medidos (padrão: 1)")
+    parser.add_argument("--frames", type=int, default=BENCH_FRAMES, help="frames medidos (padrão: %(default)s)")
+    parser.add_argument("--fps", type=float, default=BENCH_FPS, help="ritmo de envio, 0 = sem limite (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.device, args.frames)
+    if not frames:
+        print("❌ Nenhum frame carregado")
+        return 1
+    print(f"📊 {len(frames)} frames {frames[0].shape[1]}x{frames[0].shape[0]} a {args.fps:g} FPS")
+
+    runs = []
+    for name in args.backend:
+        for max_hands in args.max_hands:
+            options = {"max_num_hands": max_hands, "model_complexity": 0}
+            if args.model:
+                options["model_path"] = args.model
+            label = name if len(args.max_hands) == 1 else f"{name}/{max_hands}h"
+            if name == "tflite":
+                for threads in args.threads:
+                    runs.append((name, f"{label}/{threads}t", dict(options, num_threads=threads)))
+            else:
+                runs.append((name, label, options))
+
+    rows = []
+    for name, label, options in runs:
+        try:
+            rows.append(run_backend(name, frames, args.fps, label=label, **options))
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"⚠️  {label}: {e}")
+    print_report(rows)
+    print_tracking_report(run_tracking(sorted(set([1] + args.max_hands))))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Calibração adaptativa do WaveControl.
+
+Em vez de bloquear as ações por um tempo fixo, a calibração acompanha o
+brilho médio dos frames e a exposição reportada pela câmera e termina
+assim que ambos convergem e o modelo já produziu sua primeira inferência.
+``CALIBRATION_MAX_S`` limita a espera em câmeras que nunca estabilizam e
+também vale se o modelo ainda não respondeu (warm-up travado ou com erro):
+nesse caso o motivo informado diz que o modelo não ficou pronto.
+"""
+
+# ===== Configurações =====
+CALIBRATION_MIN_S = 0.3        # duração mínima
+CALIBRATION_MAX_S = 2.0        # teto (antigo tempo fixo)
+BRIGHTNESS_TOLERANCE = 2.0     # variação máxima do brilho médio (0-255) entre frames
+EXPOSURE_TOLERANCE = 0.02      # variação relativa máxima da exposição entre frames
+STABLE_FRAMES = 5              # frames estáveis consecutivos exigidos
+
+
+def frame_brightness(frame):
+    """Brilho médio estimado numa grade esparsa do frame (barato)"""
+    return float(frame[::8, ::8].mean())
+
+
+class AdaptiveCalibration:
+    def __init__(self, min_s=CALIBRATION_MIN_S, max_s=CALIBRATION_MAX_S,
+                 brightness_tol=BRIGHTNESS_TOLERANCE, exposure_tol=EXPOSURE_TOLERANCE,
+                 stable_frames=STABLE_FRAMES):
+        self.min_s = min_s
+        self.max_s = max_s
+        self.brightness_tol = brightness_tol
+        self.exposure_tol = exposure_tol
+        self.stable_frames = stable_frames
+        self.start(None)
+
+    def start(self, now):
+        """Reinicia a calibração a partir do instante ``now``"""
+        self.start_ts = now
+        self.done = False
+        self.duration = None
+        self.reason = None
+        self.stable = 0
+        self.last_brightness = None
+        self.last_exposure = None
+
+    def elapsed(self, now):
+        return now - self.start_ts
+
+    def _settled(self, brightness, exposure):
+        ok = self.last_brightness is not None and abs(brightness - self.last_brightness) <= self.brightness_tol
+        if exposure is not None and self.last_exposure is not None:
+            scale = max(abs(self.last_exposure), 1e-6)
+            ok = ok and abs(exposure - self.last_exposure) / scale <= self.exposure_tol
+        self.last_brightness = brightness
+        self.last_exposure = exposure
+        return ok
+
+    def update(self, frame, now, model_ready, exposure=None):
+        """Alimenta um frame; retorna True no frame em que a calibração termina"""
+        if self.done:
+            return False
+        if self.start_ts is None:
+            self.start_ts = now
+        self.stable = self.stable + 1 if self._settled(frame_brightness(frame), exposure) else 0
+
+        elapsed = self.elapsed(now)
+        if model_ready and elapsed >= self.min_s and self.stable >= self.stable_frames:
+            self.reason = "câmera estável"
+        elif elapsed >= self.max_s:
+            self.reason = "tempo máximo" if model_ready else "tempo máximo, modelo ainda não pronto"
+        else:
+            return False
+        self.done = True
+        self.duration = elapsed
+        return True
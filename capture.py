@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""Fontes de captura de vídeo do WaveControl.
+
+Todas as fontes expõem a mesma interface usada por ``process_video``
+(``isOpened``/``read``/``set``/``get``/``release``, mais ``drain`` para
+descartar frames parados na fila) e, além disso, guardam em
+``last_timestamp`` o instante de captura do último frame lido (segundos no
+relógio ``time.monotonic``) e em ``last_sequence`` o número do frame.
+
+- ``OpenCVCapture``: caminho genérico via ``cv2.VideoCapture`` (câmera ou
+  arquivo de vídeo). O timestamp é o instante em que ``read`` retornou.
+- ``V4L2Capture``: acesso direto a ``/dev/videoN`` com buffers de streaming
+  mmap do V4L2. Os frames são views NumPy sobre a memória do driver e o
+  timestamp é o do kernel, o que permite medir a latência real
+  sensor → tecla. Pode ser testado com o driver virtual ``vivid``
+  (``sudo modprobe vivid``).
+
+Com ``supervised=True`` a fonte é envolvida por ``SupervisedCapture``: se
+uma câmera para de entregar frames (cabo USB desconectado, stream travado)
+ela é reaberta com backoff exponencial sem que o loop de processamento,
+o modelo ou os filtros precisem ser recriados.
+"""
+import ctypes
+import errno
+import fcntl
+import mmap
+import os
+import select
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# ===== Configurações =====
+V4L2_BUFFER_COUNT = 4      # buffers mmap na fila do driver
+V4L2_READ_TIMEOUT_S = 1.0  # tempo máximo esperando um frame
+OPENCV_READ_TIMEOUT_MS = 1000  # idem no OpenCV (quando o backend suporta)
+RECONNECT_BACKOFF_S = 0.05     # primeira espera entre tentativas de reabrir
+RECONNECT_MAX_BACKOFF_S = 0.5  # teto da espera (replug detectado em < 1 s)
+RECONNECT_GIVE_UP_S = 0        # desiste depois deste tempo (0 = tenta sempre)
+DRAIN_MAX_FRAMES = V4L2_BUFFER_COUNT  # frames descartados no máximo por drain (fila padrão do V4L2)
+DRAIN_QUEUED_S = 0.005         # grab do OpenCV mais rápido que isto = frame que já estava na fila
+
+
+# ===== Caminho genérico (OpenCV) =====
+class OpenCVCapture:
+    """Envolve ``cv2.VideoCapture`` adicionando timestamp e sequência"""
+
+    def __init__(self, source):
+        self.source = source
+        self.cap = cv2.VideoCapture(source)
+        self.last_timestamp = None
+        self.last_sequence = -1
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        ok, frame = self.cap.read()
+        if ok:
+            self.last_timestamp = time.monotonic()
+            self.last_sequence += 1
+        return ok, frame
+
+    def drain(self, max_frames=DRAIN_MAX_FRAMES):
+        """Descarta os frames já enfileirados; retorna quantos.
+
+        O OpenCV não diz se há frame na fila: um ``grab`` que volta em menos
+        de ``DRAIN_QUEUED_S`` pegou um frame parado, o primeiro que espera a
+        câmera encerra a drenagem.
+        """
+        drained = 0
+        for _ in range(max_frames):
+            start = time.monotonic()
+            if not self.cap.grab() or time.monotonic() - start >= DRAIN_QUEUED_S:
+                break
+            drained += 1
+        self.last_sequence += drained
+        return drained
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def release(self):
+        self.cap.release()
+
+
+# ===== Estruturas V4L2 (linux/videodev2.h) =====
+def _fourcc(code):
+    return code[0] | (code[1] << 8) | (code[2] << 16) | (code[3] << 24)
+
+V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+V4L2_MEMORY_MMAP = 1
+V4L2_FIELD_ANY = 0
+V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+V4L2_CAP_STREAMING = 0x04000000
+V4L2_CAP_DEVICE_CAPS = 0x80000000
+V4L2_BUF_FLAG_TIMESTAMP_MASK = 0x0000e000
+V4L2_BUF_FLAG_TIMESTAMP_MONOTONIC = 0x00002000
+V4L2_PIX_FMT_YUYV = _fourcc(b"YUYV")
+V4L2_PIX_FMT_MJPEG = _fourcc(b"MJPG")
+
+
+class _v4l2_capability(ctypes.Structure):
+    _fields_ = [
+        ("driver", ctypes.c_char * 16),
+        ("card", ctypes.c_char * 32),
+        ("bus_info", ctypes.c_char * 32),
+        ("version", ctypes.c_uint32),
+        ("capabilities", ctypes.c_uint32),
+        ("device_caps", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32 * 3),
+    ]
+
+
+class _v4l2_pix_format(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_uint32),
+        ("height", ctypes.c_uint32),
+        ("pixelformat", ctypes.c_uint32),
+        ("field", ctypes.c_uint32),
+        ("bytesperline", ctypes.c_uint32),
+        ("sizeimage", ctypes.c_uint32),
+        ("colorspace", ctypes.c_uint32),
+        ("priv", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("ycbcr_enc", ctypes.c_uint32),
+        ("quantization", ctypes.c_uint32),
+        ("xfer_func", ctypes.c_uint32),
+    ]
+
+
+class _v4l2_format_fmt(ctypes.Union):
+    # o ponteiro força o alinhamento de 8 bytes usado pelo kernel
+    _fields_ = [
+        ("pix", _v4l2_pix_format),
+        ("raw_data", ctypes.c_uint8 * 200),
+        ("_align", ctypes.c_void_p),
+    ]
+
+
+class _v4l2_format(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_uint32),
+        ("fmt", _v4l2_format_fmt),
+    ]
+
+
+class _v4l2_requestbuffers(ctypes.Structure):
+    _fields_ = [
+        ("count", ctypes.c_uint32),
+        ("type", ctypes.c_uint32),
+        ("memory", ctypes.c_uint32),
+        ("capabilities", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32),
+    ]
+
+
+class _timeval(ctypes.Structure):
+    _fields_ = [
+        ("tv_sec", ctypes.c_long),
+        ("tv_usec", ctypes.c_long),
+    ]
+
+
+class _v4l2_timecode(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("frames", ctypes.c_uint8),
+        ("seconds", ctypes.c_uint8),
+        ("minutes", ctypes.c_uint8),
+        ("hours", ctypes.c_uint8),
+        ("userbits", ctypes.c_uint8 * 4),
+    ]
+
+
+class _v4l2_buffer_m(ctypes.Union):
+    _fields_ = [
+        ("offset", ctypes.c_uint32),
+        ("userptr", ctypes.c_ulong),
+        ("planes", ctypes.c_void_p),
+        ("fd", ctypes.c_int32),
+    ]
+
+
+class _v4l2_buffer(ctypes.Structure):
+    _fields_ = [
+        ("index", ctypes.c_uint32),
+        ("type", ctypes.c_uint32),
+        ("bytesused", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("field", ctypes.c_uint32),
+        ("timestamp", _timeval),
+        ("timecode", _v4l2_timecode),
+        ("sequence", ctypes.c_uint32),
+        ("memory", ctypes.c_uint32),
+        ("m", _v4l2_buffer_m),
+        ("length", ctypes.c_uint32),
+        ("reserved2", ctypes.c_uint32),
+        ("request_fd", ctypes.c_int32),
+    ]
+
+
+def _ioc(direction, nr, struct_type):
+    size = ctypes.sizeof(struct_type)
+    return (direction << 30) | (size << 16) | (ord("V") << 8) | nr
+
+_IOC_WRITE = 1
+_IOC_READ = 2
+VIDIOC_QUERYCAP = _ioc(_IOC_READ, 0, _v4l2_capability)
+VIDIOC_G_FMT = _ioc(_IOC_READ | _IOC_WRITE, 4, _v4l2_format)
+VIDIOC_S_FMT = _ioc(_IOC_READ | _IOC_WRITE, 5, _v4l2_format)
+VIDIOC_REQBUFS = _ioc(_IOC_READ | _IOC_WRITE, 8, _v4l2_requestbuffers)
+VIDIOC_QUERYBUF = _ioc(_IOC_READ | _IOC_WRITE, 9, _v4l2_buffer)
+VIDIOC_QBUF = _ioc(_IOC_READ | _IOC_WRITE, 15, _v4l2_buffer)
+VIDIOC_DQBUF = _ioc(_IOC_READ | _IOC_WRITE, 17, _v4l2_buffer)
+VIDIOC_STREAMON = _ioc(_IOC_WRITE, 18, ctypes.c_int)
+VIDIOC_STREAMOFF = _ioc(_IOC_WRITE, 19, ctypes.c_int)
+
+
+def _xioctl(fd, request, arg):
+    """ioctl repetindo em EINTR"""
+    while True:
+        try:
+            return fcntl.ioctl(fd, request, arg)
+        except InterruptedError:
+            continue
+
+
+# ===== Captura direta V4L2 =====
+class V4L2Capture:
+    """Captura via buffers mmap do V4L2 com timestamp do driver.
+
+    ``read_raw`` devolve uma view NumPy sobre o buffer do driver (sem
+    cópia), válida até a próxima leitura. ``read`` converte para BGR como
+    ``cv2.VideoCapture`` e devolve o buffer ao driver imediatamente.
+    """
+
+    def __init__(self, device, width=None, height=None, pixelformat=V4L2_PIX_FMT_YUYV):
+        if isinstance(device, int):
+            device = f"/dev/video{device}"
+        self.device = device
+        self.width = width
+        self.height = height
+        self.pixelformat = pixelformat
+        self.bytesperline = 0
+        self.fd = -1
+        self.buffers = []
+        self.streaming = False
+        self.held_index = None
+        self.last_timestamp = None
+        self.last_sequence = -1
+        self.monotonic_timestamps = False
+        try:
+            self.fd = os.open(device, os.O_RDWR | os.O_NONBLOCK)
+            self._check_caps()
+            self._start()
+        except OSError:
+            self.release()
+
+    def _check_caps(self):
+        cap = _v4l2_capability()
+        _xioctl(self.fd, VIDIOC_QUERYCAP, cap)
+        caps = cap.device_caps if cap.capabilities & V4L2_CAP_DEVICE_CAPS else cap.capabilities
+        if not caps & V4L2_CAP_VIDEO_CAPTURE or not caps & V4L2_CAP_STREAMING:
+            raise OSError(errno.ENODEV, f"{self.device} não suporta captura por streaming")
+        self.driver = cap.driver.decode(errors="replace")
+
+    def _start(self):
+        fmt = _v4l2_format()
+        fmt.type = V4L2_BUF_TYPE_VIDEO_CAPTURE
+        _xioctl(self.fd, VIDIOC_G_FMT, fmt)
+        if self.width:
+            fmt.fmt.pix.width = int(self.width)
+        if self.height:
+            fmt.fmt.pix.height = int(self.height)
+        fmt.fmt.pix.pixelformat = self.pixelformat
+        fmt.fmt.pix.field = V4L2_FIELD_ANY
+        _xioctl(self.fd, VIDIOC_S_FMT, fmt)
+        # o driver pode ajustar tamanho e formato
+        self.width = fmt.fmt.pix.width
+        self.height = fmt.fmt.pix.height
+        self.pixelformat = fmt.fmt.pix.pixelformat
+        self.bytesperline = fmt.fmt.pix.bytesperline or self.width * 2
+
+        req = _v4l2_requestbuffers()
+        req.count = V4L2_BUFFER_COUNT
+        req.type = V4L2_BUF_TYPE_VIDEO_CAPTURE
+        req.memory = V4L2_MEMORY_MMAP
+        _xioctl(self.fd, VIDIOC_REQBUFS, req)
+        if req.count < 2:
+            raise OSError(errno.ENOMEM, "memória insuficiente para buffers V4L2")
+
+        for index in range(req.count):
+            buf = self._new_buffer(index)
+            _xioctl(self.fd, VIDIOC_QUERYBUF, buf)
+            mm = mmap.mmap(self.fd, buf.length, mmap.MAP_SHARED,
+                           mmap.PROT_READ | mmap.PROT_WRITE, offset=buf.m.offset)
+            self.buffers.append(mm)
+            _xioctl(self.fd, VIDIOC_QBUF, buf)
+
+        _xioctl(self.fd, VIDIOC_STREAMON, ctypes.c_int(V4L2_BUF_TYPE_VIDEO_CAPTURE))
+        self.streaming = True
+
+    def _stop(self):
+        if self.streaming:
+            try:
+                _xioctl(self.fd, VIDIOC_STREAMOFF, ctypes.c_int(V4L2_BUF_TYPE_VIDEO_CAPTURE))
+            except OSError:
+                pass
+            self.streaming = False
+        self.held_index = None
+        for mm in self.buffers:
+            try:
+                mm.close()
+            except BufferError:
+                pass  # ainda existe uma view NumPy apontando para o buffer
+        self.buffers = []
+        if self.fd >= 0:
+            # libera os buffers no driver
+            req = _v4l2_requestbuffers()
+            req.count = 0
+            req.type = V4L2_BUF_TYPE_VIDEO_CAPTURE
+            req.memory = V4L2_MEMORY_MMAP
+            try:
+                _xioctl(self.fd, VIDIOC_REQBUFS, req)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _new_buffer(index=0):
+        buf = _v4l2_buffer()
+        buf.index = index
+        buf.type = V4L2_BUF_TYPE_VIDEO_CAPTURE
+        buf.memory = V4L2_MEMORY_MMAP
+        return buf
+
+    def _requeue_held(self):
+        if self.held_index is not None:
+            _xioctl(self.fd, VIDIOC_QBUF, self._new_buffer(self.held_index))
+            self.held_index = None
+
+    def isOpened(self):
+        return self.streaming
+
+    def read_raw(self):
+        """Retorna ``(ok, view, timestamp)`` com a view sobre o buffer do driver"""
+        if not self.streaming:
+            return False, None, None
+        try:
+            self._requeue_held()
+            ready, _, _ = select.select([self.fd], [], [], V4L2_READ_TIMEOUT_S)
+            if not ready:
+                return False, None, None
+            buf = self._new_buffer()
+            _xioctl(self.fd, VIDIOC_DQBUF, buf)
+        except OSError:
+            return False, None, None
+
+        self.held_index = buf.index
+        if buf.flags & V4L2_BUF_FLAG_TIMESTAMP_MASK == V4L2_BUF_FLAG_TIMESTAMP_MONOTONIC:
+            self.monotonic_timestamps = True
+            self.last_timestamp = buf.timestamp.tv_sec + buf.timestamp.tv_usec / 1e6
+        else:
+            # driver sem timestamp monotônico: usa o instante do dequeue
+            self.monotonic_timestamps = False
+            self.last_timestamp = time.monotonic()
+        self.last_sequence = buf.sequence
+
+        data = np.frombuffer(self.buffers[buf.index], dtype=np.uint8, count=buf.bytesused)
+        if self.pixelformat == V4L2_PIX_FMT_YUYV:
+            rows = data[: self.bytesperline * self.height].reshape(self.height, self.bytesperline)
+            view = rows[:, : self.width * 2].reshape(self.height, self.width, 2)
+        else:
+            view = data
+        return True, view, self.last_timestamp
+
+    def read(self):
+        ok, view, _ = self.read_raw()
+        if not ok:
+            return False, None
+        if self.pixelformat == V4L2_PIX_FMT_YUYV:
+            frame = cv2.cvtColor(view, cv2.COLOR_YUV2BGR_YUYV)
+        elif self.pixelformat == V4L2_PIX_FMT_MJPEG:
+            frame = cv2.imdecode(view, cv2.IMREAD_COLOR)
+        else:
+            frame = None
+        del view
+        self._requeue_held()
+        return frame is not None, frame
+
+    def drain(self):
+        """Devolve ao driver os frames já prontos na fila, sem esperar; retorna quantos"""
+        if not self.streaming:
+            return 0
+        drained = 0
+        try:
+            self._requeue_held()
+            for _ in range(len(self.buffers)):
+                ready, _, _ = select.select([self.fd], [], [], 0)
+                if not ready:
+                    break
+                buf = self._new_buffer()
+                _xioctl(self.fd, VIDIOC_DQBUF, buf)
+                _xioctl(self.fd, VIDIOC_QBUF, buf)
+                drained += 1
+        except OSError:
+            pass  # o próximo read percebe a falha
+        return drained
+
+    def set(self, prop, value):
+        """Suporta largura/altura; reconfigura o streaming se necessário"""
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            self.width = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            self.height = int(value)
+        else:
+            return False
+        if not self.streaming:
+            return False
+        self._stop()
+        try:
+            self._start()
+        except OSError:
+            self.release()
+            return False
+        return True
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width or 0)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height or 0)
+        return 0.0
+
+    def release(self):
+        self._stop()
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+# ===== Reconexão automática =====
+def is_live_source(source):
+    """Câmeras (índice ou /dev/videoN) podem ser reabertas; arquivos terminam"""
+    if isinstance(source, int):
+        return True
+    return str(source).isdigit() or str(source).startswith("/dev/")
+
+
+class SupervisedCapture:
+    """Fonte de captura que se reconecta sozinha quando a câmera some.
+
+    ``read`` só retorna ``False`` no fim de um arquivo, depois de
+    ``release`` ou se ``RECONNECT_GIVE_UP_S`` estourar. Enquanto reconecta,
+    ``read`` bloqueia; ``on_event(evento, captura)`` é chamado com
+    ``"lost"``, ``"reconnected"`` e ``"failed"`` na thread que lê os frames.
+    Propriedades passadas a ``set`` são reaplicadas após reabrir.
+    """
+
+    def __init__(self, source, backend="opencv", on_event=None, capture=None):
+        self.source = source
+        self.backend = backend
+        self.on_event = on_event
+        self.live = is_live_source(source)
+        self.props = {}
+        self.stop_event = threading.Event()
+        self.reconnects = []        # duração de cada reconexão (s)
+        self.last_outage_s = None   # tempo sem imagem na última queda
+        self.last_frame_ts = None
+        self.last_sequence = -1     # contínuo entre reconexões
+        self.cap = capture if capture is not None else open_capture(source, backend)
+        self._configure(self.cap)
+
+    @property
+    def last_timestamp(self):
+        return self.cap.last_timestamp
+
+    def _configure(self, cap):
+        if self.live and self.backend == "opencv" and hasattr(cv2, "CAP_PROP_READ_TIMEOUT_MSEC"):
+            cap.set(cv2.CAP_PROP_READ_TIMEOUT_MSEC, OPENCV_READ_TIMEOUT_MS)
+        for prop, value in self.props.items():
+            cap.set(prop, value)
+
+    def _emit(self, event):
+        if self.on_event:
+            self.on_event(event, self)
+
+    def isOpened(self):
+        return not self.stop_event.is_set() and self.cap.isOpened()
+
+    def read(self):
+        while not self.stop_event.is_set():
+            ok, frame = self.cap.read()
+            if ok:
+                self.last_sequence += 1
+                self.last_frame_ts = time.monotonic()
+                return True, frame
+            if not self.live or not self._reconnect():
+                return False, None
+        return False, None
+
+    def _reconnect(self):
+        lost_ts = time.monotonic()
+        self._emit("lost")
+        self.cap.release()
+        delay = RECONNECT_BACKOFF_S
+        while not self.stop_event.is_set():
+            if RECONNECT_GIVE_UP_S and time.monotonic() - lost_ts > RECONNECT_GIVE_UP_S:
+                self._emit("failed")
+                return False
+            cap = open_capture(self.source, self.backend)
+            if cap.isOpened() and self.stop_event.is_set():
+                cap.release()  # release() chegou durante a tentativa
+                return False
+            if cap.isOpened():
+                self._configure(cap)
+                self.cap = cap
+                now = time.monotonic()
+                self.reconnects.append(now - lost_ts)
+                self.last_outage_s = now - (self.last_frame_ts or lost_ts)
+                self._emit("reconnected")
+                return True
+            cap.release()
+            self.stop_event.wait(delay)
+            delay = min(delay * 2, RECONNECT_MAX_BACKOFF_S)
+        return False
+
+    def drain(self):
+        """Descarta frames parados na fila (só câmeras: num arquivo pularia vídeo)"""
+        return self.cap.drain() if self.live else 0
+
+    def set(self, prop, value):
+        self.props[prop] = value
+        return self.cap.set(prop, value)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def release(self):
+        self.stop_event.set()
+        self.cap.release()
+
+
+# ===== Fábrica =====
+CAPTURE_BACKENDS = ("opencv", "v4l2")
+
+def open_capture(source, backend="opencv", supervised=False, on_event=None):
+    """Abre a fonte de captura escolhida (índice, /dev/videoN ou arquivo)"""
+    if supervised:
+        return SupervisedCapture(source, backend, on_event)
+    if backend == "v4l2":
+        return V4L2Capture(source)
+    return OpenCVCapture(source)
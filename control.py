@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""Protocolo e cliente do socket de controle do daemon do WaveControl.
+
+O daemon (``daemon.py``) mantém câmera, modelo e teclado virtual prontos e
+atende clientes num socket Unix. Cada mensagem é uma linha JSON:
+
+- pedido: ``{"cmd": "start"}``; ``stop``, ``status``, ``ping``,
+  ``set`` (``{"cmd": "set", "settings": {"zoom": 2.0}}``), ``subscribe``
+  (``{"cmd": "subscribe", "preview": true}``), ``preview`` (liga/desliga o
+  vídeo de uma inscrição já aberta na mesma conexão) e ``shutdown``;
+- resposta: ``{"ok": true, ...}`` ou ``{"ok": false, "error": "..."}``;
+- evento (só em conexões inscritas): ``{"event": "action", ...}``; também
+  ``phase``, ``indicators``, ``ready``, ``calibrated``, ``capture``,
+  ``settings``, ``error`` e ``preview`` (JPEG em base64).
+
+Este módulo só usa a biblioteca padrão: a janela e a linha de comando se
+conectam em milissegundos, sem importar o MediaPipe.
+
+Uso:
+  python3 control.py status
+  python3 control.py start
+  python3 control.py set zoom=2 hand_policy=right
+  python3 control.py events
+"""
+import argparse
+import json
+import os
+import socket
+import threading
+
+# ===== Configurações =====
+SOCKET_NAME = "wavecontrol.sock"
+CONNECT_TIMEOUT_S = 0.2     # daemon ausente é detectado rápido
+REQUEST_TIMEOUT_S = 10.0    # start abre a câmera: pode levar alguns segundos
+PROTOCOL_VERSION = 1
+
+# fases do pipeline publicadas no evento "phase"
+PHASE_STOPPED = "stopped"
+PHASE_CALIBRATING = "calibrating"
+PHASE_ACTIVE = "active"
+PHASE_WAITING = "waiting"          # ação executada, aguardando posição neutra
+PHASE_IDLE = "idle"                # modo economia
+PHASE_RECONNECTING = "reconnecting"
+PHASE_LABELS = {PHASE_STOPPED: "parado", PHASE_CALIBRATING: "calibrando", PHASE_ACTIVE: "ativo",
+                PHASE_WAITING: "aguardando neutro", PHASE_IDLE: "economia",
+                PHASE_RECONNECTING: "reconectando"}
+
+
+def default_socket_path():
+    """``$WAVECONTROL_SOCKET``, senão ``$XDG_RUNTIME_DIR/wavecontrol.sock`` (ou /tmp por usuário)"""
+    if os.environ.get("WAVECONTROL_SOCKET"):
+        return os.environ["WAVECONTROL_SOCKET"]
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isdir(runtime):
+        return os.path.join(runtime, SOCKET_NAME)
+    return os.path.join("/tmp", f"wavecontrol-{os.getuid()}.sock")
+
+
+SOCKET_PATH = default_socket_path()
+
+
+def encode_message(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class DaemonError(RuntimeError):
+    """Pedido recusado pelo daemon (``"ok": false``)"""
+
+
+class Connection:
+    """Uma conexão com o daemon: linhas JSON nos dois sentidos"""
+
+    def __init__(self, path=None, timeout=CONNECT_TIMEOUT_S):
+        self.path = path or SOCKET_PATH
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(self.path)
+        except OSError:
+            self.sock.close()
+            raise
+        self.sock.settimeout(REQUEST_TIMEOUT_S)
+        self.reader = self.sock.makefile("rb")
+        self.write_lock = threading.Lock()
+
+    def send(self, message):
+        with self.write_lock:
+            self.sock.sendall(encode_message(message))
+
+    def receive(self):
+        """Próxima mensagem; ``None`` quando o daemon fecha a conexão"""
+        line = self.reader.readline()
+        return json.loads(line) if line else None
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.reader.close()
+        self.sock.close()
+
+
+class DaemonClient:
+    """Cliente de controle: um pedido por vez, resposta síncrona"""
+
+    def __init__(self, path=None, timeout=CONNECT_TIMEOUT_S):
+        self.path = path or SOCKET_PATH
+        self.conn = Connection(self.path, timeout)
+        self.lock = threading.Lock()
+
+    def request(self, cmd, **args):
+        """Envia o pedido e devolve a resposta; ``DaemonError`` se recusado"""
+        with self.lock:
+            self.conn.send(dict(args, cmd=cmd))
+            reply = self.conn.receive()
+        if reply is None:
+            raise ConnectionError("Daemon encerrou a conexão")
+        if not reply.get("ok"):
+            raise DaemonError(reply.get("error", "erro desconhecido"))
+        return reply
+
+    def subscribe(self, preview=False):
+        """Abre uma segunda conexão que recebe os eventos do daemon"""
+        return EventStream(self.path, preview)
+
+    def close(self):
+        self.conn.close()
+
+
+class EventStream:
+    """Eventos de uma inscrição; iterar bloqueia até o próximo evento"""
+
+    def __init__(self, path=None, preview=False):
+        self.conn = Connection(path)
+        self.conn.sock.settimeout(None)  # eventos podem demorar (detecção parada)
+        self.conn.send({"cmd": "subscribe", "preview": preview})
+
+    def set_preview(self, enabled):
+        """Liga/desliga o vídeo nesta inscrição (a resposta é descartada)"""
+        self.conn.send({"cmd": "preview", "enabled": enabled})
+
+    def __iter__(self):
+        while True:
+            try:
+                message = self.conn.receive()
+            except (OSError, ValueError):
+                return
+            if message is None:
+                return
+            if "event" in message:
+                yield message
+
+    def close(self):
+        self.conn.close()
+
+
+def find_daemon(path=None):
+    """Cliente conectado ao daemon em execução, ou ``None``"""
+    try:
+        client = DaemonClient(path)
+        client.request("ping")
+        return client
+    except (OSError, ValueError, DaemonError):
+        return None
+
+
+def parse_setting(text):
+    """``chave=valor`` → (chave, valor JSON ou texto)"""
+    key, sep, value = text.partition("=")
+    if not sep or not key:
+        raise ValueError(f"Use chave=valor: {text}")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+def format_event(event):
+    """Linha legível de um evento (para a linha de comando)"""
+    kind = event["event"]
+    if kind == "action":
+        swipe = " (swipe)" if event.get("swipe") else ""
+        return (f"⌨️  {event['action']} → {event['key']}{swipe}, "
+                f"latência captura → tecla {event['latency_ms']:.1f} ms")
+    if kind == "phase":
+        return f"🔄 {PHASE_LABELS.get(event['phase'], event['phase'])}"
+    if kind == "ready":
+        return f"⚡ Primeira inferência {event['first_inference_ms']:.0f} ms após o start"
+    if kind == "calibrated":
+        return f"✅ Calibração concluída em {event['ms']:.0f} ms ({event['reason']})"
+    if kind == "capture":
+        return f"📷 Câmera: {event['state']}"
+    if kind == "indicators":
+        return f"🎯 {event['action']} ({event['filter']})"
+    if kind == "settings":
+        return "⚙️  " + ", ".join(f"{k}={v}" for k, v in sorted(event["settings"].items()))
+    if kind == "error":
+        return f"❌ {event['message']}"
+    return json.dumps(event, ensure_ascii=False)
+
+
+def print_status(status):
+    print(f"🌊 Daemon pid {status['pid']} em {status['socket']} (ativo há {status['uptime_s']:.0f} s)")
+    print(f"   Fase: {PHASE_LABELS.get(status['phase'], status['phase'])}, "
+          f"{status['fps']:.1f} FPS, {status['clients']} cliente(s)")
+    print(f"   Pronto em {status['load_ms']:.0f} ms (modelo + teclado)"
+          + (f", último start {status['start_ms']:.0f} ms" if status.get("start_ms") is not None else ""))
+    if status.get("last_action"):
+        print(f"   Última ação: {status['last_action']}")
+    print("   " + ", ".join(f"{k}={v}" for k, v in sorted(status["settings"].items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Controle do daemon do WaveControl")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="socket do daemon (padrão: %(default)s)")
+    parser.add_argument("command", choices=["status", "start", "stop", "set", "events", "shutdown"])
+    parser.add_argument("settings", nargs="*", help="chave=valor (com 'set')")
+    args = parser.parse_args()
+
+    try:
+        client = DaemonClient(args.socket)
+    except OSError:
+        print(f"❌ Daemon não encontrado em {args.socket} (inicie com: python3 daemon.py)")
+        return 1
+    try:
+        if args.command == "status":
+            print_status(client.request("status"))
+        elif args.command == "start":
+            reply = client.request("start")
+            print(f"▶ Detecção iniciada em {reply['start_ms']:.0f} ms")
+        elif args.command == "stop":
+            client.request("stop")
+            print("⏹ Detecção parada")
+        elif args.command == "set":
+            settings = dict(parse_setting(s) for s in args.settings)
+            reply = client.request("set", settings=settings)
+            print(format_event({"event": "settings", "settings": reply["settings"]}))
+        elif args.command == "shutdown":
+            client.request("shutdown")
+            print("👋 Daemon encerrado")
+        else:
+            stream = client.subscribe()
+            try:
+                for event in stream:
+                    print(format_event(event))
+            except KeyboardInterrupt:
+                pass
+            finally:
+                stream.close()
+    except (DaemonError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    except OSError as e:
+        print(f"❌ Erro de comunicação com o daemon: {e}")
+        return 1
+    finally:
+        client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""Daemon do WaveControl: pipeline sempre aquecido, controlado por socket Unix.
+
+O daemon carrega o modelo e cria o teclado virtual (uinput) uma única vez e
+fica no ar entre as apresentações. A janela (``main.py``) e a linha de
+comando (``control.py``) se conectam ao socket de controle como clientes
+leves: ``start``/``stop`` da detecção, mudança de ajustes (zoom, política de
+mão, economia, parâmetros do filtro, tabela de gestos) e um fluxo de
+eventos (ações, fase, indicadores e, para quem pede, o preview em JPEG).
+O protocolo está descrito em ``control.py``.
+
+Só o daemon abre a câmera, então duas janelas não disputam o dispositivo.
+Com ``--keep-camera`` a câmera também fica aberta entre ``stop`` e
+``start`` (o ``start`` cai para poucos milissegundos, com a luz da câmera
+acesa).
+
+Uso:
+  python3 daemon.py                     # socket em $XDG_RUNTIME_DIR/wavecontrol.sock
+  python3 daemon.py --keep-camera --start
+  python3 control.py status
+"""
+import argparse
+import base64
+import json
+import os
+import queue
+import signal
+import socketserver
+import threading
+import time
+from collections import deque
+
+import cv2
+
+import main_cli
+from backends import INFERENCE_BACKENDS, BackendWarmup, create_backend
+from capture import CAPTURE_BACKENDS
+from control import (PHASE_ACTIVE, PHASE_CALIBRATING, PHASE_IDLE, PHASE_RECONNECTING,
+                     PHASE_STOPPED, PHASE_WAITING, PROTOCOL_VERSION, SOCKET_PATH, encode_message, find_daemon)
+from gestures import (DEFAULT_TUNING, build_swipe_table, describe_bindings,
+                      load_gesture_config, load_tuning, validate_tuning)
+from main_cli import WaveControlCLI, create_keyboard
+from power import POWER_IDLE
+from render import INACTIVE_COLOR, LANDMARK_COLOR, LandmarkRenderer, apply_digital_zoom, preview_size
+from tracking import HAND_POLICIES
+
+# ===== Configurações =====
+EVENT_QUEUE_SIZE = 256       # eventos pendentes por cliente (os mais antigos são descartados)
+PREVIEW_FPS = 10             # preview enviado aos clientes que pedem vídeo
+PREVIEW_AREA = (760, 480)    # tamanho máximo do preview (a janela escala)
+PREVIEW_JPEG_QUALITY = 70
+FPS_WINDOW = 60              # frames usados no FPS do status
+STOP_TIMEOUT_S = 2.0         # espera pelo fim da thread de processamento
+MIN_ZOOM = 1.0
+MAX_ZOOM = 4.0
+
+
+class Subscriber:
+    """Fila de eventos de um cliente inscrito, escrita por uma thread própria
+
+    O pipeline nunca espera um cliente lento: com a fila cheia o evento mais
+    antigo é descartado.
+    """
+
+    def __init__(self, handler, preview=False):
+        self.handler = handler
+        self.preview = preview
+        self.queue = queue.Queue(EVENT_QUEUE_SIZE)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def put(self, data):
+        while True:
+            try:
+                self.queue.put_nowait(data)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def run(self):
+        while True:
+            data = self.queue.get()
+            if data is None:
+                return
+            try:
+                self.handler.send_raw(data)
+            except OSError:
+                return
+
+    def close(self):
+        self.put(None)
+
+
+class ControlHandler(socketserver.StreamRequestHandler):
+    """Uma conexão de cliente: lê pedidos linha a linha e responde"""
+
+    def setup(self):
+        super().setup()
+        self.write_lock = threading.Lock()
+        self.subscriber = None
+        self.server.pipeline.connected(1)
+
+    def handle(self):
+        pipeline = self.server.pipeline
+        for line in self.rfile:
+            try:
+                reply = pipeline.handle_request(json.loads(line), self)
+            except (ValueError, KeyError, TypeError, OSError, RuntimeError) as e:
+                reply = {"ok": False, "error": str(e)}
+            try:
+                self.send_raw(encode_message(reply))
+            except OSError:
+                break
+
+    def finish(self):
+        if self.subscriber is not None:
+            self.server.pipeline.unsubscribe(self.subscriber)
+        self.server.pipeline.connected(-1)
+        super().finish()
+
+    def send_raw(self, data):
+        with self.write_lock:
+            self.wfile.write(data)
+
+
+class ControlServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class WaveControlDaemon(WaveControlCLI):
+    """Pipeline do CLI com estado compartilhado entre os clientes do socket"""
+
+    def __init__(self, socket_path=SOCKET_PATH, gestures_path=None, keep_camera=False, **options):
+        super().__init__(gesture_config=load_gesture_config(gestures_path),
+                         tuning=load_tuning(gestures_path), **options)
+        self.socket_path = socket_path
+        self.gestures_path = gestures_path
+        self.keep_camera = keep_camera
+        # pedidos dos clientes e a thread de processamento alteram o pipeline
+        # só com este lock (o worker o segura durante cada frame)
+        self.lock = threading.RLock()
+        self.subscribers = []
+        self.subscribers_lock = threading.Lock()
+        self.clients = 0
+        self.server = None
+        self.worker = None
+        self.renderer = LandmarkRenderer()
+        self.zoom_level = MIN_ZOOM
+        self.show_landmarks = True
+        self.phase = PHASE_STOPPED
+        self.capture_lost = False
+        self.last_preview_ts = 0.0
+        self.last_indicators = None
+        self.frame_times = deque(maxlen=FPS_WINDOW)
+        self.created_ts = time.monotonic()
+        self.load_ms = None
+        self.start_ms = None
+        self.last_pressed = None
+
+    # ===== Ciclo de vida =====
+    def load(self):
+        """Carrega e aquece o modelo e cria o teclado; ficam prontos até o fim"""
+        begin = time.monotonic()
+        options = {"model_path": self.model_path} if self.model_path else {}
+        print(f"🤖 Inicializando MediaPipe ({self.inference_backend})...")
+        main_cli.hands = create_backend(
+            self.inference_backend,
+            max_num_hands=self.max_hands,
+            model_complexity=0,
+            min_detection_confidence=main_cli.MIN_DET,
+            min_tracking_confidence=main_cli.MIN_TRK,
+            num_threads=self.num_threads,
+            **options,
+        )
+        warmup = BackendWarmup(main_cli.hands, *main_cli.WARMUP_SIZE, frames=main_cli.WARMUP_FRAMES)
+        warmup.start()
+        main_cli.kb = create_keyboard(self.action_keys)
+        if self.keep_camera:
+            self.open_camera()
+        print(f"🔥 Warm-up do modelo: {warmup.wait() * 1000:.0f} ms ({main_cli.WARMUP_FRAMES} frames)")
+        self.load_ms = (time.monotonic() - begin) * 1000
+
+    def open_camera(self):
+        self.cap, _ = self.find_camera()
+        if self.cap is None:
+            raise RuntimeError("Nenhuma câmera disponível")
+        self.capture_lost = False
+
+    def start(self):
+        """Inicia a detecção; retorna o tempo do start em ms"""
+        with self.lock:
+            if self.is_running:
+                return self.start_ms
+            if self.worker is not None and self.worker.is_alive():
+                # a thread anterior ainda não saiu (ex.: presa numa reconexão)
+                raise RuntimeError("A detecção anterior ainda está encerrando; tente de novo")
+            begin = time.monotonic()
+            if self.cap is None or not self.cap.isOpened():
+                self.open_camera()
+            self.tracker.reset()
+            self.action_executed = False
+            self.launch_ts = self.start_ts = time.time()
+            self.calibration.start(self.start_ts)
+            self.power.start(time.monotonic())
+            self.ready_ts = None
+            self.last_indicators = None
+            self.frame_times.clear()
+            self.is_running = True
+            self.worker = threading.Thread(target=self.process_video, daemon=True)
+            self.worker.start()
+            self.start_ms = (time.monotonic() - begin) * 1000
+        print(f"▶ Detecção iniciada em {self.start_ms:.0f} ms")
+        self.set_phase(PHASE_CALIBRATING)
+        return self.start_ms
+
+    def stop(self):
+        """Para a detecção; modelo e teclado continuam prontos"""
+        with self.lock:
+            if not self.is_running:
+                return
+            self.is_running = False
+            worker, cap = self.worker, self.cap
+            if not self.keep_camera:
+                self.cap = None
+        if not self.keep_camera:
+            # encerra uma reconexão em andamento; soltar a câmera durante um
+            # read derruba o processo, então ela só é liberada depois do join
+            cap.stop_event.set()
+        worker.join(STOP_TIMEOUT_S)
+        if worker.is_alive():
+            # presa numa reconexão (read bloqueia até a câmera voltar): solta a
+            # câmera para a thread sair; o próximo start abre de novo
+            print("⚠️  Captura não respondeu ao stop - liberando a câmera")
+            with self.lock:
+                if self.cap is cap:
+                    self.cap = None
+            cap.release()
+            worker.join(STOP_TIMEOUT_S)
+        elif not self.keep_camera:
+            cap.release()
+        if self.power.enabled:
+            print(self.power.format_summary())
+        if self.tracker.raw_frames:
+            print(f"〰️  Oscilação da classificação bruta: {self.tracker.flicker_rate():.1%} dos frames")
+        print("⏹ Detecção parada")
+        self.set_phase(PHASE_STOPPED)
+
+    def serve(self):
+        """Atende o socket de controle até ``shutdown`` (SIGTERM ou Ctrl+C)"""
+        if os.path.exists(self.socket_path):
+            client = find_daemon(self.socket_path)
+            if client is not None:
+                client.close()
+                raise RuntimeError(f"Já existe um daemon em {self.socket_path}")
+            os.unlink(self.socket_path)  # sobra de um daemon que não fechou
+        # socket criado já com 0600: outro usuário não alcança nem a janela entre bind e chmod
+        old_umask = os.umask(0o077)
+        try:
+            self.server = ControlServer(self.socket_path, ControlHandler)
+        finally:
+            os.umask(old_umask)
+        self.server.pipeline = self
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.shutdown())
+        print(f"🌊 Daemon pronto em {self.load_ms:.0f} ms, socket {self.socket_path}")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self):
+        # serve_forever roda em outra thread (ou na principal, no caso do sinal)
+        if self.server is not None:
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    def close(self):
+        self.stop()
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        with self.subscribers_lock:
+            for subscriber in self.subscribers:
+                subscriber.close()
+            self.subscribers = []
+        if self.server is not None:
+            self.server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        if main_cli.hands:
+            main_cli.hands.close()
+        print("👋 Daemon encerrado")
+
+    # ===== Processamento =====
+    def process_video(self):
+        cap = self.cap  # stop() pode soltar self.cap durante a leitura
+        while self.is_running and cap.isOpened():
+            self.power.drain_stale(cap)
+            ok, frame = cap.read()
+            if not ok:
+                break
+            with self.lock:
+                if not self.is_running:
+                    break
+                self.process_frame(frame, cap.last_timestamp)
+            time.sleep(self.power.frame_interval())  # ~30 FPS (menos no modo economia)
+        if self.is_running:
+            # fim do arquivo de vídeo ou câmera perdida de vez
+            self.emit("error", message="Captura encerrada")
+            threading.Thread(target=self.stop, daemon=True).start()
+
+    def process_frame(self, frame, capture_ts):
+        # Sem mão há algum tempo: só sonda o modelo (ou acorda por movimento)
+        if not self.power.should_infer(frame, time.monotonic()):
+            self.update_phase("neutral")
+            return
+        frame = cv2.flip(frame, 1)
+        frame = apply_digital_zoom(frame, self.zoom_level)
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        res = main_cli.hands.process(rgb, int(capture_ts * 1000))
+        if res is None:
+            return  # backend assíncrono sem resultado novo: o frame não entra no filtro
+        self.power.update(bool(res.multi_hand_landmarks))
+
+        if self.ready_ts is None:
+            self.ready_ts = time.time()
+            self.emit("ready", first_inference_ms=(self.ready_ts - self.launch_ts) * 1000)
+
+        self.tracker.update(res, self.action_table, self.swipe_table)
+        active = self.tracker.active()
+        action = active.filter.stable() if active else "neutral"
+
+        if self.calibration.update(frame, time.time(), self.ready_ts is not None,
+                                   self.cap.get(cv2.CAP_PROP_EXPOSURE)):
+            self.emit("calibrated", ms=self.calibration.duration * 1000, reason=self.calibration.reason)
+        if self.calibration.done:
+            self.dispatch(active, action, capture_ts)
+        self.frame_times.append(time.monotonic())
+        self.update_phase(action)
+
+        indicators = (action, f"{len(active.filter) if active else 0}/{self.tracker.window_size}")
+        if indicators != self.last_indicators:
+            self.last_indicators = indicators
+            self.emit("indicators", action=indicators[0], filter=indicators[1])
+
+        preview_ts = time.monotonic()
+        if preview_ts - self.last_preview_ts >= 1.0 / PREVIEW_FPS and self.wants_preview():
+            self.last_preview_ts = preview_ts
+            self.send_preview(frame, active)
+
+    def update_phase(self, action):
+        if self.capture_lost:
+            phase = PHASE_RECONNECTING
+        elif not self.calibration.done:
+            phase = PHASE_CALIBRATING
+        elif self.power.state == POWER_IDLE:
+            phase = PHASE_IDLE
+        elif action != "neutral" and self.action_executed:
+            phase = PHASE_WAITING
+        else:
+            phase = PHASE_ACTIVE
+        self.set_phase(phase)
+
+    def set_phase(self, phase):
+        if phase != self.phase:
+            self.phase = phase
+            self.emit("phase", phase=phase)
+
+    def on_action(self, action, latency_ms, active, swipe=False):
+        self.last_pressed = action
+        self.emit("action", action=action, key=self.action_keys[action], swipe=swipe,
+                  latency_ms=round(latency_ms, 1), hand=active.id if active else None)
+
+    def on_capture_event(self, event, cap):
+        with self.lock:
+            super().on_capture_event(event, cap)
+            self.capture_lost = event in ("lost", "failed")
+        self.emit("capture", state=event)
+        if self.is_running:
+            self.update_phase("neutral")
+
+    def send_preview(self, frame, active):
+        """Reduz, desenha landmarks e textos e envia como JPEG (mesmo visual da janela)"""
+        height, width = frame.shape[:2]
+        size = preview_size(width, height, *PREVIEW_AREA)
+        if size != (width, height):
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        font_scale = max(size[0] / width, 0.5)
+        if self.show_landmarks:
+            for track in self.tracker.tracks:
+                if track.landmarks is None:
+                    continue
+                color = LANDMARK_COLOR if track is active else INACTIVE_COLOR
+                pixels = self.renderer.draw(frame, track.landmarks, color)
+                if self.max_hands > 1:
+                    wrist = pixels[0]
+                    cv2.putText(frame, f"#{track.id}", (int(wrist[0]), int(wrist[1] + 20 * font_scale)),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.6 * font_scale, color, 2)
+        if self.zoom_level > 1.0:
+            cv2.putText(frame, f"Zoom: {self.zoom_level:.1f}x", (20, frame.shape[0] - 20),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6 * font_scale, (0, 255, 0), 2)
+        if not self.calibration.done:
+            cv2.putText(frame, "Calibrando...", (20, 40), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 255, 255), 2)
+        ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, PREVIEW_JPEG_QUALITY])
+        if ok:
+            self.emit("preview", preview=True, width=size[0], height=size[1],
+                      jpeg=base64.b64encode(jpeg.tobytes()).decode("ascii"))
+
+    # ===== Clientes =====
+    def connected(self, delta):
+        with self.subscribers_lock:
+            self.clients += delta
+
+    def subscribe(self, handler, preview):
+        subscriber = Subscriber(handler, preview)
+        with self.subscribers_lock:
+            self.subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.subscribers_lock:
+            if subscriber in self.subscribers:
+                self.subscribers.remove(subscriber)
+        subscriber.close()
+
+    def wants_preview(self):
+        with self.subscribers_lock:
+            return any(s.preview for s in self.subscribers)
+
+    def emit(self, event, preview=False, **data):
+        """Envia um evento a todos os inscritos (``preview`` só a quem pediu vídeo)"""
+        with self.subscribers_lock:
+            targets = [s for s in self.subscribers if s.preview or not preview]
+        if not targets:
+            return
+        data = encode_message(dict(data, event=event))
+        for subscriber in targets:
+            subscriber.put(data)
+
+    def settings(self):
+        return dict(self.tuning, zoom=self.zoom_level, landmarks=self.show_landmarks,
+                    hand_policy=self.tracker.policy, idle_after=self.power.idle_after_s,
+                    gestures=self.gestures_path)
+
+    def update_settings(self, changes):
+        """Valida tudo antes de aplicar; mudanças no filtro reiniciam as trilhas"""
+        unknown = set(changes) - set(self.settings())
+        if unknown:
+            raise ValueError(f"Ajustes desconhecidos: {', '.join(sorted(unknown))}")
+        with self.lock:
+            tuning = validate_tuning(dict(self.tuning, **{k: v for k, v in changes.items() if k in DEFAULT_TUNING}))
+            zoom = float(changes.get("zoom", self.zoom_level))
+            if not MIN_ZOOM <= zoom <= MAX_ZOOM:
+                raise ValueError(f"'zoom' deve estar entre {MIN_ZOOM:g} e {MAX_ZOOM:g}")
+            policy = changes.get("hand_policy", self.tracker.policy)
+            if policy not in HAND_POLICIES:
+                raise ValueError(f"Política de mão desconhecida: {policy}")
+            idle_after = float(changes.get("idle_after", self.power.idle_after_s))
+            if idle_after < 0:
+                raise ValueError("'idle_after' não pode ser negativo")
+            gesture_config = None
+            if "gestures" in changes:
+                gesture_config = load_gesture_config(changes["gestures"])
+                keys = set(gesture_config[1].values())
+                keyboard = create_keyboard(gesture_config[1]) if keys != set(self.action_keys.values()) else None
+
+            self.zoom_level = zoom
+            self.show_landmarks = bool(changes.get("landmarks", self.show_landmarks))
+            self.tracker.policy = policy
+            self.power.idle_after_s = idle_after
+            if gesture_config is not None:
+                self.action_table, self.action_keys, self.bindings = gesture_config
+                self.swipe_table = build_swipe_table(self.bindings)
+                self.gestures_path = changes["gestures"]
+                if keyboard is not None:
+                    main_cli.kb = keyboard
+            if tuning != self.tuning:
+                self.tuning = tuning
+                self.tracker.window_size = tuning["window_size"]
+                self.tracker.threshold = tuning["threshold"]
+                self.tracker.tuning = tuning
+                self.tracker.reset()
+                self.action_executed = False
+            settings = self.settings()
+        self.emit("settings", settings=settings)
+        return settings
+
+    def status(self):
+        times = self.frame_times
+        fps = (len(times) - 1) / (times[-1] - times[0]) if self.is_running and len(times) > 1 and times[-1] > times[0] else 0.0
+        return {
+            "pid": os.getpid(),
+            "socket": self.socket_path,
+            "uptime_s": time.monotonic() - self.created_ts,
+            "phase": self.phase,
+            "running": self.is_running,
+            "fps": fps,
+            "clients": self.clients,
+            "load_ms": self.load_ms,
+            "start_ms": self.start_ms,
+            "last_action": self.last_pressed,
+            "flicker": self.tracker.flicker_rate(),
+            "settings": self.settings(),
+        }
+
+    def handle_request(self, request, handler):
+        cmd = request.get("cmd")
+        if cmd == "ping":
+            return {"ok": True, "version": PROTOCOL_VERSION, "pid": os.getpid()}
+        if cmd == "status":
+            return dict(self.status(), ok=True)
+        if cmd == "start":
+            with self.lock:  # "started": foi este pedido que ligou a detecção
+                started = not self.is_running
+                start_ms = self.start()
+            return {"ok": True, "start_ms": start_ms, "started": started, "settings": self.settings()}
+        if cmd == "stop":
+            self.stop()
+            return {"ok": True}
+        if cmd == "set":
+            return {"ok": True, "settings": self.update_settings(request.get("settings", {}))}
+        if cmd == "subscribe":
+            if handler.subscriber is None:
+                handler.subscriber = self.subscribe(handler, bool(request.get("preview")))
+            return {"ok": True, "phase": self.phase, "settings": self.settings()}
+        if cmd == "preview":
+            if handler.subscriber is None:
+                raise ValueError("'preview' exige uma inscrição nesta conexão")
+            handler.subscriber.preview = bool(request.get("enabled"))
+            return {"ok": True}
+        if cmd == "shutdown":
+            self.shutdown()
+            return {"ok": True}
+        raise ValueError(f"Comando desconhecido: {cmd}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daemon do WaveControl (pipeline aquecido + socket de controle)")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="socket de controle (padrão: %(default)s)")
+    parser.add_argument("--capture", choices=CAPTURE_BACKENDS, default=main_cli.CAPTURE_BACKEND,
+                        help="backend de captura (padrão: %(default)s)")
+    parser.add_argument("--device", help="índice da câmera, /dev/videoN ou arquivo de vídeo")
+    parser.add_argument("--backend", choices=INFERENCE_BACKENDS, default=main_cli.INFERENCE_BACKEND,
+                        help="backend de inferência (padrão: %(default)s)")
+    parser.add_argument("--model", help="modelo .task do HandLandmarker (backend tasks)")
+    parser.add_argument("--gestures", help="arquivo JSON com a tabela de gestos (padrão: gestures.json)")
+    parser.add_argument("--max-hands", type=int, default=main_cli.MAX_HANDS,
+                        help="mãos detectadas por frame (padrão: %(default)s)")
+    parser.add_argument("--hand-policy", choices=HAND_POLICIES, default=main_cli.HAND_POLICY,
+                        help="qual mão pode disparar ações (padrão: %(default)s)")
+    parser.add_argument("--threads", type=int, default=main_cli.TFLITE_THREADS,
+                        help="threads de inferência do backend tflite (padrão: %(default)s)")
+    parser.add_argument("--idle-after", type=float, default=main_cli.IDLE_AFTER,
+                        help="segundos sem mão antes do modo economia, 0 = desativado (padrão: %(default)s)")
+    parser.add_argument("--keep-camera", action="store_true",
+                        help="mantém a câmera aberta entre stop e start")
+    parser.add_argument("--start", action="store_true", help="inicia a detecção assim que estiver pronto")
+    args = parser.parse_args()
+
+    device = args.device
+    if device is not None and device.isdigit():
+        device = int(device)
+
+    try:
+        daemon = WaveControlDaemon(socket_path=args.socket, gestures_path=args.gestures,
+                                   keep_camera=args.keep_camera, capture_backend=args.capture,
+                                   device=device, inference_backend=args.backend, model_path=args.model,
+                                   num_threads=args.threads, max_hands=args.max_hands,
+                                   hand_policy=args.hand_policy, idle_after=args.idle_after)
+        print("\n📋 Gestos disponíveis:")
+        for line in describe_bindings(daemon.bindings):
+            print(f"   {line}")
+        daemon.load()
+        if args.start:
+            daemon.start()
+        daemon.serve()
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"❌ Erro: {e}")
+        if main_cli.hands:
+            main_cli.hands.close()
+        return 1
+    except KeyboardInterrupt:
+        print("\n🛑 Interrompido pelo usuário")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""Classificação de gestos do WaveControl.
+
+O estado dos cinco dedos vira uma máscara de 5 bits (polegar = bit 0,
+mínimo = bit 4) e a ação sai de uma tabela pré-calculada de 32 entradas,
+então o custo por frame é O(1) independente do número de mapeamentos.
+
+A tabela vem de ``gestures.json`` (procurado em ``$WAVECONTROL_GESTURES``,
+``~/.config/wavecontrol/gestures.json`` e ao lado deste arquivo), lido só
+pelos pontos de entrada com ``load_gesture_config``/``load_tuning``: importar
+este módulo nunca lê arquivos e os valores do módulo são os padrões::
+
+    {
+      "bindings": {
+        "count:1": "next",            # qualquer combinação com 1 dedo
+        "index+middle": "prev",       # combinação exata de dedos
+        "none": "neutral"             # mão fechada
+      },
+      "actions": {
+        "next": "KEY_RIGHT",          # ação -> tecla do uinput
+        "prev": "KEY_LEFT"
+      }
+    }
+
+Entradas ``count:N`` são aplicadas primeiro; combinações explícitas
+sobrescrevem. Sem arquivo, vale o mapeamento por contagem original
+(1 → próximo, 2 → anterior, 3 → início, 4 → fim) mais os swipes
+(``swipe:left`` → próximo, ``swipe:right`` → anterior).
+
+Um dedo conta como estendido quando a ponta passa da articulação por uma
+margem proporcional ao tamanho da mão no quadro (punho → base do dedo
+médio), com histerese por dedo: depois de estendido, só recolhe quando cai
+abaixo de ``margem - histerese``. A seção opcional ``"tuning"`` ajusta o
+filtro, as margens e a histerese (``window_size``, ``threshold``,
+``finger_margin``, ``thumb_margin``, ``hysteresis``); o ``tune.py`` grava
+essa seção a partir de trilhas rotuladas. O ajuste é passado explicitamente
+(``finger_bits(..., tuning)``, ``HandTracker(tuning=...)``), então cada
+chamador usa o seu sem afetar os demais.
+
+Swipes são detectados sem inferência extra: um buffer circular NumPy
+guarda as posições recentes do punho e das pontas dos dedos e o
+deslocamento/velocidade horizontais são atualizados a cada frame.
+"""
+import json
+import os
+
+import numpy as np
+
+try:
+    import uinput  # só para conferir os nomes das teclas; replay e tune rodam sem ele
+except ImportError:
+    uinput = None
+
+# ===== Utilidades de dedos =====
+FINGERS = ["thumb", "index", "middle", "ring", "pinky"]
+TIP = { "thumb": 4, "index": 8, "middle": 12, "ring": 16, "pinky": 20 }
+PIP = { "thumb": 3, "index": 6, "middle": 10, "ring": 14, "pinky": 18 }
+TIP_INDICES = [TIP[name] for name in FINGERS]
+PIP_INDICES = [PIP[name] for name in FINGERS]
+WRIST, MIDDLE_MCP = 0, 9
+# Margens em frações do tamanho da mão (punho → base do dedo médio), então
+# o teste vale igual de perto, de longe ou com zoom digital.
+FINGER_MARGIN = 0.25     # quanto a ponta precisa passar da articulação
+THUMB_MARGIN = 0.25      # idem para o polegar, no eixo X
+FINGER_HYSTERESIS = 0.1  # um dedo estendido só recolhe abaixo de margem - histerese
+MIN_HAND_SCALE = 1e-3    # evita divisão por zero com landmarks degenerados
+
+def hand_scale(lm):
+    """Distância punho → base do dedo médio (coord. normalizadas)"""
+    dx = lm[MIDDLE_MCP].x - lm[WRIST].x
+    dy = lm[MIDDLE_MCP].y - lm[WRIST].y
+    return max((dx * dx + dy * dy) ** 0.5, MIN_HAND_SCALE)
+
+def finger_extension(lm, tip_idx, pip_idx, handed_label, scale=None):
+    """Quanto a ponta passou da articulação, em frações do tamanho da mão"""
+    tip = lm[tip_idx]
+    pip = lm[pip_idx]
+    scale = scale or hand_scale(lm)
+    if tip_idx == TIP["thumb"]:
+        # polegar: eixo X depende da mão
+        return (pip.x - tip.x if handed_label == "Right" else tip.x - pip.x) / scale
+    # demais dedos: eixo Y (origem no topo)
+    return (pip.y - tip.y) / scale
+
+def finger_extended(lm, tip_idx, pip_idx, handed_label, margin=None, thumb_margin=None):
+    if tip_idx == TIP["thumb"]:
+        margin = THUMB_MARGIN if thumb_margin is None else thumb_margin
+    elif margin is None:
+        margin = FINGER_MARGIN
+    return finger_extension(lm, tip_idx, pip_idx, handed_label) > margin
+
+def count_extended(lm, handed_label):
+    cnt = 0
+    for name in FINGERS:
+        if finger_extended(lm, TIP[name], PIP[name], handed_label):
+            cnt += 1
+    return cnt
+
+def finger_bits(lm, handed_label, tuning=None):
+    """Máscaras (entra, mantém): dedos acima da margem e acima de margem - histerese
+
+    ``tuning`` traz ``finger_margin``, ``thumb_margin`` e ``hysteresis``
+    (padrão: ``DEFAULT_TUNING``).
+    """
+    tuning = tuning or DEFAULT_TUNING
+    finger_margin, thumb_margin = tuning["finger_margin"], tuning["thumb_margin"]
+    hysteresis = tuning["hysteresis"]
+    scale = hand_scale(lm)
+    enter = keep = 0
+    for bit, name in enumerate(FINGERS):
+        ext = finger_extension(lm, TIP[name], PIP[name], handed_label, scale)
+        margin = thumb_margin if bit == 0 else finger_margin
+        if ext > margin:
+            enter |= 1 << bit
+        if ext > margin - hysteresis:
+            keep |= 1 << bit
+    return enter, keep
+
+def apply_hysteresis(enter, keep, previous):
+    """Dedos que entram agora ou que já estavam estendidos e não recolheram"""
+    return enter | (previous & keep)
+
+def finger_mask(lm, handed_label, previous=0, tuning=None):
+    """Máscara de 5 bits com os dedos estendidos (polegar = bit 0)
+
+    ``previous`` é a máscara do frame anterior da mesma mão (histerese).
+    """
+    return apply_hysteresis(*finger_bits(lm, handed_label, tuning), previous)
+
+def finger_masks(points, right_handed, margin=None, thumb_margin=None):
+    """Versão vetorizada do teste sem histerese para N mãos de uma vez
+
+    ``points``: array (N, 21, 2+) normalizado; ``right_handed``: (N,) bool.
+    """
+    margin = FINGER_MARGIN if margin is None else margin
+    thumb_margin = THUMB_MARGIN if thumb_margin is None else thumb_margin
+    scale = np.maximum(np.hypot(*(points[:, MIDDLE_MCP, :2] - points[:, WRIST, :2]).T), MIN_HAND_SCALE)
+    tips = points[:, TIP_INDICES, :2]
+    pips = points[:, PIP_INDICES, :2]
+    extended = pips[:, :, 1] - tips[:, :, 1] > margin * scale[:, None]
+    thumb_dx = tips[:, 0, 0] - pips[:, 0, 0]
+    extended[:, 0] = np.where(right_handed, -thumb_dx, thumb_dx) > thumb_margin * scale
+    return (extended.astype(np.int32) << np.arange(5, dtype=np.int32)).sum(axis=1)
+
+# ===== Tabela de ações =====
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GESTURES_CONFIG_PATHS = [
+    os.environ.get("WAVECONTROL_GESTURES", ""),
+    os.path.join(os.path.expanduser("~"), ".config", "wavecontrol", "gestures.json"),
+    os.path.join(BASE_DIR, "gestures.json"),
+]
+
+DEFAULT_BINDINGS = {"count:1": "next", "count:2": "prev", "count:3": "home", "count:4": "end",
+                    "swipe:left": "next", "swipe:right": "prev"}
+SWIPE_DIRECTIONS = ("left", "right")
+DEFAULT_TUNING = {"window_size": 8, "threshold": 0.75, "finger_margin": FINGER_MARGIN,
+                  "thumb_margin": THUMB_MARGIN, "hysteresis": FINGER_HYSTERESIS}
+DEFAULT_ACTIONS = {"next": "KEY_RIGHT", "prev": "KEY_LEFT", "home": "KEY_HOME", "end": "KEY_END"}
+
+
+def is_swipe_binding(text):
+    return text.strip().lower().startswith("swipe:")
+
+
+def parse_binding(text):
+    """Converte uma chave de binding nas máscaras que ela cobre"""
+    text = text.strip().lower()
+    if is_swipe_binding(text):
+        return []
+    if text.startswith("count:"):
+        try:
+            n = int(text[len("count:"):])
+        except ValueError:
+            raise ValueError(f"Contagem inválida em '{text}'")
+        return [mask for mask in range(32) if bin(mask).count("1") == n]
+    if text in ("none", "fist"):
+        return [0]
+    mask = 0
+    for name in text.split("+"):
+        name = name.strip()
+        if name not in FINGERS:
+            raise ValueError(f"Dedo desconhecido '{name}' em '{text}' (use {', '.join(FINGERS)})")
+        mask |= 1 << FINGERS.index(name)
+    return [mask]
+
+
+def build_action_table(bindings):
+    """Monta a tabela de 32 entradas (máscara -> ação)"""
+    table = ["neutral"] * 32
+    # contagens primeiro, combinações explícitas sobrescrevem
+    ordered = sorted(bindings.items(), key=lambda item: not item[0].strip().lower().startswith("count:"))
+    for key, action in ordered:
+        for mask in parse_binding(key):
+            table[mask] = action
+    return table
+
+
+def build_swipe_table(bindings):
+    """Mapeia os gestos dinâmicos ('swipe_left', 'swipe_right') para ações"""
+    table = {}
+    for key, action in bindings.items():
+        if not is_swipe_binding(key):
+            continue
+        direction = key.strip().lower()[len("swipe:"):]
+        if direction not in SWIPE_DIRECTIONS:
+            raise ValueError(f"Direção de swipe desconhecida em '{key}' (use {', '.join(SWIPE_DIRECTIONS)})")
+        if action != "neutral":
+            table[f"swipe_{direction}"] = action
+    return table
+
+
+def find_gesture_config():
+    """Primeiro arquivo de configuração de gestos existente (ou None)"""
+    for path in GESTURES_CONFIG_PATHS:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+def load_gesture_config(path=None):
+    """Carrega bindings e teclas; retorna (tabela, ações, bindings)"""
+    bindings = dict(DEFAULT_BINDINGS)
+    actions = dict(DEFAULT_ACTIONS)
+    path = path or find_gesture_config()
+    if path:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        bindings = config.get("bindings", bindings)
+        actions = config.get("actions", actions)
+
+    for action, key in actions.items():
+        if not key.startswith("KEY_") or (uinput is not None and not hasattr(uinput, key)):
+            raise ValueError(f"Tecla inválida '{key}' para a ação '{action}'")
+    for key, action in bindings.items():
+        if action != "neutral" and action not in actions:
+            raise ValueError(f"Ação '{action}' de '{key}' não tem tecla em 'actions'")
+    build_swipe_table(bindings)  # valida as direções
+    return build_action_table(bindings), actions, bindings
+
+
+def load_tuning(path=None):
+    """Parâmetros do filtro e das margens (seção "tuning", com valores padrão)"""
+    tuning = dict(DEFAULT_TUNING)
+    path = path or find_gesture_config()
+    if path:
+        with open(path, encoding="utf-8") as f:
+            tuning.update(json.load(f).get("tuning", {}))
+    return validate_tuning(tuning)
+
+
+def validate_tuning(tuning):
+    """Confere os parâmetros de ajuste e normaliza os tipos"""
+    unknown = set(tuning) - set(DEFAULT_TUNING)
+    if unknown:
+        raise ValueError(f"Parâmetros de ajuste desconhecidos: {', '.join(sorted(unknown))}")
+    if int(tuning["window_size"]) < 1 or not 0 < float(tuning["threshold"]) <= 1:
+        raise ValueError("'window_size' deve ser >= 1 e 'threshold' estar em (0, 1]")
+    if float(tuning["hysteresis"]) < 0:
+        raise ValueError("'hysteresis' não pode ser negativa")
+    tuning["window_size"] = int(tuning["window_size"])
+    for key in ("threshold", "finger_margin", "thumb_margin", "hysteresis"):
+        tuning[key] = float(tuning[key])
+    return tuning
+
+
+# Padrões do módulo; o arquivo do usuário é carregado pelos pontos de entrada
+ACTION_TABLE = build_action_table(DEFAULT_BINDINGS)
+ACTION_KEYS = dict(DEFAULT_ACTIONS)
+ACTION_BINDINGS = dict(DEFAULT_BINDINGS)
+SWIPE_TABLE = build_swipe_table(DEFAULT_BINDINGS)
+
+# ===== Gesto -> Ação =====
+def classify_gesture(lm, handed_label, table=None, previous=0, tuning=None):
+    return (table or ACTION_TABLE)[finger_mask(lm, handed_label, previous, tuning)]
+
+
+# ===== Filtro Temporal =====
+GESTURE_WINDOW_SIZE = DEFAULT_TUNING["window_size"]  # número de frames para confirmar gesto (padrão 8)
+CONSISTENCY_THRESHOLD = DEFAULT_TUNING["threshold"]  # fração das amostras que devem ser iguais (padrão 75%)
+
+class GestureFilter:
+    """Janela de gestos recentes de uma mão; confirma o gesto por maioria"""
+
+    def __init__(self, window_size=GESTURE_WINDOW_SIZE, threshold=CONSISTENCY_THRESHOLD):
+        self.window_size = window_size
+        self.threshold = threshold
+        self.history = []
+
+    def __len__(self):
+        return len(self.history)
+
+    def clear(self):
+        self.history.clear()
+
+    def add(self, gesture):
+        """Adiciona gesto ao histórico e mantém tamanho da janela"""
+        self.history.append(gesture)
+        if len(self.history) > self.window_size:
+            self.history.pop(0)
+
+    def stable(self):
+        """Retorna gesto estável baseado no histórico ou 'neutral' se inconsistente"""
+        if len(self.history) < self.window_size:
+            return "neutral"  # aguarda janela completa
+        
+        # Conta ocorrências de cada gesto
+        gesture_counts = {}
+        for gesture in self.history:
+            gesture_counts[gesture] = gesture_counts.get(gesture, 0) + 1
+        
+        # Encontra o gesto mais frequente
+        most_common_gesture = max(gesture_counts, key=gesture_counts.get)
+        most_common_count = gesture_counts[most_common_gesture]
+        
+        # Verifica se atende o threshold de consistência
+        consistency_ratio = most_common_count / len(self.history)
+        
+        if consistency_ratio >= self.threshold and most_common_gesture != "neutral":
+            return most_common_gesture
+        
+        return "neutral"
+
+
+# ===== Gestos dinâmicos (swipe) =====
+SWIPE_BUFFER_SIZE = 32          # amostras guardadas no buffer circular
+SWIPE_WINDOW_S = 0.4            # janela em que o deslocamento é medido
+SWIPE_MIN_DISPLACEMENT = 0.25   # deslocamento horizontal mínimo (fração da largura)
+SWIPE_MIN_VELOCITY = 1.0        # velocidade horizontal mínima (larguras/s, média exponencial)
+SWIPE_MAX_VERTICAL = 0.5        # |dy| máximo em relação a |dx|
+SWIPE_COOLDOWN_S = 0.6          # intervalo mínimo entre swipes
+SWIPE_VELOCITY_ALPHA = 0.5      # peso do frame atual na média da velocidade
+TRAJECTORY_POINTS = [0, TIP["thumb"], TIP["index"], TIP["middle"], TIP["ring"], TIP["pinky"]]
+
+
+class TrajectoryBuffer:
+    """Buffer circular de tamanho fixo com punho + pontas dos dedos e timestamps"""
+
+    def __init__(self, size=SWIPE_BUFFER_SIZE):
+        self.size = size
+        self.ts = np.zeros(size, np.float64)
+        self.points = np.zeros((size, len(TRAJECTORY_POINTS), 2), np.float32)
+        self.centers = np.zeros((size, 2), np.float32)  # média dos pontos de cada amostra
+        self.total = 0  # amostras já escritas (a posição é total % size)
+
+    def __len__(self):
+        return min(self.total, self.size)
+
+    def clear(self):
+        self.total = 0
+
+    def push(self, ts, lm):
+        """Grava uma amostra e retorna seu índice absoluto"""
+        slot = self.total % self.size
+        self.ts[slot] = ts
+        points = self.points[slot]
+        for row, idx in enumerate(TRAJECTORY_POINTS):
+            points[row, 0] = lm[idx].x
+            points[row, 1] = lm[idx].y
+        self.centers[slot] = points.mean(axis=0)
+        self.total += 1
+        return self.total - 1
+
+    def ordered(self):
+        """Cópia cronológica (ts, pontos) do conteúdo atual"""
+        n = len(self)
+        idx = (np.arange(self.total - n, self.total)) % self.size
+        return self.ts[idx].copy(), self.points[idx].copy()
+
+
+class SwipeDetector:
+    """Detecta swipes horizontais a partir do ``TrajectoryBuffer``
+
+    O início da janela avança junto com o tempo (custo amortizado O(1) por
+    frame) e a velocidade é uma média exponencial das velocidades
+    instantâneas, então nada é recalculado sobre o histórico inteiro.
+    """
+
+    def __init__(self, buffer_size=SWIPE_BUFFER_SIZE, window_s=SWIPE_WINDOW_S,
+                 min_displacement=SWIPE_MIN_DISPLACEMENT, min_velocity=SWIPE_MIN_VELOCITY,
+                 max_vertical=SWIPE_MAX_VERTICAL, cooldown_s=SWIPE_COOLDOWN_S,
+                 velocity_alpha=SWIPE_VELOCITY_ALPHA):
+        self.buffer = TrajectoryBuffer(buffer_size)
+        self.window_s = window_s
+        self.min_displacement = min_displacement
+        self.min_velocity = min_velocity
+        self.max_vertical = max_vertical
+        self.cooldown_s = cooldown_s
+        self.velocity_alpha = velocity_alpha
+        self.reset()
+
+    def reset(self):
+        self.buffer.clear()
+        self.start = 0          # índice absoluto da amostra mais antiga da janela
+        self.velocity = 0.0     # velocidade horizontal suavizada
+        self.dx = 0.0
+        self.dy = 0.0
+        self.last_swipe_ts = None
+
+    def update(self, ts, lm):
+        """Alimenta uma amostra (``lm`` None = mão ausente); retorna o swipe ou None"""
+        if lm is None:
+            return None  # frames perdidos não quebram a trajetória; a janela expira sozinha
+        buf = self.buffer
+        i = buf.push(ts, lm)
+        slot = i % buf.size
+        if i > 0 and i > self.start:
+            prev = (i - 1) % buf.size
+            dt = ts - buf.ts[prev]
+            if dt > 0:
+                vx = (buf.centers[slot, 0] - buf.centers[prev, 0]) / dt
+                self.velocity += self.velocity_alpha * (vx - self.velocity)
+        else:
+            self.velocity = 0.0
+
+        # avança o início da janela (amostras antigas ou sobrescritas)
+        self.start = max(self.start, i - buf.size + 1)
+        while self.start < i and ts - buf.ts[self.start % buf.size] > self.window_s:
+            self.start += 1
+        first = self.start % buf.size
+        self.dx = float(buf.centers[slot, 0] - buf.centers[first, 0])
+        self.dy = float(buf.centers[slot, 1] - buf.centers[first, 1])
+
+        if self.last_swipe_ts is not None and ts - self.last_swipe_ts < self.cooldown_s:
+            return None
+        if (abs(self.dx) >= self.min_displacement
+                and abs(self.velocity) >= self.min_velocity
+                and self.velocity * self.dx > 0
+                and abs(self.dy) <= self.max_vertical * abs(self.dx)):
+            # frame espelhado: x crescente = mão indo para a direita do usuário
+            gesture = "swipe_right" if self.dx > 0 else "swipe_left"
+            self.last_swipe_ts = ts
+            self.start = i  # o próximo swipe começa a partir daqui
+            self.velocity = 0.0
+            return gesture
+        return None
+
+
+# ===== Descrição para a interface =====
+COUNT_ICONS = {0: "✊", 1: "👆", 2: "✌️", 3: "🤟", 4: "🖖", 5: "🖐️"}
+SWIPE_LABELS = {"left": "👈 Swipe esquerda", "right": "👉 Swipe direita"}
+ACTION_LABELS = {"next": "Próximo", "prev": "Anterior", "home": "Início", "end": "Fim", "neutral": "Neutro"}
+
+
+def describe_bindings(bindings):
+    """Linhas legíveis dos bindings (ex.: '👆 1 → Próximo')"""
+    lines = []
+    for key, action in bindings.items():
+        key = key.strip().lower()
+        label = ACTION_LABELS.get(action, action)
+        if key.startswith("count:"):
+            n = int(key[len("count:"):])
+            lines.append(f"{COUNT_ICONS.get(n, '')} {n} → {label}".strip())
+        elif is_swipe_binding(key):
+            direction = key[len("swipe:"):]
+            lines.append(f"{SWIPE_LABELS.get(direction, key)} → {label}")
+        else:
+            lines.append(f"{key} → {label}")
+    if not any(mask == 0 for key in bindings for mask in parse_binding(key)):
+        lines.append(f"{COUNT_ICONS[0]} 0 → {ACTION_LABELS['neutral']}")
+    return lines
@@ -1,20 +1,40 @@
 #!/usr/bin/env python3
+from startup import STARTUP  # primeiro import: mede a partida desde o lançamento
+import base64
 import cv2
+import numpy as np
+import os
 import time
 import uinput
-import mediapipe as mp
 import gi
 gi.require_version('Gtk', '3.0')
 from gi.repository import Gtk, GLib, GdkPixbuf, Gdk
 import threading
+from collections import namedtuple
+from calibration import AdaptiveCalibration
+from capture import open_capture
+from control import (PHASE_ACTIVE, PHASE_CALIBRATING, PHASE_IDLE, PHASE_RECONNECTING, PHASE_STOPPED,
+                     PHASE_WAITING, DaemonError, find_daemon)
+from tracking import HandTracker
+from gestures import (ACTION_BINDINGS, ACTION_KEYS, ACTION_TABLE, DEFAULT_TUNING, SWIPE_TABLE,
+                      build_swipe_table, describe_bindings, load_gesture_config, load_tuning)
+from power import POWER_IDLE, PowerManager
+from tracing import open_tracer
+from render import INACTIVE_COLOR, LANDMARK_COLOR, LandmarkRenderer, apply_digital_zoom, preview_size
+STARTUP.mark("imports")
 
 # ===== Configurações =====
 MIN_DET = 0.6
 MIN_TRK = 0.6
 # Sistema baseado em estado neutral (sem cooldown de tempo)
-CALIBRATION_S = 2.0     # tempo inicial para estabilizar câmera
+CALIBRATION_MAX_S = 2.0  # teto da calibração (termina antes se a câmera estabilizar)
 DRAW = True             # mostrar janela com landmarks
 CAM_INDEX = 0           # índice da webcam
+CAPTURE_BACKEND = "opencv"  # "opencv" (genérico) ou "v4l2" (mmap direto)
+INFERENCE_BACKEND = "solutions"  # "solutions" (síncrono), "tasks" (LIVE_STREAM) ou "tflite"
+TFLITE_THREADS = 4      # threads do interpretador no backend tflite
+WARMUP_FRAMES = 5       # frames sintéticos para aquecer o modelo
+WARMUP_SIZE = (800, 800)  # mesma resolução pedida à câmera
 
 # ===== Configurações de Zoom =====
 DEFAULT_ZOOM = 1.0      # zoom padrão (sem zoom)
@@ -22,126 +42,88 @@ MIN_ZOOM = 1.0          # zoom mínimo
 MAX_ZOOM = 4.0          # zoom máximo
 
 # ===== Filtro Temporal =====
-GESTURE_WINDOW_SIZE = 8  # número de frames para confirmar gesto
-CONSISTENCY_THRESHOLD = 0.75  # 75% das amostras devem ser iguais
+# janela, limiar e margens dos dedos vêm da seção "tuning" do gestures.json (ver tune.py),
+# carregada por load_gestures() em main()
+TUNING = DEFAULT_TUNING
 
-# ===== Dispositivo virtual (uinput) =====
-kb = uinput.Device([uinput.KEY_RIGHT, uinput.KEY_LEFT, uinput.KEY_HOME, uinput.KEY_END])
+# ===== Várias mãos =====
+MAX_HANDS = 1           # mãos detectadas por frame (cada uma com ID e filtro próprios)
+HAND_POLICY = "first"   # quem dispara ações: first, largest, right, left ou any
 
-# ===== MediaPipe =====
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-hands = mp_hands.Hands(
-    max_num_hands=1,
-    model_complexity=0,
-    min_detection_confidence=MIN_DET,
-    min_tracking_confidence=MIN_TRK,
-)
+# ===== Preview =====
+PREVIEW_FPS = 10        # limite do preview; a inferência segue no próprio ritmo (~30 FPS)
 
-# ===== Utilidades de dedos =====
-TIP = { "thumb": 4, "index": 8, "middle": 12, "ring": 16, "pinky": 20 }
-PIP = { "thumb": 3, "index": 6, "middle": 10, "ring": 14, "pinky": 18 }
+# ===== Trace de latência =====
+TRACE_FILE = os.environ.get("WAVECONTROL_TRACE")  # .json Chrome/Perfetto (None = desligado)
 
-def finger_extended(lm, tip_idx, pip_idx, handed_label):
-    tip = lm[tip_idx]
-    pip = lm[pip_idx]
-    if tip_idx == TIP["thumb"]:
-        # polegar: eixo X depende da mão (mais rigoroso)
-        if handed_label == "Right":
-            return tip.x < pip.x - 0.05
-        else:
-            return tip.x > pip.x + 0.05
-    # demais dedos: eixo Y (origem no topo) - mais rigoroso
-    return tip.y < pip.y - 0.05
-
-def count_extended(lm, handed_label):
-    cnt = 0
-    for name in ["thumb","index","middle","ring","pinky"]:
-        if finger_extended(lm, TIP[name], PIP[name], handed_label):
-            cnt += 1
-    return cnt
+# ===== Economia de energia =====
+IDLE_AFTER = 10.0       # segundos sem mão antes de reduzir captura/inferência (0 = nunca)
 
-# ===== Histórico de Gestos =====
-gesture_history = []
+# ===== Dispositivo virtual (uinput) e MediaPipe =====
+# Criados por create_pipeline() só quando a janela roda o pipeline sozinha.
+# Com um daemon no ar (daemon.py) a janela é só cliente: não abre câmera,
+# modelo nem teclado e nem chega a importar o MediaPipe.
+kb = None
+hands = None
+warmup = None
 
-def add_gesture_to_history(gesture):
-    """Adiciona gesto ao histórico e mantém tamanho da janela"""
-    gesture_history.append(gesture)
-    if len(gesture_history) > GESTURE_WINDOW_SIZE:
-        gesture_history.pop(0)
-
-def get_stable_gesture():
-    """Retorna gesto estável baseado no histórico ou 'neutral' se inconsistente"""
-    if len(gesture_history) < GESTURE_WINDOW_SIZE:
-        return "neutral"  # aguarda janela completa
-    
-    # Conta ocorrências de cada gesto
-    gesture_counts = {}
-    for gesture in gesture_history:
-        gesture_counts[gesture] = gesture_counts.get(gesture, 0) + 1
-    
-    # Encontra o gesto mais frequente
-    most_common_gesture = max(gesture_counts, key=gesture_counts.get)
-    most_common_count = gesture_counts[most_common_gesture]
-    
-    # Verifica se atende o threshold de consistência
-    consistency_ratio = most_common_count / len(gesture_history)
-    
-    if consistency_ratio >= CONSISTENCY_THRESHOLD and most_common_gesture != "neutral":
-        return most_common_gesture
-    
-    return "neutral"
+def load_gestures():
+    """Tabela de gestos, teclas e ajuste do gestures.json do usuário (ou os padrões)"""
+    global ACTION_TABLE, ACTION_KEYS, ACTION_BINDINGS, SWIPE_TABLE, TUNING
+    ACTION_TABLE, ACTION_KEYS, ACTION_BINDINGS = load_gesture_config()
+    SWIPE_TABLE = build_swipe_table(ACTION_BINDINGS)
+    TUNING = load_tuning()
 
-# ===== Gesto -> Ação =====
-# 1 dedo: próximo; 2 dedos: anterior; 3 dedos: início; 4 dedos: fim; senão: neutro
-def classify_gesture(lm, handed_label):
-    n = count_extended(lm, handed_label)
-    if n == 1: return "next"      # um dedo levantado
-    if n == 2: return "prev"      # dois dedos levantados
-    if n == 3: return "home"      # três dedos levantados
-    if n == 4: return "end"       # quatro dedos levantados
-    return "neutral"
+def create_pipeline():
+    """Teclado com todas as teclas da tabela de gestos e modelo aquecendo em paralelo"""
+    global kb, hands, warmup
+    from backends import BackendWarmup, create_backend  # MediaPipe: só sem daemon
+    STARTUP.mark("import mediapipe")
+    kb = uinput.Device([getattr(uinput, key) for key in sorted(set(ACTION_KEYS.values()))])
+    hands = create_backend(
+        INFERENCE_BACKEND,
+        num_threads=TFLITE_THREADS,
+        max_num_hands=MAX_HANDS,
+        model_complexity=0,
+        min_detection_confidence=MIN_DET,
+        min_tracking_confidence=MIN_TRK,
+    )
+    STARTUP.mark("modelo")
+    # aquece enquanto a janela é montada e a câmera abre
+    warmup = BackendWarmup(hands, *WARMUP_SIZE, frames=WARMUP_FRAMES)
+    warmup.start()
 
-def press_next():
-    kb.emit_click(uinput.KEY_RIGHT)
+# ===== Preview =====
+# Estado lido pelo worker a cada frame. É substituído por inteiro pela thread
+# do GTK (size-allocate, toggles, visibilidade), então o worker nunca chama
+# métodos de widgets.
+PreviewState = namedtuple("PreviewState", "enabled width height show_landmarks")
 
-def press_prev():
-    kb.emit_click(uinput.KEY_LEFT)
+# ===== Ações =====
+# textos do cabeçalho e do status para cada ação conhecida
+ACTION_STATUS = {
+    "next": ("Próximo →", "Próximo slide executado"),
+    "prev": ("← Anterior", "Slide anterior executado"),
+    "home": ("⏮ Início", "Indo para o início"),
+    "end": ("⏭ Fim", "Indo para o fim"),
+}
 
-def press_home():
-    kb.emit_click(uinput.KEY_HOME)
+# textos do cabeçalho e do status para cada fase publicada pelo daemon
+PHASE_STATUS = {
+    PHASE_STOPPED: ("Parado", "Sistema parado"),
+    PHASE_CALIBRATING: ("Calibrando...", "Sistema calibrando..."),
+    PHASE_ACTIVE: ("Ativo", "Sistema ativo - Pronto"),
+    PHASE_WAITING: ("Aguardando...", "Aguardando posição neutra"),
+    PHASE_IDLE: ("Economia", "Modo economia - mostre a mão para retomar"),
+    PHASE_RECONNECTING: ("Reconectando...", "Câmera desconectada - aguardando"),
+}
 
-def press_end():
-    kb.emit_click(uinput.KEY_END)
-
-def apply_digital_zoom(frame, zoom_level):
-    """Aplica zoom digital no frame"""
-    if zoom_level <= 1.0:
-        return frame
-    
-    height, width = frame.shape[:2]
-    
-    # Calcula o tamanho da região central a ser extraída
-    crop_width = int(width / zoom_level)
-    crop_height = int(height / zoom_level)
-    
-    # Calcula as coordenadas centrais para o crop
-    start_x = (width - crop_width) // 2
-    start_y = (height - crop_height) // 2
-    end_x = start_x + crop_width
-    end_y = start_y + crop_height
-    
-    # Extrai a região central
-    cropped = frame[start_y:end_y, start_x:end_x]
-    
-    # Redimensiona de volta ao tamanho original
-    zoomed = cv2.resize(cropped, (width, height), interpolation=cv2.INTER_LINEAR)
-    
-    return zoomed
+def press_action(action):
+    kb.emit_click(getattr(uinput, ACTION_KEYS[action]))
 
 # ===== Interface Gráfica GTK =====
 class WaveControlGUI(Gtk.Window):
-    def __init__(self):
+    def __init__(self, client=None):
         Gtk.Window.__init__(self)
         # Configuração inicial da janela
         self.set_default_size(1000, 600)
@@ -157,15 +139,48 @@ class WaveControlGUI(Gtk.Window):
         self.is_running = False
         self.cap = None
         self.start_ts = None
+        self.calibration = AdaptiveCalibration(max_s=CALIBRATION_MAX_S)
+        self.launch_ts = None
+        self.ready_ts = None
+        self.warmup = warmup
         self.last_action = "neutral"
         self.action_executed = False
         self.zoom_level = DEFAULT_ZOOM
+        self.tracker = HandTracker(HAND_POLICY, TUNING["window_size"], TUNING["threshold"], tuning=TUNING)
+        self.power = PowerManager(idle_after_s=IDLE_AFTER)
+        self.tracer = open_tracer(TRACE_FILE)
+        
+        # Preview: o worker publica o frame mais recente e o DrawingArea
+        # escala na hora de pintar; sem janela visível o estágio é pulado
+        self.preview_lock = threading.Lock()
+        self.preview_frame = None    # último frame publicado (ainda não pintado)
+        self.preview_pixbuf = None   # pixbuf do frame em exibição
+        self.last_preview_ts = 0.0
+        self.window_mapped = False
+        self.window_iconified = False
+        self.window_obscured = False
+        self.view_width = 0
+        self.view_height = 0
+        self.preview_state = PreviewState(False, 0, 0, DRAW)
+        self.renderer = LandmarkRenderer()
+        self.last_indicators = None
+        self.filter_window = TUNING["window_size"]  # com daemon, a janela dele
+        
+        # Cliente do daemon: comandos pelo socket e eventos numa thread própria
+        self.client = client
+        self.events = None
+        self.started_daemon = False  # fechar a janela só para a detecção que ela ligou
         
         # Setup da interface
         self.setup_ui()
         
         # Conecta eventos
         self.connect("destroy", self.on_window_destroy)
+        self.add_events(Gdk.EventMask.VISIBILITY_NOTIFY_MASK | Gdk.EventMask.STRUCTURE_MASK)
+        self.connect("map-event", self.on_window_visibility)
+        self.connect("unmap-event", self.on_window_visibility)
+        self.connect("window-state-event", self.on_window_visibility)
+        self.connect("visibility-notify-event", self.on_window_visibility)
         
         # Inicia automaticamente
         GLib.idle_add(self.start_detection)
@@ -442,13 +457,7 @@ class WaveControlGUI(Gtk.Window):
         gestures_compact = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
         gestures_compact.get_style_context().add_class("gestures-compact")
         
-        gestures = [
-            "👆 1 → Próximo",
-            "✌️ 2 → Anterior",
-            "🤟 3 → Início", 
-            "🖖 4 → Fim",
-            "✊ 0 → Neutro"
-        ]
+        gestures = describe_bindings(ACTION_BINDINGS)
         
         for gesture in gestures:
             gesture_item = Gtk.Label(label=gesture)
@@ -562,7 +571,7 @@ class WaveControlGUI(Gtk.Window):
         filter_label = Gtk.Label(label="Filtro:")
         filter_label.get_style_context().add_class("status-label")
         
-        self.filter_label = Gtk.Label(label="0/8")
+        self.filter_label = Gtk.Label(label=f"0/{self.filter_window}")
         self.filter_label.get_style_context().add_class("status-indicator")
         
         filter_item.pack_start(filter_label, False, False, 0)
@@ -587,8 +596,14 @@ class WaveControlGUI(Gtk.Window):
         # Checkbox compacto
         self.show_landmarks_check = Gtk.CheckButton.new_with_label("Mostrar landmarks")
         self.show_landmarks_check.set_active(DRAW)
+        self.show_landmarks_check.connect("toggled", self.on_preview_toggled)
+        
+        self.show_preview_check = Gtk.CheckButton.new_with_label("Mostrar vídeo")
+        self.show_preview_check.set_active(True)
+        self.show_preview_check.connect("toggled", self.on_preview_toggled)
         
         config_card.pack_start(config_title, False, False, 0)
+        config_card.pack_start(self.show_preview_check, False, False, 0)
         config_card.pack_start(self.show_landmarks_check, False, False, 0)
         sidebar.pack_start(config_card, False, False, 0)
         
@@ -612,9 +627,11 @@ class WaveControlGUI(Gtk.Window):
         video_container = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
         video_container.get_style_context().add_class("video-container")
         
-        self.video_image = Gtk.Image()
-        self.video_image.set_halign(Gtk.Align.CENTER)
-        self.video_image.set_valign(Gtk.Align.CENTER)
+        self.video_view = Gtk.DrawingArea()
+        self.video_view.set_hexpand(True)
+        self.video_view.set_vexpand(True)
+        self.video_view.connect("draw", self.on_video_draw)
+        self.video_view.connect("size-allocate", self.on_video_size_allocate)
         
         # Placeholder elegante
         placeholder_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=16)
@@ -634,7 +651,7 @@ class WaveControlGUI(Gtk.Window):
         placeholder_box.pack_start(placeholder_icon, False, False, 0)
         placeholder_box.pack_start(self.placeholder_label, False, False, 0)
         
-        video_container.pack_start(self.video_image, True, True, 0)
+        video_container.pack_start(self.video_view, True, True, 0)
         video_container.pack_start(placeholder_box, True, True, 0)
         
         video_wrapper.pack_start(video_container, True, True, 0)
@@ -657,6 +674,8 @@ class WaveControlGUI(Gtk.Window):
     def on_zoom_changed(self, scale):
         self.zoom_level = scale.get_value()
         self.zoom_value_label.set_text(f"{self.zoom_level:.1f}x")
+        if self.client is not None:
+            self.send_settings(zoom=self.zoom_level)
     
     def set_zoom(self, zoom_value):
         self.zoom_level = zoom_value
@@ -665,15 +684,20 @@ class WaveControlGUI(Gtk.Window):
     
     def on_start_clicked(self, button):
         if not self.is_running:
+            if not STARTUP.reported:
+                STARTUP.mark("espera pelo clique", idle=True)
             self.start_detection()
         else:
             self.stop_detection()
             
     def start_detection(self):
-        global gesture_history
-        gesture_history.clear()
+        if self.client is not None:
+            return self.start_attached()
+        self.tracker.reset()
+        self.launch_ts = time.time()
         
-        self.cap = cv2.VideoCapture(CAM_INDEX)
+        self.cap = open_capture(CAM_INDEX, CAPTURE_BACKEND, supervised=True,
+                                on_event=self.on_capture_event)
         # Define resolução da captura
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 800)   # Largura
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 800)  # Altura
@@ -692,85 +716,338 @@ class WaveControlGUI(Gtk.Window):
             
         self.is_running = True
         self.start_ts = time.time()
+        self.calibration.start(self.start_ts)
+        self.power.start(time.monotonic())
+        self.ready_ts = None
         self.header_start_button.set_label("⏹ Parar")
         self.header_status.set_text("Calibrando...")
         self.status_label.set_text("Sistema calibrando...")
         
         # Esconde placeholder e mostra vídeo
         self.placeholder_label.get_parent().hide()
-        self.video_image.show()
+        self.video_view.show()
         
         # Inicia thread de processamento
         self.processing_thread = threading.Thread(target=self.process_video)
         self.processing_thread.daemon = True
         self.processing_thread.start()
         
+    def on_capture_event(self, event, cap):
+        """Queda e volta da câmera (thread de processamento); o modelo continua aquecido"""
+        if event == "lost":
+            print("⚠️  Câmera sem imagem - tentando reconectar...")
+            GLib.idle_add(self.header_status.set_text, "Reconectando...")
+            GLib.idle_add(self.status_label.set_text, "Câmera desconectada - aguardando")
+        elif event == "reconnected":
+            print(f"🔌 Câmera reconectada em {cap.reconnects[-1] * 1000:.0f} ms "
+                  f"({cap.last_outage_s * 1000:.0f} ms sem imagem)")
+            self.tracker.reset()
+            self.action_executed = False
+            self.calibration.start(time.time())
+            GLib.idle_add(self.header_status.set_text, "Calibrando...")
+            GLib.idle_add(self.status_label.set_text,
+                          f"Câmera reconectada em {cap.reconnects[-1] * 1000:.0f} ms")
+        elif event == "failed":
+            GLib.idle_add(self.status_label.set_text, "Não foi possível reconectar a câmera")
+    
+    # ===== Cliente do daemon =====
+    def start_attached(self):
+        """Pede o start ao daemon, que já tem câmera, modelo e teclado prontos"""
+        if self.events is None:
+            self.events = self.client.subscribe(preview=self.preview_state.enabled)
+            threading.Thread(target=self.read_events, daemon=True).start()
+        try:
+            reply = self.client.request("start")
+        except (OSError, DaemonError) as e:
+            dialog = Gtk.MessageDialog(
+                transient_for=self,
+                flags=0,
+                message_type=Gtk.MessageType.ERROR,
+                buttons=Gtk.ButtonsType.OK,
+                text="Erro ao iniciar a detecção no daemon"
+            )
+            dialog.format_secondary_text(str(e))
+            dialog.run()
+            dialog.destroy()
+            return
+        print(f"▶ Detecção iniciada pelo daemon em {reply['start_ms']:.0f} ms")
+        self.started_daemon = reply["started"]
+        self.filter_window = reply["settings"]["window_size"]
+        self.is_running = True
+        self.header_start_button.set_label("⏹ Parar")
+        self.placeholder_label.get_parent().hide()
+        self.video_view.show()
+    
+    def send_settings(self, **settings):
+        try:
+            self.client.request("set", settings=settings)
+        except (OSError, DaemonError) as e:
+            print(f"⚠️  Ajuste recusado pelo daemon: {e}")
+    
+    def read_events(self):
+        """Thread dos eventos do daemon; o vídeo é decodificado aqui, fora do GTK"""
+        for event in self.events:
+            if event["event"] == "preview":
+                jpeg = np.frombuffer(base64.b64decode(event["jpeg"]), np.uint8)
+                frame = cv2.imdecode(jpeg, cv2.IMREAD_COLOR)
+                if frame is not None and self.preview_state.enabled:
+                    self.publish_preview(frame)
+            else:
+                GLib.idle_add(self.on_daemon_event, event)
+        GLib.idle_add(self.on_daemon_lost)
+    
+    def on_daemon_event(self, event):
+        kind = event["event"]
+        if kind == "phase" and (self.is_running or event["phase"] == PHASE_STOPPED):
+            header, status = PHASE_STATUS.get(event["phase"], (event["phase"], event["phase"]))
+            self.header_status.set_text(header)
+            self.status_label.set_text(status)
+        elif kind == "action":
+            if event["swipe"]:
+                self.header_status.set_text("Swipe")
+                self.status_label.set_text(f"Swipe executado ({event['key']})")
+            else:
+                header, status = ACTION_STATUS.get(event["action"], (event["action"], f"Tecla {event['key']} executada"))
+                self.header_status.set_text(header)
+                self.status_label.set_text(status)
+        elif kind == "indicators":
+            self.action_indicator.set_text(event["action"])
+            self.filter_label.set_text(event["filter"])
+        elif kind == "settings":
+            self.filter_window = event["settings"]["window_size"]
+            zoom = event["settings"]["zoom"]
+            if abs(zoom - self.zoom_level) > 1e-6:  # outro cliente mudou o zoom
+                self.set_zoom(zoom)
+        elif kind == "ready":
+            print(f"⚡ Primeira inferência utilizável {event['first_inference_ms']:.0f} ms após o início")
+            STARTUP.mark("primeiro frame")
+            STARTUP.report()
+        elif kind == "calibrated":
+            print(f"✅ Calibração concluída em {event['ms']:.0f} ms ({event['reason']})")
+        elif kind == "error":
+            self.status_label.set_text(event["message"])
+        return False
+    
+    def on_daemon_lost(self):
+        print("⚠️  Conexão com o daemon encerrada")
+        self.events = None
+        if self.is_running:
+            self.is_running = False
+            self.header_start_button.set_label("▶ Iniciar")
+            self.video_view.hide()
+            self.placeholder_label.get_parent().show()
+        self.header_status.set_text("Sem daemon")
+        self.status_label.set_text("Daemon encerrado - reabra o WaveControl")
+        self.header_start_button.set_sensitive(False)
+        return False
+    
     def stop_detection(self):
         self.is_running = False
-        if self.cap:
+        if self.client is not None:
+            try:
+                self.client.request("stop")
+            except (OSError, DaemonError) as e:
+                print(f"⚠️  Erro ao parar o daemon: {e}")
+        elif self.cap:
             self.cap.release()
+            if self.power.enabled:
+                print(self.power.format_summary())
+            if self.tracker.raw_frames:
+                print(f"〰️  Oscilação da classificação bruta: {self.tracker.flicker_rate():.1%} dos frames")
         self.header_start_button.set_label("▶ Iniciar")
         self.header_status.set_text("Parado")
         self.status_label.set_text("Sistema parado")
         
         # Mostra placeholder e esconde vídeo
-        self.video_image.clear()
-        self.video_image.hide()
+        with self.preview_lock:
+            self.preview_frame = None
+        self.preview_pixbuf = None
+        self.video_view.hide()
         self.placeholder_label.get_parent().show()
         
         # Reset dos indicadores
+        self.last_indicators = None
         self.action_indicator.set_text("neutral")
-        self.filter_label.set_text("0/8")
-        
+        self.filter_label.set_text(f"0/{self.filter_window}")
+        
+    # ===== Preview =====
+    def update_preview_state(self):
+        """Publica um novo snapshot de geometria e opções (thread do GTK)"""
+        enabled = (self.window_mapped and not self.window_iconified
+                   and not self.window_obscured and self.show_preview_check.get_active())
+        previous = self.preview_state
+        self.preview_state = PreviewState(enabled, self.view_width, self.view_height,
+                                          self.show_landmarks_check.get_active())
+        if self.events is not None:
+            # o daemon só codifica vídeo para quem está mostrando
+            if enabled != previous.enabled:
+                self.events.set_preview(enabled)
+            if self.preview_state.show_landmarks != previous.show_landmarks:
+                self.send_settings(landmarks=self.preview_state.show_landmarks)
+    
+    def on_video_size_allocate(self, widget, allocation):
+        if (allocation.width, allocation.height) != (self.view_width, self.view_height):
+            self.view_width, self.view_height = allocation.width, allocation.height
+            self.update_preview_state()
+    
+    def on_window_visibility(self, widget, event):
+        if event.type == Gdk.EventType.MAP:
+            self.window_mapped = True
+        elif event.type == Gdk.EventType.UNMAP:
+            self.window_mapped = False
+        elif event.type == Gdk.EventType.WINDOW_STATE:
+            self.window_iconified = bool(event.new_window_state & Gdk.WindowState.ICONIFIED)
+        elif event.type == Gdk.EventType.VISIBILITY_NOTIFY:
+            self.window_obscured = event.state == Gdk.VisibilityState.FULLY_OBSCURED
+        self.update_preview_state()
+        return False
+    
+    def on_preview_toggled(self, button):
+        self.update_preview_state()
+        if not self.show_preview_check.get_active():
+            self.preview_pixbuf = None
+            self.video_view.queue_draw()
+    
+    def publish_preview(self, frame):
+        """Entrega o frame ao DrawingArea (chamado pelo worker)"""
+        with self.preview_lock:
+            pending = self.preview_frame is not None
+            self.preview_frame = frame
+        if not pending:  # um queue_draw pendente já pinta o frame mais novo
+            GLib.idle_add(self.video_view.queue_draw)
+    
+    def on_video_draw(self, widget, cr):
+        with self.preview_lock:
+            frame, self.preview_frame = self.preview_frame, None
+        if frame is not None:
+            height, width, channels = frame.shape
+            self.preview_pixbuf = GdkPixbuf.Pixbuf.new_from_data(
+                frame.tobytes(), GdkPixbuf.Colorspace.RGB, False, 8, width, height, width * channels
+            )
+        if self.preview_pixbuf is None:
+            return False
+        
+        # O frame já vem no tamanho do preview; a escala aqui só cobre o
+        # intervalo até o próximo frame depois de um redimensionamento
+        area_width = widget.get_allocated_width()
+        area_height = widget.get_allocated_height()
+        width = self.preview_pixbuf.get_width()
+        height = self.preview_pixbuf.get_height()
+        scale = min(area_width / width, area_height / height)
+        cr.translate((area_width - width * scale) / 2, (area_height - height * scale) / 2)
+        cr.scale(scale, scale)
+        Gdk.cairo_set_source_pixbuf(cr, self.preview_pixbuf, 0, 0)
+        cr.paint()
+        return False
+    
+    def render_preview(self, frame, active, state):
+        """Reduz o frame ao tamanho do preview, desenha landmarks e textos e publica"""
+        height, width = frame.shape[:2]
+        size = preview_size(width, height, state.width, state.height)
+        if size != (width, height):
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        scale = size[0] / width
+        font_scale = max(scale, 0.5)
+        
+        if state.show_landmarks:
+            for track in self.tracker.tracks:
+                if track.landmarks is None:
+                    continue
+                color = LANDMARK_COLOR if track is active else INACTIVE_COLOR
+                pixels = self.renderer.draw(frame, track.landmarks, color)
+                if MAX_HANDS > 1:
+                    wrist = pixels[0]
+                    cv2.putText(frame, f"#{track.id}", (int(wrist[0]), int(wrist[1] + 20 * font_scale)),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.6 * font_scale, color, 2)
+        
+        # Informações visuais na tela
+        if self.zoom_level > 1.0:
+            zoom_text = f"Zoom: {self.zoom_level:.1f}x"
+            cv2.putText(frame, zoom_text, (20, frame.shape[0] - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6 * font_scale, (0,255,0), 2)
+        if not self.calibration.done:
+            cv2.putText(frame, "Calibrando...", (20,40), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0,255,255), 2)
+        
+        self.publish_preview(frame)
+    
     def process_video(self):
+        warmup_s = self.warmup.wait()
+        
         while self.is_running and self.cap and self.cap.isOpened():
+            self.power.drain_stale(self.cap)
             ok, frame = self.cap.read()
             if not ok:
                 break
+            trace = self.tracer.frame(self.cap.last_sequence, self.cap.last_timestamp)
                 
+            # Sem mão há algum tempo: só sonda o modelo (ou acorda por movimento)
+            if not self.power.should_infer(frame, time.monotonic()):
+                trace.end(idle=True)
+                time.sleep(self.power.frame_interval())
+                continue
+            
             frame = cv2.flip(frame, 1)
             
             # Aplica zoom digital se necessário
             frame = apply_digital_zoom(frame, self.zoom_level)
             
             rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            res = hands.process(rgb)
-            
-            raw_action = "neutral"
-            handed = "Right"
+            trace.mark("preprocess")
+            res = hands.process(rgb, int(self.cap.last_timestamp * 1000))
+            if res is None:
+                # backend assíncrono sem resultado novo: o frame não entra no filtro
+                trace.end(pending=True)
+                time.sleep(self.power.frame_interval())
+                continue
+            trace.mark("inference", result_ts_ms=res.timestamp_ms)
             
-            if res.multi_hand_landmarks:
-                lm = res.multi_hand_landmarks[0]
-                if res.multi_handedness and len(res.multi_handedness) > 0:
-                    handed = res.multi_handedness[0].classification[0].label
-                raw_action = classify_gesture(lm.landmark, handed)
+            transition = self.power.update(bool(res.multi_hand_landmarks))
+            if transition == POWER_IDLE:
+                GLib.idle_add(self.header_status.set_text, "Economia")
+                GLib.idle_add(self.status_label.set_text, "Modo economia - mostre a mão para retomar")
+            elif transition:
+                print(f"⚡ Ritmo normal ({self.power.wake_reason}, despertar em "
+                      f"{self.power.wake_latencies_ms[-1]:.0f} ms)")
+                GLib.idle_add(self.header_status.set_text, "Ativo")
+                GLib.idle_add(self.status_label.set_text, "Sistema ativo - Pronto")
             
-            # Adiciona gesto ao histórico e obtém gesto estável
-            add_gesture_to_history(raw_action)
-            action = get_stable_gesture()
+            if self.ready_ts is None:
+                # primeira inferência sobre um frame real
+                self.ready_ts = time.time()
+                print(f"⚡ Primeira inferência utilizável {(self.ready_ts - self.launch_ts) * 1000:.0f} ms "
+                      f"após o início (warm-up {warmup_s * 1000:.0f} ms)")
+                STARTUP.mark("primeiro frame")
+                STARTUP.report()
             
-            # Desenha landmarks se habilitado
-            if res.multi_hand_landmarks and self.show_landmarks_check.get_active():
-                lm = res.multi_hand_landmarks[0]
-                mp_drawing.draw_landmarks(
-                    frame, lm, mp_hands.HAND_CONNECTIONS,
-                    mp_drawing.DrawingSpec(color=(0,255,0), thickness=2, circle_radius=2),
-                    mp_drawing.DrawingSpec(color=(255,0,0), thickness=2)
-                )
+            # Cada mão tem ID e filtro próprios; a política escolhe quem controla
+            self.tracker.update(res, ACTION_TABLE, SWIPE_TABLE)
+            trace.mark("classify", hands=len(self.tracker.tracks))
+            active = self.tracker.active()
+            action = active.filter.stable() if active else "neutral"
+            trace.mark("filter", action=action)
+            pressed = None
             
             now = time.time()
             
-            # Informações visuais na tela
-            if self.zoom_level > 1.0:
-                zoom_text = f"Zoom: {self.zoom_level:.1f}x"
-                cv2.putText(frame, zoom_text, (20, frame.shape[0] - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0,255,0), 2)
+            # Calibração adaptativa: brilho/exposição estáveis e modelo pronto
+            if self.calibration.update(frame, now, self.ready_ts is not None,
+                                       self.cap.get(cv2.CAP_PROP_EXPOSURE)):
+                print(f"✅ Calibração concluída em {self.calibration.duration * 1000:.0f} ms "
+                      f"({self.calibration.reason})")
+                GLib.idle_add(self.header_status.set_text, "Ativo")
+                GLib.idle_add(self.status_label.set_text, "Sistema ativo - Pronto")
             
-            # Calibração inicial
-            if now - self.start_ts < CALIBRATION_S:
-                cv2.putText(frame, "Calibrando...", (20,40), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,255,255), 2)
+            if not self.calibration.done:
                 GLib.idle_add(self.header_status.set_text, "Calibrando...")
                 GLib.idle_add(self.status_label.set_text, "Sistema calibrando...")
             else:
+                # Swipes disparam na hora (já têm cooldown próprio)
+                if active and active.swipe_action:
+                    press_action(active.swipe_action)
+                    pressed = active.swipe_action
+                    arrow = "←" if active.swipe_gesture == "swipe_left" else "→"
+                    GLib.idle_add(self.header_status.set_text, f"Swipe {arrow}")
+                    GLib.idle_add(self.status_label.set_text, f"Swipe executado ({ACTION_KEYS[active.swipe_action]})")
+                
                 # Lógica de execução de ações
                 if action == "neutral":
                     if self.action_executed:
@@ -778,74 +1055,80 @@ class WaveControlGUI(Gtk.Window):
                         GLib.idle_add(self.header_status.set_text, "Ativo")
                         GLib.idle_add(self.status_label.set_text, "Sistema ativo - Pronto")
                 elif action != "neutral" and not self.action_executed:
-                    if action == "next":
-                        press_next()
-                        GLib.idle_add(self.header_status.set_text, "Próximo →")
-                        GLib.idle_add(self.status_label.set_text, "Próximo slide executado")
-                    elif action == "prev":
-                        press_prev()
-                        GLib.idle_add(self.header_status.set_text, "← Anterior")
-                        GLib.idle_add(self.status_label.set_text, "Slide anterior executado")
-                    elif action == "home":
-                        press_home()
-                        GLib.idle_add(self.header_status.set_text, "⏮ Início")
-                        GLib.idle_add(self.status_label.set_text, "Indo para o início")
-                    elif action == "end":
-                        press_end()
-                        GLib.idle_add(self.header_status.set_text, "⏭ Fim")
-                        GLib.idle_add(self.status_label.set_text, "Indo para o fim")
+                    press_action(action)
+                    pressed = action
+                    header, status = ACTION_STATUS.get(action, (action, f"Tecla {ACTION_KEYS[action]} executada"))
+                    GLib.idle_add(self.header_status.set_text, header)
+                    GLib.idle_add(self.status_label.set_text, status)
                     self.action_executed = True
                     self.last_action = action
                 elif action != "neutral" and self.action_executed:
                     GLib.idle_add(self.header_status.set_text, "Aguardando...")
                     GLib.idle_add(self.status_label.set_text, "Aguardando posição neutra")
             
-            # Atualiza indicadores de status
-            GLib.idle_add(self.action_indicator.set_text, action)
-            GLib.idle_add(self.filter_label.set_text, f"{len(gesture_history)}/{GESTURE_WINDOW_SIZE}")
-            
-            # Converte frame para exibição na GUI
-            height, width, channels = frame.shape
-            pixbuf = GdkPixbuf.Pixbuf.new_from_data(
-                frame.tobytes(),
-                GdkPixbuf.Colorspace.RGB,
-                False,
-                8,
-                width,
-                height,
-                width * channels
-            )
+            if pressed:
+                latency_ms = (time.monotonic() - self.cap.last_timestamp) * 1000
+                trace.mark("dispatch", action=pressed, latency_ms=round(latency_ms, 1))
             
-            # Redimensiona mantendo proporção
-            original_width = pixbuf.get_width()
-            original_height = pixbuf.get_height()
+            # Atualiza indicadores de status (só quando mudam)
+            indicators = (action, f"{len(active.filter) if active else 0}/{self.tracker.window_size}")
+            if indicators != self.last_indicators:
+                self.last_indicators = indicators
+                GLib.idle_add(self.action_indicator.set_text, indicators[0])
+                GLib.idle_add(self.filter_label.set_text, indicators[1])
             
-            # Calcula nova dimensão responsiva - cresce conforme a tela
-            available_height = self.get_allocated_height() - 120  # Altura disponível menos header e footer
-            available_width = self.get_allocated_width() - 320    # Largura disponível menos sidebar
-            
-            # Calcula escala baseada no espaço disponível
-            scale_height = available_height / original_height
-            scale_width = available_width / original_width
-            scale_factor = min(scale_height, scale_width, 1)  # Limita a 1x para evitar loop
-            
-            new_width = int(original_width * scale_factor)
-            new_height = int(original_height * scale_factor)
-                
-            pixbuf = pixbuf.scale_simple(new_width, new_height, GdkPixbuf.InterpType.BILINEAR)
-            GLib.idle_add(self.video_image.set_from_pixbuf, pixbuf)
+            # Preview com ritmo próprio; pulado com a janela oculta ou o vídeo desligado
+            preview_ts = time.monotonic()
+            state = self.preview_state
+            if state.enabled and preview_ts - self.last_preview_ts >= 1.0 / PREVIEW_FPS:
+                self.last_preview_ts = preview_ts
+                self.render_preview(frame, active, state)
+                trace.mark("preview")
+            if pressed:
+                trace.end(action=pressed)
+            else:
+                trace.end()
             
-            time.sleep(0.03)  # ~30 FPS
+            time.sleep(self.power.frame_interval())  # ~30 FPS (menos no modo economia)
             
     def on_window_destroy(self, window):
-        self.stop_detection()
-        hands.close()
+        if self.client is None or self.started_daemon:
+            self.stop_detection()
+        if self.client is not None:
+            if self.events is not None:
+                self.events.close()
+            self.client.close()
+        else:
+            hands.close()
+        if self.tracer.path:
+            self.tracer.close()
+            print(f"🧵 Trace com {self.tracer.count} eventos salvo em {self.tracer.path}")
         Gtk.main_quit()
 
 # ===== Execução Principal =====
 def main():
-    app = WaveControlGUI()
+    try:
+        load_gestures()
+    except (OSError, ValueError) as e:
+        print(f"❌ Erro na tabela de gestos: {e}")
+        dialog = Gtk.MessageDialog(
+            flags=0,
+            message_type=Gtk.MessageType.ERROR,
+            buttons=Gtk.ButtonsType.OK,
+            text="Erro na tabela de gestos"
+        )
+        dialog.format_secondary_text(str(e))
+        dialog.run()
+        dialog.destroy()
+        return
+    client = find_daemon()
+    if client is not None:
+        print(f"🔌 Conectado ao daemon em {client.path}")
+    else:
+        create_pipeline()
+    app = WaveControlGUI(client)
     app.show_all()
+    STARTUP.mark("interface")
     Gtk.main()
 
 if __name__ == "__main__":
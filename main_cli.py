@@ -2,131 +2,157 @@
 import cv2
 import time
 import uinput
-import mediapipe as mp
+from backends import INFERENCE_BACKENDS, BackendWarmup, create_backend
+from calibration import AdaptiveCalibration
+from control import DaemonError, find_daemon, format_event
+from capture import CAPTURE_BACKENDS, SupervisedCapture, open_capture
+from tracking import HAND_POLICIES, HandTracker
+from gestures import DEFAULT_TUNING, build_swipe_table, describe_bindings, load_gesture_config, load_tuning
+from power import POWER_IDLE, PowerManager
+from tracing import open_tracer
+from stream import LandmarkReceiver, LandmarkSender, STREAM_REPORT_S, STREAM_TIMEOUT_S, wall_clock
 
 # ===== Configurações =====
 MIN_DET = 0.6
 MIN_TRK = 0.6
-CALIBRATION_S = 2.0     # tempo inicial para estabilizar câmera
+CALIBRATION_MAX_S = 2.0  # teto da calibração (termina antes se a câmera estabilizar)
 CAM_INDEX = 0           # índice da webcam
+CAPTURE_BACKEND = "opencv"  # "opencv" (genérico) ou "v4l2" (mmap direto)
+INFERENCE_BACKEND = "solutions"  # "solutions" (síncrono), "tasks" (LIVE_STREAM) ou "tflite"
+TFLITE_THREADS = 4      # threads do interpretador no backend tflite
+WARMUP_FRAMES = 5       # frames sintéticos para aquecer o modelo
+WARMUP_SIZE = (640, 480)  # resolução de inferência usada no warm-up
 
 # ===== Filtro Temporal =====
-GESTURE_WINDOW_SIZE = 8  # número de frames para confirmar gesto
-CONSISTENCY_THRESHOLD = 0.75  # 75% das amostras devem ser iguais
+# janela, limiar e margens dos dedos vêm da seção "tuning" do gestures.json (ver tune.py)
+
+# ===== Várias mãos =====
+MAX_HANDS = 1           # mãos detectadas por frame (cada uma com ID e filtro próprios)
+HAND_POLICY = "first"   # quem dispara ações: first, largest, right, left ou any
+
+# ===== Economia de energia =====
+IDLE_AFTER = 10.0       # segundos sem mão antes de reduzir captura/inferência (0 = nunca)
 
 # ===== Dispositivo virtual (uinput) =====
-kb = uinput.Device([uinput.KEY_RIGHT, uinput.KEY_LEFT, uinput.KEY_HOME, uinput.KEY_END])
+kb = None  # Criado com as teclas da tabela de gestos
 
 # ===== MediaPipe =====
-mp_hands = mp.solutions.hands
 hands = None  # Será inicializado depois
 
-# ===== Utilidades de dedos =====
-TIP = { "thumb": 4, "index": 8, "middle": 12, "ring": 16, "pinky": 20 }
-PIP = { "thumb": 3, "index": 6, "middle": 10, "ring": 14, "pinky": 18 }
-
-def finger_extended(lm, tip_idx, pip_idx, handed_label):
-    tip = lm[tip_idx]
-    pip = lm[pip_idx]
-    if tip_idx == TIP["thumb"]:
-        # polegar: eixo X depende da mão (mais rigoroso)
-        if handed_label == "Right":
-            return tip.x < pip.x - 0.05
-        else:
-            return tip.x > pip.x + 0.05
-    # demais dedos: eixo Y (origem no topo) - mais rigoroso
-    return tip.y < pip.y - 0.05
-
-def count_extended(lm, handed_label):
-    cnt = 0
-    for name in ["thumb","index","middle","ring","pinky"]:
-        if finger_extended(lm, TIP[name], PIP[name], handed_label):
-            cnt += 1
-    return cnt
-
-# ===== Histórico de Gestos =====
-gesture_history = []
-
-def add_gesture_to_history(gesture):
-    """Adiciona gesto ao histórico e mantém tamanho da janela"""
-    gesture_history.append(gesture)
-    if len(gesture_history) > GESTURE_WINDOW_SIZE:
-        gesture_history.pop(0)
-
-def get_stable_gesture():
-    """Retorna gesto estável baseado no histórico ou 'neutral' se inconsistente"""
-    if len(gesture_history) < GESTURE_WINDOW_SIZE:
-        return "neutral"  # aguarda janela completa
-    
-    # Conta ocorrências de cada gesto
-    gesture_counts = {}
-    for gesture in gesture_history:
-        gesture_counts[gesture] = gesture_counts.get(gesture, 0) + 1
-    
-    # Encontra o gesto mais frequente
-    most_common_gesture = max(gesture_counts, key=gesture_counts.get)
-    most_common_count = gesture_counts[most_common_gesture]
-    
-    # Verifica se atende o threshold de consistência
-    consistency_ratio = most_common_count / len(gesture_history)
-    
-    if consistency_ratio >= CONSISTENCY_THRESHOLD and most_common_gesture != "neutral":
-        return most_common_gesture
-    
-    return "neutral"
-
-# ===== Gesto -> Ação =====
-# 1 dedo: próximo; 2 dedos: anterior; 3 dedos: início; 4 dedos: fim; senão: neutro
-def classify_gesture(lm, handed_label):
-    n = count_extended(lm, handed_label)
-    if n == 1: return "next"      # um dedo levantado
-    if n == 2: return "prev"      # dois dedos levantados
-    if n == 3: return "home"      # três dedos levantados
-    if n == 4: return "end"       # quatro dedos levantados
-    return "neutral"
-
-def press_next():
-    kb.emit_click(uinput.KEY_RIGHT)
+# ===== Ações =====
+ACTION_MESSAGES = {
+    "next": "➡️  PRÓXIMO slide executado",
+    "prev": "⬅️  ANTERIOR slide executado",
+    "home": "🏠 INÍCIO da apresentação",
+    "end": "🔚 FIM da apresentação",
+}
 
-def press_prev():
-    kb.emit_click(uinput.KEY_LEFT)
+def create_keyboard(actions):
+    """Cria o dispositivo uinput com todas as teclas usadas na tabela (já validada)"""
+    return uinput.Device([getattr(uinput, key) for key in sorted(set(actions.values()))])
 
-def press_home():
-    kb.emit_click(uinput.KEY_HOME)
-
-def press_end():
-    kb.emit_click(uinput.KEY_END)
+def press_action(action, actions):
+    key = actions[action]
+    kb.emit_click(getattr(uinput, key))
+    print(ACTION_MESSAGES.get(action, f"⌨️  {action.upper()} ({key}) executado"))
 
 # ===== Controle de Estado =====
 class WaveControlCLI:
-    def __init__(self):
+    def __init__(self, capture_backend=CAPTURE_BACKEND, device=None,
+                 inference_backend=INFERENCE_BACKEND, model_path=None, num_threads=TFLITE_THREADS,
+                 gesture_config=None, max_hands=MAX_HANDS, hand_policy=HAND_POLICY,
+                 idle_after=IDLE_AFTER, trace_path=None, tuning=None, sender=None):
+        self.action_table, self.action_keys, self.bindings = gesture_config or load_gesture_config()
+        self.tuning = tuning or DEFAULT_TUNING
+        self.swipe_table = build_swipe_table(self.bindings)
+        self.capture_backend = capture_backend
+        self.inference_backend = inference_backend
+        self.model_path = model_path
+        self.num_threads = num_threads
+        self.max_hands = max_hands
+        self.tracker = HandTracker(hand_policy, self.tuning["window_size"], self.tuning["threshold"],
+                                   tuning=self.tuning)
+        self.device = device
         self.is_running = False
         self.cap = None
+        self.launch_ts = None
         self.start_ts = None
+        self.calibration = AdaptiveCalibration(max_s=CALIBRATION_MAX_S)
+        self.power = PowerManager(idle_after_s=idle_after)
+        self.tracer = open_tracer(trace_path)
+        # host de captura: envia as mãos em vez de apertar teclas
+        self.sender = sender  # LandmarkSender (ou None)
+        self.ready_ts = None
         self.last_action = "neutral"
         self.action_executed = False
         
     def find_camera(self):
         """Tenta encontrar uma câmera disponível testando vários índices"""
+        if self.device is not None:
+            # Dispositivo explícito (índice, /dev/videoN ou arquivo de vídeo)
+            cap = open_capture(self.device, self.capture_backend, supervised=True,
+                               on_event=self.on_capture_event)
+            if cap.isOpened():
+                print(f"✅ Captura aberta em {self.device} ({self.capture_backend})")
+                return cap, self.device
+            cap.release()
+            return None, -1
+        
         print("🔍 Procurando câmeras disponíveis...")
         
         for i in range(10):  # Testa índices 0-9
-            cap = cv2.VideoCapture(i)
+            cap = open_capture(i, self.capture_backend)
             if cap.isOpened():
                 # Testa se consegue ler um frame
                 ret, _ = cap.read()
                 if ret:
                     print(f"✅ Câmera encontrada no índice {i}")
-                    return cap, i
+                    # reconexões reabrem o mesmo índice, sem nova busca
+                    return SupervisedCapture(i, self.capture_backend, self.on_capture_event, capture=cap), i
                 cap.release()
                 
         return None, -1
     
+    def on_capture_event(self, event, cap):
+        """Queda e volta da câmera; modelo, filtros e teclado continuam prontos"""
+        if event == "lost":
+            print("⚠️  Câmera sem imagem - tentando reconectar...")
+        elif event == "reconnected":
+            print(f"🔌 Câmera reconectada em {cap.reconnects[-1] * 1000:.0f} ms "
+                  f"({cap.last_outage_s * 1000:.0f} ms sem imagem)")
+            self.tracker.reset()
+            self.action_executed = False
+            self.calibration.start(time.time())
+        elif event == "failed":
+            print("❌ Não foi possível reconectar a câmera")
+    
     def start_detection(self):
-        global gesture_history, hands
-        gesture_history.clear()
+        global hands
+        self.tracker.reset()
         
         print("🎯 WaveControl CLI - Iniciando detecção de gestos...")
+        self.launch_ts = time.time()
+        
+        # Inicializa MediaPipe e aquece o modelo enquanto a câmera abre
+        print(f"🤖 Inicializando MediaPipe ({self.inference_backend})...")
+        options = {}
+        if self.model_path:
+            options["model_path"] = self.model_path
+        try:
+            hands = create_backend(
+                self.inference_backend,
+                max_num_hands=self.max_hands,
+                model_complexity=0,
+                min_detection_confidence=MIN_DET,
+                min_tracking_confidence=MIN_TRK,
+                num_threads=self.num_threads,
+                **options,
+            )
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"❌ Erro: {e}")
+            return False
+        warmup = BackendWarmup(hands, *WARMUP_SIZE, frames=WARMUP_FRAMES)
+        warmup.start()
         
         self.cap, cam_index = self.find_camera()
         if self.cap is None:
@@ -135,28 +161,22 @@ class WaveControlCLI:
             print("   • Conecte uma webcam USB")
             print("   • Verifique se a câmera não está sendo usada por outro app")
             print("   • Reinicie o sistema se necessário")
+            warmup.wait()
             return False
         
-        # Inicializa MediaPipe após abrir a câmera
-        print("🤖 Inicializando MediaPipe...")
-        hands = mp_hands.Hands(
-            max_num_hands=1,
-            model_complexity=0,
-            min_detection_confidence=MIN_DET,
-            min_tracking_confidence=MIN_TRK,
-        )
+        print(f"🔥 Warm-up do modelo: {warmup.wait() * 1000:.0f} ms ({WARMUP_FRAMES} frames)")
             
         self.is_running = True
         self.start_ts = time.time()
+        self.calibration.start(self.start_ts)
+        self.power.start(time.monotonic())
+        self.ready_ts = None
         
         print("✅ Câmera iniciada com sucesso!")
-        print("⏱️  Calibrando por 2 segundos...")
+        print(f"⏱️  Calibrando (até {CALIBRATION_MAX_S:g} segundos)...")
         print("\n📋 Gestos disponíveis:")
-        print("   👆 1 dedo → Próximo slide")
-        print("   ✌️  2 dedos → Slide anterior")
-        print("   🤟 3 dedos → Início da apresentação")
-        print("   🖐️  4 dedos → Fim da apresentação")
-        print("   ✊ Mão fechada → Neutro")
+        for line in describe_bindings(self.bindings):
+            print(f"   {line}")
         print("\n💡 Mantenha a mão visível na câmera!")
         print("🛑 Pressione Ctrl+C para parar\n")
         
@@ -167,70 +187,173 @@ class WaveControlCLI:
         
         while self.is_running and self.cap and self.cap.isOpened():
             try:
+                self.power.drain_stale(self.cap)
                 ok, frame = self.cap.read()
                 if not ok:
                     break
+                trace = self.tracer.frame(self.cap.last_sequence, self.cap.last_timestamp)
                     
+                # Sem mão há algum tempo: só sonda o modelo (ou acorda por movimento)
+                if not self.power.should_infer(frame, time.monotonic()):
+                    trace.end(idle=True)
+                    time.sleep(self.power.frame_interval())
+                    continue
+                
                 frame = cv2.flip(frame, 1)
                 rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                res = hands.process(rgb)
+                trace.mark("preprocess")
+                res = hands.process(rgb, int(self.cap.last_timestamp * 1000))
+                if res is None:
+                    # backend assíncrono sem resultado novo: o frame não entra no filtro
+                    trace.end(pending=True)
+                    time.sleep(self.power.frame_interval())
+                    continue
+                trace.mark("inference", result_ts_ms=res.timestamp_ms)
                 
-                raw_action = "neutral"
-                handed = "Right"
+                transition = self.power.update(bool(res.multi_hand_landmarks))
+                if transition == POWER_IDLE:
+                    print(f"🔋 Sem mão há {self.power.idle_after_s:g} s - modo economia")
+                elif transition:
+                    print(f"⚡ Ritmo normal ({self.power.wake_reason}, despertar em "
+                          f"{self.power.wake_latencies_ms[-1]:.0f} ms)")
                 
-                if res.multi_hand_landmarks:
-                    lm = res.multi_hand_landmarks[0]
-                    if res.multi_handedness and len(res.multi_handedness) > 0:
-                        handed = res.multi_handedness[0].classification[0].label
-                    raw_action = classify_gesture(lm.landmark, handed)
+                if self.ready_ts is None:
+                    # primeira inferência sobre um frame real
+                    self.ready_ts = time.time()
+                    print(f"⚡ Primeira inferência utilizável {(self.ready_ts - self.launch_ts) * 1000:.0f} ms após o início")
                 
-                # Adiciona gesto ao histórico e obtém gesto estável
-                add_gesture_to_history(raw_action)
-                action = get_stable_gesture()
+                if self.sender is None:
+                    # Cada mão tem ID e filtro próprios; a política escolhe quem controla
+                    self.tracker.update(res, self.action_table, self.swipe_table)
+                    trace.mark("classify", hands=len(self.tracker.tracks))
+                    active = self.tracker.active()
+                    action = active.filter.stable() if active else "neutral"
+                    trace.mark("filter", action=action)
+                pressed = None
                 
                 now = time.time()
                 
-                # Calibração inicial
-                if now - self.start_ts < CALIBRATION_S:
+                # Calibração adaptativa: brilho/exposição estáveis e modelo pronto
+                if self.calibration.update(frame, now, self.ready_ts is not None,
+                                           self.cap.get(cv2.CAP_PROP_EXPOSURE)):
+                    print(f"✅ Calibração concluída em {self.calibration.duration * 1000:.0f} ms "
+                          f"({self.calibration.reason})")
+                
+                if not self.calibration.done:
                     if frame_count % 30 == 0:  # Mostra a cada segundo
-                        remaining = int(CALIBRATION_S - (now - self.start_ts))
-                        print(f"⏱️  Calibrando... {remaining}s restantes")
+                        print("⏱️  Calibrando...")
+                elif self.sender is not None:
+                    # Filtro e teclas ficam no host da apresentação
+                    self.sender.send(res, wall_clock(self.cap.last_timestamp))
+                    trace.mark("stream", seq=self.sender.seq - 1)
                 else:
-                    # Lógica de execução de ações
-                    if action == "neutral":
-                        if self.action_executed:
-                            self.action_executed = False
-                            print("✅ Sistema pronto para nova ação")
-                    elif action != "neutral" and not self.action_executed:
-                        if action == "next":
-                            press_next()
-                            print("➡️  PRÓXIMO slide executado")
-                        elif action == "prev":
-                            press_prev()
-                            print("⬅️  ANTERIOR slide executado")
-                        elif action == "home":
-                            press_home()
-                            print("🏠 INÍCIO da apresentação")
-                        elif action == "end":
-                            press_end()
-                            print("🔚 FIM da apresentação")
-                        self.action_executed = True
-                        self.last_action = action
-                    elif action != "neutral" and self.action_executed:
-                        # Não mostra mensagem repetitiva, apenas aguarda
-                        pass
+                    pressed, latency_ms = self.dispatch(active, action, self.cap.last_timestamp)
+                
+                if pressed:
+                    trace.mark("dispatch", action=pressed, latency_ms=round(latency_ms, 1))
+                    trace.end(action=pressed)
+                else:
+                    trace.end()
                 
                 frame_count += 1
-                time.sleep(0.03)  # ~30 FPS
+                time.sleep(self.power.frame_interval())  # ~30 FPS (menos no modo economia)
                 
             except KeyboardInterrupt:
                 print("\n🛑 Interrompido pelo usuário")
                 break
                 
+    def dispatch(self, active, action, capture_ts, clock=time.monotonic):
+        """Aperta as teclas do frame atual; retorna (ação, latência captura → tecla em ms)"""
+        pressed = latency_ms = None
+        # Swipes disparam na hora (já têm cooldown próprio)
+        if active and active.swipe_action:
+            latency_ms = (clock() - capture_ts) * 1000
+            press_action(active.swipe_action, self.action_keys)
+            pressed = active.swipe_action
+            print(f"   👋 Swipe {'←' if active.swipe_gesture == 'swipe_left' else '→'} "
+                  f"(latência captura → tecla: {latency_ms:.1f} ms)")
+            self.on_action(active.swipe_action, latency_ms, active, swipe=True)
+        
+        # Lógica de execução de ações
+        if action == "neutral":
+            if self.action_executed:
+                self.action_executed = False
+                print("✅ Sistema pronto para nova ação")
+        elif action != "neutral" and not self.action_executed:
+            latency_ms = (clock() - capture_ts) * 1000
+            press_action(action, self.action_keys)
+            pressed = action
+            if self.max_hands > 1:
+                print(f"   ✋ Mão #{active.id} ({active.handed})")
+            print(f"   ⏱️  Latência captura → tecla: {latency_ms:.1f} ms")
+            self.action_executed = True
+            self.last_action = action
+            self.on_action(action, latency_ms, active)
+        elif action != "neutral" and self.action_executed:
+            # Não mostra mensagem repetitiva, apenas aguarda
+            pass
+        return pressed, latency_ms
+    
+    def on_action(self, action, latency_ms, active, swipe=False):
+        """Chamado após cada tecla (o daemon repassa aos clientes)"""
+    
+    def receive_stream(self, receiver):
+        """Host da apresentação: landmarks chegam pela rede, filtro e teclas rodam aqui"""
+        print(f"📡 Aguardando landmarks em {receiver.url}...")
+        print("\n📋 Gestos disponíveis:")
+        for line in describe_bindings(self.bindings):
+            print(f"   {line}")
+        print("🛑 Pressione Ctrl+C para parar\n")
+        self.tracker.reset()
+        self.is_running = True
+        connected = False
+        last_report = time.monotonic()
+        try:
+            while self.is_running:
+                frame = receiver.receive(STREAM_TIMEOUT_S)
+                if frame is None:
+                    if connected:
+                        # host de captura parou: não deixa gesto pela metade na janela
+                        print("⚠️  Sem landmarks do host de captura")
+                        self.tracker.reset()
+                        self.action_executed = False
+                        connected = False
+                    continue
+                if not connected:
+                    print("🔌 Recebendo landmarks do host de captura")
+                    connected = True
+                self.tracker.update(frame.result, self.action_table, self.swipe_table)
+                active = self.tracker.active()
+                action = active.filter.stable() if active else "neutral"
+                # tempos do quadro estão no relógio de parede do host de captura
+                self.dispatch(active, action, frame.capture_ts, time.time)
+                if time.monotonic() - last_report >= STREAM_REPORT_S:
+                    last_report = time.monotonic()
+                    print(receiver.stats.format_summary())
+        except KeyboardInterrupt:
+            print("\n🛑 Interrompido pelo usuário")
+        finally:
+            self.is_running = False
+            receiver.close()
+        print(receiver.stats.format_summary())
+        if self.tracker.raw_frames:
+            print(f"〰️  Oscilação da classificação bruta: {self.tracker.flicker_rate():.1%} dos frames")
+        print("👋 WaveControl CLI finalizado")
+    
     def stop_detection(self):
         self.is_running = False
         if self.cap:
             self.cap.release()
+            if self.power.enabled:
+                print(self.power.format_summary())
+            if self.tracker.raw_frames:
+                print(f"〰️  Oscilação da classificação bruta: {self.tracker.flicker_rate():.1%} dos frames")
+        if self.sender is not None:
+            print(self.sender.format_summary())
+            self.sender.close()
+        if self.tracer.path:
+            self.tracer.close()
+            print(f"🧵 Trace com {self.tracer.count} eventos salvo em {self.tracer.path}")
         print("📷 Câmera desconectada")
         print("👋 WaveControl CLI finalizado")
 
@@ -252,36 +375,132 @@ def list_cameras():
         print("   ❌ Nenhuma câmera encontrada")
     print()
 
+def attach_daemon(client):
+    """Com o daemon no ar, câmera, modelo e teclado são dele: pede o start e mostra os eventos"""
+    print(f"🔌 Conectado ao daemon em {client.path} (câmera, modelo e gestos são os do daemon)")
+    stream = client.subscribe()
+    started = False  # o stop é global: só para a detecção que este cliente ligou
+    try:
+        reply = client.request("start")
+        started = reply["started"]
+        if started:
+            print(f"▶ Detecção iniciada em {reply['start_ms']:.0f} ms")
+        else:
+            print("▶ Detecção já estava ativa no daemon (continua ao sair)")
+        print("🛑 Pressione Ctrl+C para parar\n")
+        for event in stream:
+            print(format_event(event))
+        print("⚠️  Daemon encerrou a conexão")
+    except KeyboardInterrupt:
+        print("\n🛑 Interrompido pelo usuário")
+    except (OSError, DaemonError) as e:
+        print(f"❌ Erro no daemon: {e}")
+    finally:
+        try:
+            if started:
+                client.request("stop")
+        except (OSError, DaemonError):
+            pass
+        stream.close()
+        client.close()
+    print("👋 WaveControl CLI finalizado")
+
 def main():
-    import sys
+    import argparse
     
     print("🌊 WaveControl CLI")
     print("================")
     
-    # Verifica argumentos da linha de comando
-    if len(sys.argv) > 1:
-        if sys.argv[1] in ["-l", "--list", "list"]:
-            list_cameras()
-            return
-        elif sys.argv[1] in ["-h", "--help", "help"]:
-            print("Uso:")
-            print("  python3 main_cli.py          # Executar detecção de gestos")
-            print("  python3 main_cli.py -l       # Listar câmeras disponíveis")
-            print("  python3 main_cli.py -h       # Mostrar esta ajuda")
-            print()
-            print("Gestos:")
-            print("  👆 1 dedo → Próximo slide")
-            print("  ✌️  2 dedos → Slide anterior")
-            print("  🤟 3 dedos → Início da apresentação")
-            print("  🖐️  4 dedos → Fim da apresentação")
-            print("  ✊ Mão fechada → Neutro")
+    parser = argparse.ArgumentParser(
+        prog="main_cli.py",
+        description="Controle de slides por gestos da mão",
+        epilog="Gestos padrão: 👆 1 dedo → Próximo | ✌️ 2 → Anterior | 🤟 3 → Início | 🖐️ 4 → Fim | "
+               "👈 Swipe esquerda → Próximo | 👉 Swipe direita → Anterior | ✊ Mão fechada → Neutro",
+    )
+    parser.add_argument("command", nargs="?", choices=["list", "help"], help=argparse.SUPPRESS)
+    parser.add_argument("-l", "--list", action="store_true", help="listar câmeras disponíveis")
+    parser.add_argument("--capture", choices=CAPTURE_BACKENDS, default=CAPTURE_BACKEND,
+                        help="backend de captura (padrão: %(default)s)")
+    parser.add_argument("--device", help="índice da câmera, /dev/videoN ou arquivo de vídeo")
+    parser.add_argument("--backend", choices=INFERENCE_BACKENDS, default=INFERENCE_BACKEND,
+                        help="backend de inferência (padrão: %(default)s)")
+    parser.add_argument("--model", help="modelo .task do HandLandmarker (backend tasks)")
+    parser.add_argument("--gestures", help="arquivo JSON com a tabela de gestos (padrão: gestures.json)")
+    parser.add_argument("--max-hands", type=int, default=MAX_HANDS,
+                        help="mãos detectadas por frame (padrão: %(default)s)")
+    parser.add_argument("--hand-policy", choices=HAND_POLICIES, default=HAND_POLICY,
+                        help="qual mão pode disparar ações (padrão: %(default)s)")
+    parser.add_argument("--threads", type=int, default=TFLITE_THREADS,
+                        help="threads de inferência do backend tflite (padrão: %(default)s)")
+    parser.add_argument("--trace", metavar="ARQUIVO",
+                        help="grava o trace de latência por estágio (Chrome/Perfetto JSON)")
+    parser.add_argument("--idle-after", type=float, default=IDLE_AFTER,
+                        help="segundos sem mão antes do modo economia, 0 = desativado (padrão: %(default)s)")
+    parser.add_argument("--stream", metavar="URL",
+                        help="envia só os landmarks para o host da apresentação (udp://host:porta ou tcp://host:porta)")
+    parser.add_argument("--receive", metavar="URL",
+                        help="recebe landmarks de um host de captura e aperta as teclas (ex.: udp://0.0.0.0:5005)")
+    args = parser.parse_args()
+    
+    if args.command == "help":
+        parser.print_help()
+        return
+    if args.list or args.command == "list":
+        list_cameras()
+        return
+    
+    if args.stream and args.receive:
+        print("❌ Use --stream (host de captura) ou --receive (host da apresentação), não os dois")
+        return
+    
+    # Um daemon no ar já tem a câmera: usa o dele em vez de disputá-la
+    client = None if args.receive else find_daemon()
+    if client is not None:
+        if args.stream:
+            client.close()
+            print("❌ O daemon em execução está com a câmera; encerre-o (python3 control.py shutdown) para usar --stream")
             return
+        attach_daemon(client)
+        return
+    
+    device = args.device
+    if device is not None and device.isdigit():
+        device = int(device)
+    
+    global kb
+    try:
+        gesture_config = load_gesture_config(args.gestures)
+        tuning = load_tuning(args.gestures)
+        if not args.stream:
+            kb = create_keyboard(gesture_config[1])
+    except (OSError, ValueError) as e:
+        print(f"❌ Erro na tabela de gestos: {e}")
+        return
+    
+    # Endereço ou porta inválidos aparecem antes de abrir câmera e modelo
+    sender = receiver = None
+    try:
+        if args.stream:
+            sender = LandmarkSender(args.stream)
+        if args.receive:
+            receiver = LandmarkReceiver(args.receive)
+    except (OSError, ValueError) as e:
+        print(f"❌ Erro de rede: {e}")
+        return
     
     try:
-        cli = WaveControlCLI()
-        if cli.start_detection():
+        cli = WaveControlCLI(capture_backend=args.capture, device=device,
+                             inference_backend=args.backend, model_path=args.model,
+                             num_threads=args.threads, gesture_config=gesture_config,
+                             max_hands=args.max_hands, hand_policy=args.hand_policy,
+                             idle_after=args.idle_after, trace_path=args.trace, tuning=tuning,
+                             sender=sender)
+        if receiver is not None:
+            cli.receive_stream(receiver)
+        elif cli.start_detection():
             cli.process_video()
-        cli.stop_detection()
+        if receiver is None:
+            cli.stop_detection()
         
     except Exception as e:
         print(f"❌ Erro inesperado: {e}")
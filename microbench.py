@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""Microbenchmarks do caminho quente por frame do WaveControl.
+
+Mede, com landmarks e frames sintéticos (sem câmera, sem display GTK e sem
+uinput), cada estágio que roda a cada frame:
+
+- teste dos dedos: ``finger_extended``, ``count_extended``, ``finger_mask``,
+  ``classify_gesture`` e a versão vetorizada ``finger_masks``;
+- filtro temporal (``GestureFilter.add`` + ``stable``), detector de swipe e
+  o rastreador completo com uma mão;
+- zoom digital em várias resoluções e níveis de zoom;
+- preview (redução + landmarks) e a conversão para pixbuf (cópia dos bytes;
+  com ``GdkPixbuf`` instalado, também a criação do pixbuf, que não precisa
+  de display);
+- codificação e decodificação do protocolo de rede (``stream.py``).
+
+Cada estágio roda em lotes até somar ``MIN_RUN_S`` e é repetido
+``REPEATS`` vezes; o valor reportado é a mediana em µs por item. Com
+``--save`` os números viram a linha de base; nas execuções seguintes um
+estágio mais lento que a base além da tolerância falha (código de saída 1).
+
+Uso:
+  python3 microbench.py --save               # grava a linha de base desta máquina
+  python3 microbench.py                      # compara com a linha de base
+  python3 microbench.py --filter zoom --tolerance 0.1
+  python3 microbench.py --require-baseline   # CI: sem linha de base também falha
+"""
+import argparse
+import json
+import os
+import platform
+import time
+
+import cv2
+import numpy as np
+
+from backends import HandsResult, landmark_list_from_array
+from gestures import (GestureFilter, SwipeDetector, classify_gesture, count_extended,
+                      finger_extended, finger_mask, finger_masks)
+from render import LandmarkRenderer, apply_digital_zoom, preview_size
+from replay import synthetic_hand
+from stream import decode_frame, encode_frame
+from tracking import HandTracker
+
+try:
+    import gi
+    gi.require_version("GdkPixbuf", "2.0")
+    from gi.repository import GdkPixbuf
+except (ImportError, ValueError):
+    GdkPixbuf = None
+
+# ===== Configurações =====
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(BASE_DIR, "microbench_baseline.json")
+BASELINE_VERSION = 1
+REPEATS = 7                  # repetições de cada estágio (mediana)
+MIN_RUN_S = 0.02             # duração mínima de cada repetição
+REGRESSION_TOLERANCE = 0.25  # 25% mais lento que a base = regressão
+MIN_REGRESSION_US = 0.5      # diferenças absolutas menores são ruído
+RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080)]
+ZOOM_LEVELS = [1.0, 1.5, 2.0, 4.0]
+PREVIEW_AREA = (760, 480)    # área típica do vídeo na janela
+HAND_VARIANTS = 64           # mãos sintéticas diferentes por lote
+VECTOR_HANDS = 1000          # mãos por chamada de ``finger_masks``
+
+
+def synthetic_hands(count=HAND_VARIANTS, seed=0):
+    """Landmarks (array e ``NormalizedLandmarkList``) de mãos com poses e tremor variados"""
+    rng = np.random.default_rng(seed)
+    arrays = []
+    for i in range(count):
+        points = synthetic_hand(i % 32, rng.uniform(-0.2, 0.2), rng.uniform(-0.1, 0.1))
+        arrays.append(points + rng.normal(0, 0.004, points.shape).astype(np.float32))
+    return arrays, [landmark_list_from_array(p) for p in arrays]
+
+
+def synthetic_frame(width, height, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def build_stages():
+    """Lista de (nome, função de um lote, itens por lote)"""
+    arrays, lists = synthetic_hands()
+    hands = [lm.landmark for lm in lists]
+    stages = []
+
+    def per_hand(fn):
+        def run():
+            for lm in hands:
+                fn(lm)
+        return run
+
+    stages.append(("finger_extended", per_hand(lambda lm: finger_extended(lm, 8, 6, "Right")), len(hands)))
+    stages.append(("count_extended", per_hand(lambda lm: count_extended(lm, "Right")), len(hands)))
+    stages.append(("finger_mask", per_hand(lambda lm: finger_mask(lm, "Right", 0b00110)), len(hands)))
+    stages.append(("classify_gesture", per_hand(lambda lm: classify_gesture(lm, "Right")), len(hands)))
+
+    batch = np.stack([arrays[i % len(arrays)] for i in range(VECTOR_HANDS)])
+    right = np.ones(VECTOR_HANDS, bool)
+    stages.append(("finger_masks (por mão)", lambda: finger_masks(batch, right), VECTOR_HANDS))
+
+    gesture_filter = GestureFilter()
+    sequence = ["next"] * 6 + ["neutral"] * 2 + ["prev"] * 8
+
+    def run_filter():
+        for gesture in sequence:
+            gesture_filter.add(gesture)
+            gesture_filter.stable()
+    stages.append(("filtro add+stable", run_filter, len(sequence)))
+
+    swipe = SwipeDetector()
+    clock = {"t": 0.0}
+
+    def run_swipe():
+        t = clock["t"]
+        for lm in hands:
+            t += 1 / 30
+            swipe.update(t, lm)
+        clock["t"] = t
+    stages.append(("swipe", run_swipe, len(hands)))
+
+    tracker = HandTracker()
+    results = [HandsResult([lm], ["Right"]) for lm in lists]
+
+    def run_tracker():
+        for res in results:
+            tracker.update(res)
+            tracker.active()
+    stages.append(("rastreador (1 mão)", run_tracker, len(results)))
+
+    renderer = LandmarkRenderer()
+    for width, height in RESOLUTIONS:
+        frame = synthetic_frame(width, height)
+        for zoom in ZOOM_LEVELS:
+            stages.append((f"zoom {width}x{height} {zoom:g}x",
+                           lambda frame=frame, zoom=zoom: apply_digital_zoom(frame, zoom), 1))
+
+        size = preview_size(width, height, *PREVIEW_AREA)
+
+        def run_preview(frame=frame, size=size):
+            small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+            renderer.draw(small, lists[0])
+        stages.append((f"preview {width}x{height}", run_preview, 1))
+
+        small = synthetic_frame(*size)
+        stages.append((f"pixbuf bytes {size[0]}x{size[1]}", small.tobytes, 1))
+        if GdkPixbuf is not None:
+            def run_pixbuf(small=small):
+                h, w, c = small.shape
+                GdkPixbuf.Pixbuf.new_from_data(small.tobytes(), GdkPixbuf.Colorspace.RGB, False, 8, w, h, w * c)
+            stages.append((f"pixbuf {size[0]}x{size[1]}", run_pixbuf, 1))
+
+    packets = [encode_frame(i, 0.0, res) for i, res in enumerate(results)]
+
+    def run_encode():
+        for i, res in enumerate(results):
+            encode_frame(i, 0.0, res, 0.0)
+    stages.append(("stream encode", run_encode, len(results)))
+
+    def run_decode():
+        for data in packets:
+            decode_frame(data, 0.0)
+    stages.append(("stream decode", run_decode, len(packets)))
+    return stages
+
+
+def measure(fn, items, repeats=REPEATS, min_run_s=MIN_RUN_S):
+    """Mediana em µs por item; o nº de lotes por repetição é calibrado antes"""
+    fn()  # aquece caches e alocações
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_run_s:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(min_run_s / elapsed) + 1))
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / (loops * items) * 1e6)
+    return float(np.median(samples))
+
+
+def machine_info():
+    return {"python": platform.python_version(), "machine": platform.machine(),
+            "processor": platform.processor() or platform.machine(), "node": platform.node(),
+            "numpy": np.__version__}
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path}: versão de linha de base não suportada")
+    return baseline
+
+
+def compare(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    """Linhas (nome, µs, base, variação, regrediu?) na ordem dos estágios"""
+    rows = []
+    base_stages = (baseline or {}).get("stages", {})
+    for name, us in results.items():
+        base = base_stages.get(name)
+        if base is None:
+            rows.append((name, us, None, None, False))
+            continue
+        change = us / base - 1 if base > 0 else 0.0
+        regressed = change > tolerance and us - base > MIN_REGRESSION_US
+        rows.append((name, us, base, change, regressed))
+    return rows
+
+
+def print_rows(rows):
+    print(f"{'estágio':<28} {'µs/item':>10} {'base':>10} {'variação':>9}")
+    for name, us, base, change, regressed in rows:
+        if base is None:
+            print(f"{name:<28} {us:>10.2f} {'-':>10} {'-':>9}")
+        else:
+            mark = "❌" if regressed else "✅"
+            print(f"{name:<28} {us:>10.2f} {base:>10.2f} {change:>+8.0%} {mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks do caminho quente do WaveControl")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="arquivo da linha de base (padrão: %(default)s)")
+    parser.add_argument("--save", action="store_true", help="grava os resultados como nova linha de base")
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE,
+                        help="fração acima da base que conta como regressão (padrão: %(default)s)")
+    parser.add_argument("--filter", nargs="+", help="mede só os estágios cujo nome contém um destes textos")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="repetições por estágio (padrão: %(default)s)")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="sai com código 1 se não houver linha de base (CI)")
+    args = parser.parse_args()
+
+    try:
+        baseline = None if args.save else load_baseline(args.baseline)
+    except (OSError, ValueError) as e:
+        print(f"❌ Erro na linha de base: {e}")
+        return 1
+    if baseline is None and args.require_baseline and not args.save:
+        # sem base a comparação passaria sempre: em CI isso é um erro
+        print(f"❌ Sem linha de base em {args.baseline}; grave uma com --save na máquina de referência")
+        return 1
+
+    stages = build_stages()
+    if args.filter:
+        stages = [s for s in stages if any(f in s[0] for f in args.filter)]
+    if GdkPixbuf is None:
+        print("ℹ️  GdkPixbuf indisponível: medindo só a cópia dos bytes do pixbuf")
+    print(f"⏱️  {len(stages)} estágios, {args.repeats} repetições cada\n")
+    results = {name: measure(fn, items, args.repeats) for name, fn, items in stages}
+    rows = compare(results, baseline, args.tolerance)
+    print_rows(rows)
+
+    if args.save:
+        stored = {}
+        if os.path.exists(args.baseline):
+            # --filter atualiza só os estágios medidos
+            stored = load_baseline(args.baseline).get("stages", {}) if args.filter else {}
+        stored.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"version": BASELINE_VERSION, "machine": machine_info(), "stages": stored}, f, indent=2)
+            f.write("\n")
+        print(f"\n💾 Linha de base gravada em {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"\nℹ️  Sem linha de base em {args.baseline}; use --save para criar")
+        return 0
+    if baseline.get("machine") != machine_info():
+        print("\n⚠️  Linha de base gravada em outra máquina/ambiente: compare com cuidado")
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"\n❌ {len(regressions)} estágio(s) acima da tolerância de {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\n✅ Nenhuma regressão acima de {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Modo de economia de energia do WaveControl.
+
+Máquina de estados com dois estados:
+
+- ``active``: ritmo normal (~30 FPS), inferência em todo frame;
+- ``idle``: depois de ``IDLE_AFTER_S`` sem nenhuma mão, a captura cai para
+  ``IDLE_FPS`` e a inferência roda só a cada ``IDLE_PROBE_S``. Cada frame
+  lido passa por um detector de movimento barato (diferença em uma
+  miniatura em tons de cinza); movimento ou uma mão encontrada na sondagem
+  voltam imediatamente ao ritmo normal.
+
+Para cada estado são contabilizados tempo, CPU do processo
+(``time.process_time``), frames e inferências. A latência de despertar vai
+da última amostra ociosa sem mão/movimento até o fim da primeira
+inferência em ritmo normal, ou seja, é um limite superior do atraso real.
+
+Ler a 5 FPS não esvazia a fila do driver: sem ``drain_stale`` a amostra
+ociosa seria o frame mais antigo da fila, capturado vários períodos antes,
+e esse atraso ficaria de fora da latência de despertar medida. Os frames
+descartados aparecem no resumo.
+"""
+import time
+
+import cv2
+import numpy as np
+
+# ===== Configurações =====
+IDLE_AFTER_S = 10.0        # segundos sem mão antes de economizar (0 = desativado)
+ACTIVE_SLEEP_S = 0.03      # pausa entre frames no ritmo normal (~30 FPS)
+IDLE_FPS = 5               # frames lidos por segundo no modo ocioso
+IDLE_PROBE_S = 1.0         # intervalo entre inferências de sondagem no modo ocioso
+MOTION_SIZE = (80, 60)     # miniatura usada na detecção de movimento
+MOTION_THRESHOLD = 6.0     # diferença média (0-255) que conta como movimento
+
+POWER_ACTIVE = "active"
+POWER_IDLE = "idle"
+POWER_LABELS = {POWER_ACTIVE: "ativo", POWER_IDLE: "economia"}
+
+
+def motion_thumbnail(frame):
+    small = cv2.resize(frame, MOTION_SIZE, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+
+class PowerManager:
+    def __init__(self, idle_after_s=IDLE_AFTER_S, active_sleep_s=ACTIVE_SLEEP_S, idle_fps=IDLE_FPS,
+                 probe_interval_s=IDLE_PROBE_S, motion_threshold=MOTION_THRESHOLD):
+        self.idle_after_s = idle_after_s
+        self.active_sleep_s = active_sleep_s
+        self.idle_sleep_s = 1.0 / idle_fps
+        self.probe_interval_s = probe_interval_s
+        self.motion_threshold = motion_threshold
+        self.start(time.monotonic())
+
+    @property
+    def enabled(self):
+        return self.idle_after_s > 0
+
+    def start(self, now):
+        """Reinicia no estado ativo e zera as estatísticas"""
+        self.state = POWER_ACTIVE
+        self.last_hand_ts = now
+        self.last_probe_ts = now
+        self.last_idle_sample_ts = None
+        self.wake_from_ts = None  # início da medição de despertar em andamento
+        self.wake_reason = None
+        self.reference = None
+        self.stats = {s: {"wall_s": 0.0, "cpu_s": 0.0, "frames": 0, "inferences": 0, "entries": 0,
+                          "drained": 0}
+                      for s in (POWER_ACTIVE, POWER_IDLE)}
+        self.stats[POWER_ACTIVE]["entries"] = 1
+        self.wake_latencies_ms = []
+        self._state_wall = now
+        self._state_cpu = time.process_time()
+
+    def _account(self, now):
+        cpu = time.process_time()
+        s = self.stats[self.state]
+        s["wall_s"] += now - self._state_wall
+        s["cpu_s"] += cpu - self._state_cpu
+        self._state_wall, self._state_cpu = now, cpu
+
+    def _enter(self, state, now):
+        self._account(now)
+        self.state = state
+        self.stats[state]["entries"] += 1
+
+    def frame_interval(self):
+        """Pausa antes do próximo frame no estado atual"""
+        return self.idle_sleep_s if self.state == POWER_IDLE else self.active_sleep_s
+
+    def drain_stale(self, cap):
+        """Antes de ler no modo ocioso, descarta os frames que a pausa deixou na fila"""
+        if self.state == POWER_IDLE:
+            self.stats[POWER_IDLE]["drained"] += cap.drain()
+
+    def should_infer(self, frame, now):
+        """Decide se o frame vai para o modelo (no modo ocioso, também detecta movimento)"""
+        self.stats[self.state]["frames"] += 1
+        if self.state == POWER_ACTIVE:
+            self.stats[POWER_ACTIVE]["inferences"] += 1
+            return True
+
+        thumb = motion_thumbnail(frame)
+        moved = (self.reference is not None
+                 and float(np.mean(cv2.absdiff(thumb, self.reference))) >= self.motion_threshold)
+        self.reference = thumb
+        if moved:
+            self._wake(now, "movimento")
+        elif now - self.last_probe_ts >= self.probe_interval_s:
+            self.last_probe_ts = now
+        else:
+            self.last_idle_sample_ts = now
+            return False
+        self.stats[self.state]["inferences"] += 1
+        return True
+
+    def _wake(self, now, reason):
+        self.wake_from_ts = self.last_idle_sample_ts if self.last_idle_sample_ts is not None else now
+        self.wake_reason = reason
+        self.last_hand_ts = now  # recomeça a contagem para voltar a economizar
+        self._enter(POWER_ACTIVE, now)
+
+    def update(self, hand_present, now=None):
+        """Chamado após a inferência; retorna o novo estado quando houve transição"""
+        now = time.monotonic() if now is None else now
+        transition = None
+        if hand_present:
+            self.last_hand_ts = now
+            if self.state == POWER_IDLE:
+                self._wake(now, "mão")
+        if self.wake_from_ts is not None:
+            # primeira inferência concluída depois de acordar
+            self.wake_latencies_ms.append((now - self.wake_from_ts) * 1000)
+            self.wake_from_ts = None
+            transition = POWER_ACTIVE
+        if self.state == POWER_IDLE:
+            self.last_idle_sample_ts = now
+        elif self.enabled and now - self.last_hand_ts >= self.idle_after_s:
+            self._enter(POWER_IDLE, now)
+            self.reference = None
+            self.last_probe_ts = now
+            self.last_idle_sample_ts = now
+            transition = POWER_IDLE
+        return transition
+
+    def summary(self, now=None):
+        """Estatísticas por estado (CPU em % de um núcleo, FPS de frames e de inferência)"""
+        self._account(time.monotonic() if now is None else now)
+        rows = {}
+        for state, s in self.stats.items():
+            wall = s["wall_s"]
+            rows[state] = {
+                "time_s": wall,
+                "cpu_pct": 100.0 * s["cpu_s"] / wall if wall > 0 else 0.0,
+                "fps": s["frames"] / wall if wall > 0 else 0.0,
+                "inference_fps": s["inferences"] / wall if wall > 0 else 0.0,
+                "entries": s["entries"],
+                "drained": s["drained"],
+            }
+        if self.wake_latencies_ms:
+            rows[POWER_ACTIVE]["wake_p50_ms"] = float(np.percentile(self.wake_latencies_ms, 50))
+            rows[POWER_ACTIVE]["wake_max_ms"] = max(self.wake_latencies_ms)
+        return rows
+
+    def format_summary(self, now=None):
+        lines = ["🔋 Energia por estado:"]
+        for state, row in self.summary(now).items():
+            line = (f"   {POWER_LABELS[state]:<9} {row['time_s']:7.1f} s  CPU {row['cpu_pct']:5.1f}%  "
+                    f"{row['fps']:5.1f} FPS  inferência {row['inference_fps']:5.1f}/s")
+            lines.append(line)
+        if self.wake_latencies_ms:
+            lines.append(f"   despertar: {len(self.wake_latencies_ms)}x, p50 {np.percentile(self.wake_latencies_ms, 50):.0f} ms, "
+                         f"máx {max(self.wake_latencies_ms):.0f} ms")
+        drained = self.stats[POWER_IDLE]["drained"]
+        if drained:
+            lines.append(f"   fila do driver: {drained} frames velhos descartados antes das amostras ociosas")
+        return "\n".join(lines)
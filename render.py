@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Desenho leve de landmarks para o preview do WaveControl.
+
+Substitui ``mp_drawing.draw_landmarks`` no caminho por frame: as conexões
+da mão ficam num array de índices pré-alocado, os segmentos saem de uma
+única indexação NumPy e tudo é desenhado em duas chamadas ``cv2.polylines``
+(conexões e pontos; um segmento de comprimento zero com traço grosso vira
+um círculo). O desenho é feito sobre a imagem já no tamanho do preview.
+
+O zoom digital também fica aqui, sem dependência de GTK, para poder ser
+medido pelo ``microbench.py``.
+"""
+import cv2
+import numpy as np
+
+# ===== Configurações =====
+LANDMARK_COLOR = (0, 255, 0)        # pontos da mão que controla
+INACTIVE_COLOR = (128, 128, 128)    # pontos das demais mãos
+CONNECTION_COLOR = (255, 0, 0)      # linhas entre os pontos
+LINE_THICKNESS = 2
+POINT_RADIUS = 2
+
+# mesmas conexões de mp.solutions.hands.HAND_CONNECTIONS
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4),           # polegar
+    (0, 5), (5, 6), (6, 7), (7, 8),           # indicador
+    (5, 9), (9, 10), (10, 11), (11, 12),      # médio
+    (9, 13), (13, 14), (14, 15), (15, 16),    # anelar
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),  # mínimo e palma
+], np.int32)
+
+
+def landmarks_to_array(landmarks, out=None):
+    """Coordenadas normalizadas (21, 2) de um ``NormalizedLandmarkList``"""
+    if out is None:
+        out = np.empty((21, 2), np.float32)
+    for i, p in enumerate(landmarks.landmark):
+        out[i, 0] = p.x
+        out[i, 1] = p.y
+    return out
+
+
+def preview_size(frame_width, frame_height, area_width, area_height):
+    """Tamanho do preview: cabe na área, mantém a proporção e nunca amplia"""
+    if area_width <= 0 or area_height <= 0:
+        return frame_width, frame_height
+    scale = min(area_width / frame_width, area_height / frame_height, 1.0)
+    return max(int(frame_width * scale), 1), max(int(frame_height * scale), 1)
+
+
+def apply_digital_zoom(frame, zoom_level):
+    """Aplica zoom digital no frame"""
+    if zoom_level <= 1.0:
+        return frame
+    
+    height, width = frame.shape[:2]
+    
+    # Calcula o tamanho da região central a ser extraída
+    crop_width = int(width / zoom_level)
+    crop_height = int(height / zoom_level)
+    
+    # Calcula as coordenadas centrais para o crop
+    start_x = (width - crop_width) // 2
+    start_y = (height - crop_height) // 2
+    end_x = start_x + crop_width
+    end_y = start_y + crop_height
+    
+    # Extrai a região central
+    cropped = frame[start_y:end_y, start_x:end_x]
+    
+    # Redimensiona de volta ao tamanho original
+    zoomed = cv2.resize(cropped, (width, height), interpolation=cv2.INTER_LINEAR)
+    
+    return zoomed
+
+
+class LandmarkRenderer:
+    def __init__(self, thickness=LINE_THICKNESS, radius=POINT_RADIUS):
+        self.thickness = thickness
+        self.point_thickness = 2 * radius + 1
+        self.normalized = np.empty((21, 2), np.float32)
+        self.pixels = np.empty((21, 2), np.int32)
+        self.dots = np.empty((21, 2, 2), np.int32)  # cada ponto como segmento de comprimento zero
+        self.scale = np.empty(2, np.float32)
+
+    def draw(self, image, landmarks, color=LANDMARK_COLOR, line_color=CONNECTION_COLOR):
+        """Desenha uma mão (``NormalizedLandmarkList`` ou array (21, 2)) em ``image``"""
+        if isinstance(landmarks, np.ndarray):
+            normalized = landmarks[:, :2]
+        else:
+            normalized = landmarks_to_array(landmarks, self.normalized)
+        self.scale[0] = image.shape[1]
+        self.scale[1] = image.shape[0]
+        np.multiply(normalized, self.scale, out=self.normalized, casting="unsafe")
+        np.rint(self.normalized, out=self.normalized)
+        self.pixels[:] = self.normalized
+        self.dots[:, 0] = self.pixels
+        self.dots[:, 1] = self.pixels
+        cv2.polylines(image, self.pixels[HAND_CONNECTIONS], False, line_color, self.thickness, cv2.LINE_AA)
+        cv2.polylines(image, self.dots, False, color, self.point_thickness, cv2.LINE_AA)
+        return self.pixels
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""Gravação e replay de trilhas de landmarks do WaveControl.
+
+Uma trilha guarda só os landmarks por frame (sem imagem), então pode ser
+reprocessada pelo rastreamento, pelo filtro e pelo detector de swipes sem
+câmera nem modelo. Com rótulos, o ``eval`` mede a latência de detecção e a
+taxa de falsos positivos de cada gesto.
+
+Formato (JSONL, um registro por linha)::
+
+    {"type": "header", "version": 1, "source": "0", "width": 640, "height": 480}
+    {"type": "frame", "seq": 0, "ts_ms": 0, "hands": [{"handed": "Right", "landmarks": [[x, y, z], ...]}]}
+    {"type": "label", "gesture": "swipe_left", "start_ms": 1200, "end_ms": 1500}
+
+``gesture`` é ``swipe_left``/``swipe_right`` ou a ação de um gesto estático
+(``next``, ``prev``...). A latência é contada a partir de ``start_ms`` e
+uma detecção vale até ``end_ms`` + ``--tolerance``; fora de um rótulo do
+mesmo gesto ela é falso positivo.
+
+Uso:
+  python3 replay.py record --device 0 --out sessao.jsonl --prompt swipe_left swipe_right next
+  python3 replay.py synth --out sintetico.jsonl --duration 120
+  python3 replay.py eval sessao.jsonl sintetico.jsonl
+"""
+import argparse
+import json
+import time
+
+import cv2
+import numpy as np
+
+from backends import INFERENCE_BACKENDS, HandsResult, create_backend, landmark_list_from_array
+from capture import CAPTURE_BACKENDS, open_capture
+from gestures import ACTION_TABLE, SWIPE_TABLE, build_swipe_table, load_gesture_config, load_tuning
+from tracking import HandTracker
+
+# ===== Configurações =====
+TRACE_VERSION = 1
+LANDMARK_DECIMALS = 4        # casas decimais gravadas por coordenada
+LABEL_TOLERANCE_MS = 300     # detecção aceita até este tempo após o fim do rótulo
+RECORD_PROMPT_S = 3.0        # duração de cada pedido de gesto na gravação guiada
+RECORD_REST_S = 2.0          # pausa (sem gesto) entre pedidos
+SYNTH_FPS = 30
+SYNTH_DURATION_S = 60.0
+SYNTH_JITTER = 0.004         # ruído gaussiano por landmark (coord. normalizadas)
+SYNTH_DROPOUT = 0.03         # chance de um frame perder a mão
+SYNTH_STATIC_MASKS = [0b00010, 0b00110]  # indicador; indicador + médio
+
+# coordenadas x da base de cada dedo (polegar → mínimo) na mão sintética
+SYNTH_FINGER_X = [0.40, 0.45, 0.50, 0.55, 0.60]
+
+
+def synthetic_hand(mask=0b00010, offset_x=0.0, offset_y=0.0):
+    """Landmarks (21, 3) de uma mão direita com os dedos de ``mask`` estendidos"""
+    points = np.zeros((21, 3), np.float32)
+    points[0] = (0.5, 0.8, 0.0)  # punho
+    for finger in range(5):
+        up = bool(mask & (1 << finger))
+        base = 1 + finger * 4
+        x = SYNTH_FINGER_X[finger]
+        if finger == 0:
+            xs = [0.42, 0.38, 0.33, 0.27] if up else [0.42, 0.40, 0.41, 0.43]
+            points[base:base + 4, 0] = xs
+            points[base:base + 4, 1] = 0.7
+        else:
+            ys = [0.65, 0.55, 0.48, 0.42] if up else [0.65, 0.58, 0.62, 0.66]
+            points[base:base + 4, 0] = x
+            points[base:base + 4, 1] = ys
+    points[:, 0] += offset_x
+    points[:, 1] += offset_y
+    return points
+
+
+# ===== Leitura e escrita =====
+class TraceWriter:
+    def __init__(self, path, **header):
+        self.file = open(path, "w", encoding="utf-8")
+        self._write(dict(type="header", version=TRACE_VERSION, **header))
+
+    def _write(self, record):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def write_frame(self, seq, ts_ms, res):
+        hands = []
+        if res is not None and res.multi_hand_landmarks:
+            for i, lm in enumerate(res.multi_hand_landmarks):
+                handed = res.multi_handedness[i] if i < len(res.multi_handedness) else "Right"
+                points = [[round(p.x, LANDMARK_DECIMALS), round(p.y, LANDMARK_DECIMALS),
+                           round(p.z, LANDMARK_DECIMALS)] for p in lm.landmark]
+                hands.append({"handed": handed, "landmarks": points})
+        self._write({"type": "frame", "seq": seq, "ts_ms": ts_ms, "hands": hands})
+
+    def write_label(self, gesture, start_ms, end_ms):
+        self._write({"type": "label", "gesture": gesture, "start_ms": start_ms, "end_ms": end_ms})
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_trace(path):
+    """Lê uma trilha; retorna (header, frames, labels)"""
+    header, frames, labels = {}, [], []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            kind = record.get("type")
+            if kind == "header":
+                header = record
+            elif kind == "frame":
+                frames.append(record)
+            elif kind == "label":
+                labels.append(record)
+            else:
+                raise ValueError(f"{path}:{line_no}: tipo de registro desconhecido '{kind}'")
+    if header.get("version", TRACE_VERSION) != TRACE_VERSION:
+        raise ValueError(f"{path}: versão de trilha não suportada ({header.get('version')})")
+    frames.sort(key=lambda fr: fr["ts_ms"])
+    return header, frames, labels
+
+
+def frames_to_results(frames):
+    """Converte os frames da trilha em ``HandsResult`` (uma vez, para vários replays)"""
+    results = []
+    for fr in frames:
+        lists = [landmark_list_from_array(np.asarray(h["landmarks"], np.float32)) for h in fr["hands"]]
+        results.append(HandsResult(lists, [h["handed"] for h in fr["hands"]], fr["ts_ms"]))
+    return results
+
+
+# ===== Replay e avaliação =====
+def replay(results, tracker=None, action_table=None, swipe_table=None, raw_masks=None):
+    """Reproduz os resultados com a mesma lógica de disparo do loop principal
+
+    Retorna (eventos, custo médio por frame em µs); cada evento é
+    ``(ts_ms, gesto, id da mão)``. ``raw_masks`` (opcional) traz, por
+    frame, as máscaras ``(entra, mantém)`` já calculadas de cada mão.
+    """
+    tracker = tracker or HandTracker()
+    events = []
+    action_executed = False
+    start = time.perf_counter()
+    for i, res in enumerate(results):
+        tracker.update(res, action_table, swipe_table, raw_masks[i] if raw_masks is not None else None)
+        active = tracker.active()
+        if active and active.swipe_action:
+            events.append((res.timestamp_ms, active.swipe_gesture, active.id))
+        action = active.filter.stable() if active else "neutral"
+        if action == "neutral":
+            action_executed = False
+        elif not action_executed:
+            events.append((res.timestamp_ms, action, active.id))
+            action_executed = True
+    cost_us = (time.perf_counter() - start) / max(len(results), 1) * 1e6
+    return events, cost_us
+
+
+def evaluate(events, labels, tolerance_ms=LABEL_TOLERANCE_MS):
+    """Casa detecções com rótulos; retorna estatísticas por gesto"""
+    stats = {}
+
+    def entry(gesture):
+        return stats.setdefault(gesture, {"labels": 0, "hits": 0, "false_positives": 0, "latencies": []})
+
+    for label in labels:
+        entry(label["gesture"])["labels"] += 1
+    matched = set()
+    for ts, gesture, _ in events:
+        for i, label in enumerate(labels):
+            if (i not in matched and label["gesture"] == gesture
+                    and label["start_ms"] <= ts <= label["end_ms"] + tolerance_ms):
+                matched.add(i)
+                entry(gesture)["hits"] += 1
+                entry(gesture)["latencies"].append(ts - label["start_ms"])
+                break
+        else:
+            entry(gesture)["false_positives"] += 1
+    for s in stats.values():
+        s["misses"] = s["labels"] - s["hits"]
+    return stats
+
+
+def evaluate_trace(path, tracker_factory=HandTracker, gesture_config=None, tolerance_ms=LABEL_TOLERANCE_MS):
+    """Replay + avaliação de um arquivo
+
+    Retorna (duração em s, custo µs/frame, estatísticas, oscilação bruta).
+    """
+    _, frames, labels = load_trace(path)
+    action_table, swipe_table = ACTION_TABLE, SWIPE_TABLE
+    if gesture_config:
+        action_table, swipe_table = gesture_config[0], build_swipe_table(gesture_config[2])
+    tracker = tracker_factory()
+    events, cost_us = replay(frames_to_results(frames), tracker, action_table, swipe_table)
+    duration_s = (frames[-1]["ts_ms"] - frames[0]["ts_ms"]) / 1000 if len(frames) > 1 else 0.0
+    return duration_s, cost_us, evaluate(events, labels, tolerance_ms), tracker.flicker_rate()
+
+
+def percentiles(values):
+    if not values:
+        return float("nan"), float("nan")
+    return float(np.percentile(values, 50)), float(np.percentile(values, 95))
+
+
+def print_evaluation(stats, duration_s):
+    print(f"{'gesto':<14} {'rótulos':>8} {'detectados':>11} {'perdidos':>9} {'falsos+':>8} {'latência p50/p95 (ms)':>23}")
+    for gesture in sorted(stats):
+        s = stats[gesture]
+        p50, p95 = percentiles(s["latencies"])
+        print(f"{gesture:<14} {s['labels']:>8} {s['hits']:>11} {s['misses']:>9} {s['false_positives']:>8} "
+              f"{p50:>11.0f} /{p95:>9.0f}")
+    false_positives = sum(s["false_positives"] for s in stats.values())
+    rate = false_positives / (duration_s / 60) if duration_s > 0 else float("nan")
+    print(f"⚠️  Falsos positivos: {false_positives} ({rate:.2f}/min)")
+
+
+# ===== Trilha sintética =====
+def synthesize(duration_s=SYNTH_DURATION_S, fps=SYNTH_FPS, seed=0, action_table=None):
+    """Gera frames e rótulos de uma sessão sintética com swipes e gestos estáticos
+
+    Mistura mão aberta parada (com tremor), swipes rápidos, deslocamentos
+    lentos (não devem virar swipe), gestos estáticos e ausência da mão.
+    """
+    rng = np.random.default_rng(seed)
+    action_table = action_table or ACTION_TABLE
+    static_masks = [m for m in SYNTH_STATIC_MASKS if action_table[m] != "neutral"]
+    frames, labels = [], []
+    dt_ms = 1000.0 / fps
+    state = {"t": 0.0, "x": 0.0}
+
+    def emit(mask, x, y=0.0):
+        hands = []
+        if mask is not None and rng.random() >= SYNTH_DROPOUT:
+            points = synthetic_hand(mask, x, y) + rng.normal(0, SYNTH_JITTER, (21, 3)).astype(np.float32)
+            hands.append({"handed": "Right", "landmarks": np.round(points, LANDMARK_DECIMALS).tolist()})
+        frames.append({"type": "frame", "seq": len(frames), "ts_ms": int(round(state["t"])), "hands": hands})
+        state["t"] += dt_ms
+
+    def hold(mask, seconds):
+        for _ in range(int(seconds * fps)):
+            emit(mask, state["x"])
+
+    def move(distance, seconds, drift_y=0.0):
+        x0, n = state["x"], max(int(seconds * fps), 2)
+        for k in range(1, n + 1):
+            u = k / n
+            u = u * u * (3 - 2 * u)  # smoothstep: acelera e freia como uma mão real
+            state["x"] = x0 + distance * u
+            emit(0b11111, state["x"], drift_y * u)
+
+    kinds = ["rest", "swipe", "static", "drift", "absent"]
+    weights = [0.35, 0.3, 0.15, 0.1, 0.1]
+    while state["t"] < duration_s * 1000:
+        kind = rng.choice(kinds, p=weights)
+        if kind == "rest":
+            hold(0b11111, rng.uniform(0.8, 2.0))
+        elif kind == "swipe":
+            distance = rng.uniform(0.3, 0.45)
+            if state["x"] > 0 or (state["x"] == 0 and rng.random() < 0.5):
+                distance = -distance
+            start_ms = int(round(state["t"]))
+            move(distance, rng.uniform(0.2, 0.45), rng.uniform(-0.05, 0.05))
+            labels.append({"type": "label", "gesture": "swipe_right" if distance > 0 else "swipe_left",
+                           "start_ms": start_ms, "end_ms": int(round(state["t"]))})
+            hold(0b11111, 0.5)
+        elif kind == "static" and static_masks:
+            mask = static_masks[rng.integers(len(static_masks))]
+            start_ms = int(round(state["t"]))
+            hold(mask, rng.uniform(1.0, 1.5))
+            labels.append({"type": "label", "gesture": action_table[mask],
+                           "start_ms": start_ms, "end_ms": int(round(state["t"]))})
+            hold(0b11111, 0.5)
+        elif kind == "drift":
+            distance = rng.uniform(0.15, 0.25) * (-1 if state["x"] > 0 else 1)
+            move(distance, rng.uniform(1.0, 2.0))
+        elif kind == "absent":
+            hold(None, rng.uniform(0.5, 2.0))
+    return frames, labels
+
+
+# ===== Gravação =====
+def record(args):
+    device = args.device
+    if device is not None and device.isdigit():
+        device = int(device)
+    cap = open_capture(device if device is not None else 0, args.capture)
+    if not cap.isOpened():
+        print("❌ Não foi possível abrir a câmera")
+        return 1
+    backend = create_backend(args.backend, max_num_hands=args.max_hands, model_complexity=0)
+
+    prompts = args.prompt or []
+    print(f"🔴 Gravando em {args.out} (Ctrl+C para parar)")
+    if prompts:
+        print(f"💡 Faça cada gesto pedido dentro da janela de {RECORD_PROMPT_S:g} s")
+
+    seq = 0
+    start = None
+    slot = -1
+    try:
+        with TraceWriter(args.out, source=str(device), capture=args.capture, backend=args.backend) as writer:
+            while args.duration <= 0 or start is None or time.monotonic() - start < args.duration:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                frame = cv2.flip(frame, 1)
+                ts_ms = int(cap.last_timestamp * 1000)
+                if start is None:
+                    start = cap.last_timestamp
+                res = backend.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), ts_ms)
+                if res is not None:  # backend assíncrono: só grava resultados novos
+                    writer.write_frame(seq, ts_ms, res)
+                    seq += 1
+
+                # gravação guiada: pausa, pedido, pausa, pedido...
+                if prompts:
+                    cycle = RECORD_REST_S + RECORD_PROMPT_S
+                    elapsed = cap.last_timestamp - start
+                    current = int(elapsed // cycle)
+                    if current != slot and elapsed - current * cycle >= RECORD_REST_S:
+                        slot = current
+                        gesture = prompts[slot % len(prompts)]
+                        prompt_start = int((start + current * cycle + RECORD_REST_S) * 1000)
+                        writer.write_label(gesture, prompt_start, prompt_start + int(RECORD_PROMPT_S * 1000))
+                        print(f"👉 Agora: {gesture}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cap.release()
+        backend.close()
+    print(f"💾 {seq} frames gravados")
+    return 0
+
+
+# ===== Linha de comando =====
+def main():
+    parser = argparse.ArgumentParser(description="Gravação e replay de trilhas de landmarks do WaveControl")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="grava landmarks da câmera ou de um vídeo")
+    rec.add_argument("--device", help="índice da câmera, /dev/videoN ou arquivo de vídeo")
+    rec.add_argument("--capture", choices=CAPTURE_BACKENDS, default="opencv")
+    rec.add_argument("--backend", choices=INFERENCE_BACKENDS, default="solutions",
+                     help="backend de inferência (padrão: %(default)s)")
+    rec.add_argument("--max-hands", type=int, default=1)
+    rec.add_argument("--duration", type=float, default=0, help="segundos de gravação (0 = até Ctrl+C)")
+    rec.add_argument("--prompt", nargs="+", help="gestos pedidos em sequência (gravação rotulada)")
+    rec.add_argument("--out", required=True, help="arquivo .jsonl de saída")
+
+    syn = sub.add_parser("synth", help="gera uma trilha sintética rotulada")
+    syn.add_argument("--duration", type=float, default=SYNTH_DURATION_S)
+    syn.add_argument("--fps", type=float, default=SYNTH_FPS)
+    syn.add_argument("--seed", type=int, default=0)
+    syn.add_argument("--out", required=True, help="arquivo .jsonl de saída")
+
+    ev = sub.add_parser("eval", help="reproduz trilhas e mede latência e falsos positivos")
+    ev.add_argument("traces", nargs="+", help="arquivos .jsonl")
+    ev.add_argument("--gestures", help="arquivo JSON com a tabela de gestos")
+    ev.add_argument("--tolerance", type=int, default=LABEL_TOLERANCE_MS,
+                    help="ms aceitos após o fim do rótulo (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        return record(args)
+
+    if args.command == "synth":
+        frames, labels = synthesize(args.duration, args.fps, args.seed)
+        with TraceWriter(args.out, source="synth", seed=args.seed, fps=args.fps) as writer:
+            for fr in frames:
+                writer._write(fr)
+            for label in labels:
+                writer._write(label)
+        print(f"💾 {len(frames)} frames e {len(labels)} rótulos em {args.out}")
+        return 0
+
+    try:
+        gesture_config = load_gesture_config(args.gestures)
+        tuning = load_tuning(args.gestures)
+    except (OSError, ValueError) as e:
+        print(f"❌ Erro na tabela de gestos: {e}")
+        return 1
+
+    def tracker_factory():
+        return HandTracker(window_size=tuning["window_size"], threshold=tuning["threshold"], tuning=tuning)
+
+    total = {}
+    total_s = 0.0
+    for path in args.traces:
+        duration_s, cost_us, stats, flicker = evaluate_trace(path, tracker_factory, gesture_config, args.tolerance)
+        print(f"\n📼 {path}: {duration_s:.1f} s, rastreamento + filtro + swipe {cost_us:.1f} µs/frame, "
+              f"oscilação bruta {flicker:.1%} dos frames")
+        print_evaluation(stats, duration_s)
+        total_s += duration_s
+        for gesture, s in stats.items():
+            t = total.setdefault(gesture, {"labels": 0, "hits": 0, "misses": 0, "false_positives": 0, "latencies": []})
+            for key in ("labels", "hits", "misses", "false_positives"):
+                t[key] += s[key]
+            t["latencies"].extend(s["latencies"])
+    if len(args.traces) > 1:
+        print(f"\n📊 Total ({len(args.traces)} trilhas, {total_s:.1f} s)")
+        print_evaluation(total, total_s)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""Teste de longa duração (soak) do WaveControl.
+
+Repete um vídeo ou uma trilha de landmarks em loop pelo tempo pedido,
+passando pelo mesmo caminho do app: leitura, espelhamento, inferência
+(só com vídeo), rastreamento, filtro e a lógica de disparo, mais o preview
+a ``PREVIEW_FPS`` (redução, landmarks e cópia dos bytes do pixbuf). Nada de
+câmera, display ou uinput: as ações só são contadas.
+
+A cada ``--interval`` segundos uma amostra vai para a série temporal (CSV):
+RSS do processo, heap Python rastreado pelo ``tracemalloc``, objetos
+vivos, threads, FPS e percentis da latência por frame (leitura → fim do
+processamento) no intervalo. Ao final, cada métrica é testada quanto a
+crescimento monotônico (inclinação por hora após o aquecimento e fração de
+amostras que não diminuem) e as linhas de código que mais cresceram entre
+o primeiro e o último snapshot do ``tracemalloc`` são listadas.
+
+Uso:
+  python3 soak.py --video demo.mp4 --duration 8h --interval 60 --out soak.csv
+  python3 soak.py --trace sessao.jsonl --duration 30m --fast
+"""
+import argparse
+import csv
+import gc
+import os
+import resource
+import threading
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from backends import INFERENCE_BACKENDS, HandsResult, create_backend
+from capture import open_capture
+from render import LandmarkRenderer, preview_size
+from replay import frames_to_results, load_trace
+from tracking import HandTracker
+
+# ===== Configurações =====
+SOAK_INTERVAL_S = 60.0       # intervalo entre amostras
+SOAK_FPS = 30                # ritmo da reprodução (como a câmera)
+SOAK_WARMUP_FRACTION = 0.1   # início da série ignorado no teste de crescimento
+SOAK_MONOTONIC = 0.7         # fração mínima de passos sem queda para "monotônico"
+SOAK_MIN_SAMPLES = 8         # amostras (após o aquecimento) para testar crescimento
+TRACEMALLOC_FRAMES = 1       # profundidade da pilha guardada por alocação
+TOP_GROWTH_LINES = 10
+PREVIEW_FPS = 10
+PREVIEW_AREA = (760, 480)
+
+# crescimento tolerado por hora antes de sinalizar
+GROWTH_LIMITS = {
+    "rss_mb": 5.0,
+    "heap_mb": 2.0,
+    "objects": 5000,
+    "latency_p95_ms": 5.0,
+}
+
+CSV_FIELDS = ["elapsed_s", "frames", "fps", "latency_p50_ms", "latency_p95_ms", "latency_p99_ms",
+              "rss_mb", "heap_mb", "heap_peak_mb", "objects", "threads", "actions"]
+
+
+def parse_duration(text):
+    """``90`` (s), ``30m``, ``8h`` → segundos"""
+    text = str(text).strip().lower()
+    units = {"s": 1, "m": 60, "h": 3600}
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def current_rss_mb():
+    """RSS atual (Linux: /proc/self/statm; fora dele, o pico do processo)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class VideoSource:
+    """Frames de um vídeo em loop, reabrindo do início no fim do arquivo"""
+
+    def __init__(self, path, backend):
+        self.cap = open_capture(path)
+        if not self.cap.isOpened():
+            raise OSError(f"Não foi possível abrir {path}")
+        self.backend = backend
+        self.loops = 0
+
+    def next(self):
+        ok, frame = self.cap.read()
+        if not ok:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.loops += 1
+            ok, frame = self.cap.read()
+            if not ok:
+                raise OSError("Vídeo sem frames")
+        frame = cv2.flip(frame, 1)
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return frame, self.backend.process(rgb, int(self.cap.last_timestamp * 1000))
+
+    def close(self):
+        self.cap.release()
+        self.backend.close()
+
+
+class TraceSource:
+    """Resultados de uma trilha em loop, com timestamps sempre crescentes"""
+
+    def __init__(self, path):
+        _, frames, _ = load_trace(path)
+        if not frames:
+            raise ValueError(f"{path}: trilha sem frames")
+        self.results = frames_to_results(frames)
+        self.span_ms = frames[-1]["ts_ms"] - frames[0]["ts_ms"] + 1000 // SOAK_FPS
+        self.index = 0
+        self.loops = 0
+        # sem imagem: o preview é desenhado sobre um quadro preto
+        self.frame = np.zeros((480, 640, 3), np.uint8)
+
+    def next(self):
+        res = self.results[self.index]
+        self.index += 1
+        if self.index == len(self.results):
+            self.index = 0
+            self.loops += 1
+        ts_ms = res.timestamp_ms + self.loops * self.span_ms
+        return self.frame, HandsResult(res.multi_hand_landmarks, res.multi_handedness, ts_ms)
+
+    def close(self):
+        pass
+
+
+def detect_growth(times_s, values, limit_per_hour, warmup_fraction=SOAK_WARMUP_FRACTION,
+                  min_monotonic=SOAK_MONOTONIC):
+    """Inclinação por hora (após o aquecimento) e se o crescimento é monotônico"""
+    start = int(len(values) * warmup_fraction)
+    t = np.asarray(times_s[start:], float)
+    v = np.asarray(values[start:], float)
+    if len(v) < SOAK_MIN_SAMPLES or t[-1] <= t[0]:
+        return {"slope_per_hour": 0.0, "tail_slope_per_hour": 0.0, "monotonic": 0.0, "flagged": False}
+    slope = float(np.polyfit(t, v, 1)[0]) * 3600
+    # um degrau no começo seguido de platô não é vazamento: a segunda metade
+    # também precisa continuar subindo
+    half = len(v) // 2
+    tail_slope = float(np.polyfit(t[half:], v[half:], 1)[0]) * 3600
+    monotonic = float(np.mean(np.diff(v) >= 0))
+    return {"slope_per_hour": slope, "tail_slope_per_hour": tail_slope, "monotonic": monotonic,
+            "flagged": slope > limit_per_hour and tail_slope > limit_per_hour and monotonic >= min_monotonic}
+
+
+class SoakRun:
+    def __init__(self, source, duration_s, interval_s=SOAK_INTERVAL_S, fps=SOAK_FPS, use_tracemalloc=True):
+        self.source = source
+        self.duration_s = duration_s
+        self.interval_s = interval_s
+        self.frame_interval = 1.0 / fps if fps > 0 else 0.0
+        self.use_tracemalloc = use_tracemalloc
+        self.tracker = HandTracker()
+        self.renderer = LandmarkRenderer()
+        self.samples = []
+        self.first_snapshot = None
+        self.last_snapshot = None
+        self.frames = 0
+        self.actions = 0
+        self.action_executed = False
+        self.last_preview_ts = 0.0
+
+    def step(self):
+        """Um frame pelo caminho do app; retorna a latência em ms"""
+        start = time.perf_counter()
+        frame, res = self.source.next()
+        if res is not None:  # backend assíncrono sem resultado novo: o filtro não anda
+            self.tracker.update(res)
+            active = self.tracker.active()
+            if active and active.swipe_action:
+                self.actions += 1
+            action = active.filter.stable() if active else "neutral"
+            if action == "neutral":
+                self.action_executed = False
+            elif not self.action_executed:
+                self.actions += 1
+                self.action_executed = True
+
+        now = time.monotonic()
+        if now - self.last_preview_ts >= 1.0 / PREVIEW_FPS:
+            self.last_preview_ts = now
+            height, width = frame.shape[:2]
+            size = preview_size(width, height, *PREVIEW_AREA)
+            small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+            for track in self.tracker.tracks:
+                if track.landmarks is not None:
+                    self.renderer.draw(small, track.landmarks)
+            small.tobytes()  # mesma cópia do GdkPixbuf.new_from_data
+        self.frames += 1
+        return (time.perf_counter() - start) * 1000
+
+    def sample(self, elapsed_s, frames, latencies, interval_s):
+        heap_mb = heap_peak_mb = 0.0
+        if self.use_tracemalloc:
+            current, peak = tracemalloc.get_traced_memory()
+            heap_mb, heap_peak_mb = current / 2**20, peak / 2**20
+            tracemalloc.reset_peak()
+        row = {
+            "elapsed_s": round(elapsed_s, 1),
+            "frames": self.frames,
+            "fps": frames / interval_s if interval_s > 0 else 0.0,
+            "latency_p50_ms": float(np.percentile(latencies, 50)) if latencies else float("nan"),
+            "latency_p95_ms": float(np.percentile(latencies, 95)) if latencies else float("nan"),
+            "latency_p99_ms": float(np.percentile(latencies, 99)) if latencies else float("nan"),
+            "rss_mb": current_rss_mb(),
+            "heap_mb": heap_mb,
+            "heap_peak_mb": heap_peak_mb,
+            "objects": len(gc.get_objects()),
+            "threads": threading.active_count(),
+            "actions": self.actions,
+        }
+        self.samples.append(row)
+        return row
+
+    def run(self, on_sample=None):
+        if self.use_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        start = last_sample = time.monotonic()
+        latencies = []
+        frames_at_sample = 0
+        try:
+            while True:
+                now = time.monotonic()
+                if now - start >= self.duration_s:
+                    break
+                latencies.append(self.step())
+                now = time.monotonic()
+                if now - last_sample >= self.interval_s:
+                    row = self.sample(now - start, self.frames - frames_at_sample, latencies, now - last_sample)
+                    if self.use_tracemalloc and self.first_snapshot is None \
+                            and now - start >= self.duration_s * SOAK_WARMUP_FRACTION:
+                        self.first_snapshot = tracemalloc.take_snapshot()
+                    if on_sample:
+                        on_sample(row)
+                    last_sample, latencies, frames_at_sample = now, [], self.frames
+                if self.frame_interval:
+                    time.sleep(max(self.frame_interval - (time.monotonic() - now), 0.0))
+        except KeyboardInterrupt:
+            print("\n🛑 Interrompido pelo usuário")
+        finally:
+            if self.use_tracemalloc:
+                self.last_snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+            self.source.close()
+        return self.samples
+
+    def growth(self):
+        times = [s["elapsed_s"] for s in self.samples]
+        return {metric: detect_growth(times, [s[metric] for s in self.samples], limit)
+                for metric, limit in GROWTH_LIMITS.items()
+                if metric != "heap_mb" or self.use_tracemalloc}
+
+    def top_growth(self, limit=TOP_GROWTH_LINES):
+        if self.first_snapshot is None or self.last_snapshot is None:
+            return []
+        # a própria série de amostras cresce de propósito
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        last = self.last_snapshot.filter_traces(filters)
+        first = self.first_snapshot.filter_traces(filters)
+        return [stat for stat in last.compare_to(first, "lineno")[:limit] if stat.size_diff > 0]
+
+
+def print_sample(row):
+    print(f"   {row['elapsed_s']:>8.0f} s  {row['fps']:5.1f} FPS  latência p50/p95 "
+          f"{row['latency_p50_ms']:6.1f} / {row['latency_p95_ms']:6.1f} ms  RSS {row['rss_mb']:7.1f} MB  "
+          f"heap {row['heap_mb']:6.1f} MB  objetos {row['objects']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de longa duração do WaveControl")
+    parser.add_argument("--video", help="vídeo reproduzido em loop (com inferência)")
+    parser.add_argument("--trace", help="trilha .jsonl reproduzida em loop (sem inferência)")
+    parser.add_argument("--backend", choices=INFERENCE_BACKENDS, default="solutions")
+    parser.add_argument("--max-hands", type=int, default=1)
+    parser.add_argument("--duration", default="1h", help="duração: segundos ou 30m/8h (padrão: %(default)s)")
+    parser.add_argument("--interval", type=float, default=SOAK_INTERVAL_S,
+                        help="segundos entre amostras (padrão: %(default)s)")
+    parser.add_argument("--fast", action="store_true", help="sem limitar a %d FPS" % SOAK_FPS)
+    parser.add_argument("--no-tracemalloc", action="store_true",
+                        help="não rastreia o heap Python (menos overhead)")
+    parser.add_argument("--out", default="soak.csv", help="série temporal em CSV (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    if bool(args.video) == bool(args.trace):
+        print("❌ Informe --video ou --trace")
+        return 1
+    try:
+        duration_s = parse_duration(args.duration)
+        if args.video:
+            backend = create_backend(args.backend, max_num_hands=args.max_hands, model_complexity=0)
+            source = VideoSource(args.video, backend)
+        else:
+            source = TraceSource(args.trace)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    soak = SoakRun(source, duration_s, args.interval, 0 if args.fast else SOAK_FPS, not args.no_tracemalloc)
+    print(f"🔁 Soak de {duration_s:g} s com {args.video or args.trace}, amostras a cada {args.interval:g} s")
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+
+        def on_sample(row):
+            writer.writerow({k: round(v, 3) if isinstance(v, float) else v for k, v in row.items()})
+            f.flush()
+            print_sample(row)
+
+        soak.run(on_sample)
+
+    print(f"\n📝 {len(soak.samples)} amostras em {args.out} ({soak.frames} frames, {source.loops} voltas)")
+    flagged = []
+    if len(soak.samples) * (1 - SOAK_WARMUP_FRACTION) < SOAK_MIN_SAMPLES:
+        print(f"ℹ️  Menos de {SOAK_MIN_SAMPLES} amostras após o aquecimento: crescimento não avaliado")
+    print(f"{'métrica':<16} {'inclinação/h':>13} {'2ª metade/h':>12} {'sem queda':>10}")
+    for metric, g in soak.growth().items():
+        mark = "⚠️  crescimento" if g["flagged"] else "✅"
+        print(f"{metric:<16} {g['slope_per_hour']:>+13.2f} {g['tail_slope_per_hour']:>+12.2f} "
+              f"{g['monotonic']:>10.0%}  {mark}")
+        if g["flagged"]:
+            flagged.append(metric)
+    top = soak.top_growth()
+    if top:
+        print("\n🔎 Linhas que mais cresceram no heap (tracemalloc):")
+        for stat in top:
+            frame = stat.traceback[0]
+            print(f"   {stat.size_diff / 1024:+9.1f} KiB  {stat.count_diff:+7d} blocos  {frame.filename}:{frame.lineno}")
+    if flagged:
+        print(f"\n⚠️  Crescimento monotônico em: {', '.join(flagged)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
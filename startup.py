@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Cronômetro da partida do WaveControl (lançamento → pronto).
+
+Importado antes de tudo por ``main.py``, marca as fases da partida:
+
+- montagem: do início do processo do AppImage (o runtime monta a imagem e
+  executa o ``AppRun`` no mesmo processo) até o ``AppRun`` começar;
+- extração: só sem FUSE, na primeira execução de cada versão;
+- interpretador: ``AppRun`` → primeira linha Python do app;
+- imports: OpenCV, GTK e módulos do app;
+- import mediapipe: à parte, pois a janela só o carrega sem daemon;
+- modelo: criação do backend de inferência;
+- interface: janela montada;
+- primeiro frame: primeira inferência sobre um frame da câmera.
+
+O tempo em que a janela fica esperando o clique em "Iniciar" aparece como
+fase ociosa e não entra no total.
+
+Fora do AppImage não há montagem e a contagem começa no processo Python.
+Cada partida é anexada a ``~/.cache/wavecontrol/startup.jsonl`` com a versão
+(``WAVECONTROL_VERSION``, gravada pelo build); ``summary`` mostra a mediana
+por versão, o número acompanhado a cada release. ``check`` mede a partida
+sem câmera e sem janela (imports, modelo e uma inferência num frame
+sintético) e é o que o build do AppImage roda ao final.
+
+Uso:
+  python3 startup.py check
+  python3 startup.py summary
+  ./WaveControl-x86_64.AppImage --startup-check
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from collections import defaultdict
+
+# ===== Configurações =====
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "wavecontrol")
+STARTUP_LOG = os.path.join(CACHE_DIR, "startup.jsonl")
+CHECK_SIZE = (640, 480)      # frame sintético do ``check``
+
+
+def process_age_s():
+    """Tempo desde o início deste processo (Linux; resolução de 1 tick, ~10 ms)"""
+    try:
+        with open("/proc/self/stat") as f:
+            # o nome do processo pode ter espaços: os campos vêm depois do ')'
+            fields = f.read().rsplit(")", 1)[1].split()
+        start_ticks = int(fields[19])
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+
+
+def env_timestamp(name):
+    """Instante (``date +%s%N``) exportado pelo AppRun, em segundos"""
+    value = os.environ.get(name, "")
+    return int(value) / 1e9 if value.isdigit() else None
+
+
+class StartupTimer:
+    def __init__(self):
+        now = time.time()
+        self.launch_ts = now - process_age_s()
+        self.apprun_ts = env_timestamp("WAVECONTROL_APPRUN_NS")
+        self.extracted_ts = env_timestamp("WAVECONTROL_EXTRACTED_NS")
+        self.version = os.environ.get("WAVECONTROL_VERSION", "dev")
+        self.marks = [("interpretador", now, False)]
+        self.reported = False
+
+    def mark(self, phase, idle=False):
+        """Fim de uma fase; fases ociosas (espera pelo usuário) ficam fora do total"""
+        self.marks.append((phase, time.time(), idle))
+
+    def phases(self):
+        """[(fase, ms, ociosa)] na ordem, cada uma medida a partir do fim da anterior"""
+        rows = []
+        previous = self.launch_ts
+        for name, ts in (("montagem", self.apprun_ts), ("extração", self.extracted_ts)):
+            if ts is not None:
+                rows.append((name, (ts - previous) * 1000, False))
+                previous = ts
+        for name, ts, idle in self.marks:
+            rows.append((name, (ts - previous) * 1000, idle))
+            previous = ts
+        return rows
+
+    def total_ms(self):
+        """Lançamento → pronto, sem as fases ociosas"""
+        return sum(ms for _, ms, idle in self.phases() if not idle)
+
+    def report(self, path=STARTUP_LOG):
+        """Mostra as fases e anexa a partida ao histórico (uma vez por processo)"""
+        if self.reported:
+            return
+        self.reported = True
+        phases = self.phases()
+        print(f"🚀 Partida em {self.total_ms():.0f} ms: "
+              + " | ".join(f"{name} {ms:.0f}" + (" (ocioso)" if idle else "") for name, ms, idle in phases)
+              + " ms")
+        record = {
+            "version": self.version,
+            "ts": round(time.time(), 3),
+            "appimage": self.apprun_ts is not None,
+            "phases_ms": {name: round(ms, 1) for name, ms, _ in phases},
+            "idle": [name for name, _, idle in phases if idle],
+            "total_ms": round(self.total_ms(), 1),
+        }
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"⚠️  Não foi possível gravar {path}: {e}")
+
+
+# criado na importação: o primeiro import de main.py marca o fim do interpretador
+STARTUP = StartupTimer()
+
+
+def check(log_path, backend):
+    """Partida sem câmera nem janela: imports, modelo e uma inferência"""
+    # os imports são parte do que está sendo medido
+    import numpy as np
+    import cv2
+    from backends import create_backend
+    STARTUP.mark("imports")
+    hands = create_backend(backend, max_num_hands=1, model_complexity=0)
+    STARTUP.mark("modelo")
+    width, height = CHECK_SIZE
+    frame = np.zeros((height, width, 3), np.uint8)
+    hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), 0)
+    STARTUP.mark("primeiro frame")
+    hands.close()
+    STARTUP.report(log_path)
+
+
+def load_records(path):
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def summary(path):
+    """Mediana da partida (total e por fase) de cada versão, na ordem em que apareceram"""
+    by_version = defaultdict(list)
+    for record in load_records(path):
+        by_version[record["version"]].append(record)
+    print(f"{'versão':<28} {'partidas':>8} {'mediana':>9} {'mín':>7}   fases (mediana, ms)")
+    for version, records in by_version.items():
+        totals = [r["total_ms"] for r in records]
+        names = list(dict.fromkeys(name for r in records for name in r["phases_ms"]))
+        phases = ", ".join(
+            f"{name} {statistics.median(r['phases_ms'][name] for r in records if name in r['phases_ms']):.0f}"
+            for name in names)
+        print(f"{version:<28} {len(records):>8} {statistics.median(totals):>7.0f} ms {min(totals):>5.0f} ms   {phases}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de partida do WaveControl")
+    parser.add_argument("command", choices=["check", "summary"])
+    parser.add_argument("--log", default=STARTUP_LOG, help="histórico das partidas (padrão: %(default)s)")
+    parser.add_argument("--backend", default="solutions", help="backend medido pelo check (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    if args.command == "check":
+        check(args.log, args.backend)
+        return 0
+    try:
+        summary(args.log)
+    except OSError as e:
+        print(f"❌ Sem histórico de partidas: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""Envio de landmarks entre o host de captura e o host da apresentação.
+
+O host com a câmera roda a inferência e manda, por frame, só as mãos
+detectadas (``main_cli.py --stream``); o host da apresentação recebe,
+roda rastreamento, filtro e swipes e aperta as teclas
+(``main_cli.py --receive``). Nada de vídeo passa pela rede.
+
+Formato binário (little-endian), um quadro por frame::
+
+    cabeçalho (24 bytes): "WC", versão (u8), nº de mãos (u8), seq (u32),
+                          captura (f64, s), envio (f64, s)
+    por mão (127 bytes):  lateralidade (u8: 1 = direita), 21 × (x, y, z) em float16
+
+Um frame com uma mão ocupa 151 bytes. No UDP cada quadro é um datagrama;
+no TCP os quadros vão em sequência (o nº de mãos define o tamanho).
+
+Os tempos são de relógio de parede (``time.time``). O atraso de rede é
+``recebido - envio``; como os relógios de dois hosts nunca batem
+exatamente, também é reportado o atraso acima do menor já observado, que
+não depende da diferença entre os relógios. Perdas são lacunas no número
+de sequência; quadros atrasados que chegam fora de ordem são descartados.
+
+Uso (teste em loopback, sem câmera nem uinput):
+  python3 stream.py listen udp://127.0.0.1:5005
+  python3 stream.py send sintetico.jsonl --to udp://127.0.0.1:5005 --drop 0.02
+"""
+import argparse
+import random
+import socket
+import struct
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from backends import HandsResult, landmark_list_from_array
+from replay import frames_to_results, load_trace
+
+# ===== Configurações =====
+STREAM_MAGIC = b"WC"
+STREAM_VERSION = 1
+STREAM_PORT = 5005
+STREAM_PROTOCOLS = ("udp", "tcp")
+STREAM_TIMEOUT_S = 1.0        # sem quadros por este tempo = host de captura parado
+STREAM_RECONNECT_S = 1.0      # intervalo entre tentativas de conexão TCP
+STREAM_REPORT_S = 10.0        # intervalo do resumo periódico no receptor
+STREAM_DELAY_SAMPLES = 10000  # atrasos guardados para os percentis
+STREAM_RESTART_GAP = 1000     # seq muito menor que o último = emissor reiniciou
+STREAM_RESTART_IDLE_S = 0.5   # seq menor após este silêncio também = emissor reiniciou
+
+HEADER = struct.Struct("<2sBBIdd")
+HAND_POINTS = 21
+HAND_SIZE = 1 + HAND_POINTS * 3 * 2
+MAX_FRAME_SIZE = HEADER.size + 255 * HAND_SIZE
+
+
+def parse_endpoint(url):
+    """``udp://host:porta`` ou ``tcp://host:porta`` → (protocolo, host, porta)"""
+    parts = urlsplit(url if "://" in url else f"udp://{url}")
+    if parts.scheme not in STREAM_PROTOCOLS:
+        raise ValueError(f"Protocolo desconhecido '{parts.scheme}' (use udp:// ou tcp://)")
+    return parts.scheme, parts.hostname or "0.0.0.0", parts.port or STREAM_PORT
+
+
+def encode_frame(seq, capture_ts, res, send_ts=None):
+    """Serializa as mãos de um ``HandsResult`` (ou nenhuma, se None)"""
+    hands = []
+    if res is not None and res.multi_hand_landmarks:
+        for i, lm in enumerate(res.multi_hand_landmarks):
+            handed = res.multi_handedness[i] if i < len(res.multi_handedness) else "Right"
+            points = np.array([(p.x, p.y, p.z) for p in lm.landmark], "<f2")
+            hands.append(bytes([handed == "Right"]) + points.tobytes())
+    send_ts = time.time() if send_ts is None else send_ts
+    header = HEADER.pack(STREAM_MAGIC, STREAM_VERSION, len(hands), seq & 0xFFFFFFFF, capture_ts, send_ts)
+    return header + b"".join(hands)
+
+
+class StreamFrame:
+    __slots__ = ("seq", "capture_ts", "send_ts", "recv_ts", "result", "size")
+
+    def __init__(self, seq, capture_ts, send_ts, recv_ts, result, size):
+        self.seq = seq
+        self.capture_ts = capture_ts
+        self.send_ts = send_ts
+        self.recv_ts = recv_ts
+        self.result = result
+        self.size = size
+
+
+def decode_header(data):
+    """Retorna (nº de mãos, seq, captura, envio); valida assinatura e versão"""
+    magic, version, n_hands, seq, capture_ts, send_ts = HEADER.unpack_from(data)
+    if magic != STREAM_MAGIC or version != STREAM_VERSION:
+        raise ValueError(f"Quadro inválido (assinatura {magic!r}, versão {version})")
+    return n_hands, seq, capture_ts, send_ts
+
+
+def decode_frame(data, recv_ts=None):
+    n_hands, seq, capture_ts, send_ts = decode_header(data)
+    if len(data) != HEADER.size + n_hands * HAND_SIZE:
+        raise ValueError(f"Quadro com {len(data)} bytes para {n_hands} mão(s)")
+    lists, handedness = [], []
+    for i in range(n_hands):
+        offset = HEADER.size + i * HAND_SIZE
+        handedness.append("Right" if data[offset] else "Left")
+        points = np.frombuffer(data, "<f2", HAND_POINTS * 3, offset + 1).reshape(HAND_POINTS, 3)
+        lists.append(landmark_list_from_array(points.astype(np.float32)))
+    # o timestamp do resultado é o da captura: swipes medem a velocidade
+    # da mão, não o ritmo de chegada dos pacotes
+    result = HandsResult(lists, handedness, int(capture_ts * 1000))
+    recv_ts = time.time() if recv_ts is None else recv_ts
+    return StreamFrame(seq, capture_ts, send_ts, recv_ts, result, len(data))
+
+
+def wall_clock(monotonic_ts):
+    """Converte um instante de ``time.monotonic`` para relógio de parede"""
+    return time.time() - (time.monotonic() - monotonic_ts)
+
+
+# ===== Emissor =====
+class LandmarkSender:
+    def __init__(self, url):
+        self.url = url
+        self.protocol, self.host, self.port = parse_endpoint(url)
+        self.sock = None
+        self.next_connect = 0.0
+        self.seq = 0
+        self.frames = 0
+        self.bytes = 0
+        self.errors = 0
+        if self.protocol == "udp":
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.sock.connect((self.host, self.port))
+
+    def _connect(self):
+        """Conexão TCP sob demanda, no máximo uma tentativa por ``STREAM_RECONNECT_S``"""
+        now = time.monotonic()
+        if now < self.next_connect:
+            return False
+        self.next_connect = now + STREAM_RECONNECT_S
+        try:
+            self.sock = socket.create_connection((self.host, self.port), timeout=STREAM_RECONNECT_S)
+        except OSError:
+            self.sock = None
+            return False
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return True
+
+    def send(self, res, capture_ts):
+        """Envia as mãos de um frame (``capture_ts`` em relógio de parede)"""
+        if self.sock is None and not self._connect():
+            return False
+        data = encode_frame(self.seq, capture_ts, res)
+        self.seq += 1
+        try:
+            if self.protocol == "udp":
+                self.sock.send(data)
+            else:
+                self.sock.sendall(data)
+        except OSError:
+            # receptor fora do ar: UDP segue tentando, TCP reconecta depois
+            self.errors += 1
+            if self.protocol == "tcp":
+                self.sock.close()
+                self.sock = None
+            return False
+        self.frames += 1
+        self.bytes += len(data)
+        return True
+
+    def format_summary(self):
+        per_frame = self.bytes / self.frames if self.frames else 0
+        return (f"📡 Enviados {self.frames} frames para {self.url} "
+                f"({per_frame:.0f} bytes/frame, {self.errors} falhas de envio)")
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+# ===== Receptor =====
+class StreamStats:
+    """Perdas, reordenações e atrasos observados no receptor"""
+
+    def __init__(self, max_samples=STREAM_DELAY_SAMPLES):
+        self.last_seq = None
+        self.last_recv_ts = None
+        self.resync = False   # próximo seq menor é reinício, não atraso
+        self.received = 0
+        self.lost = 0
+        self.late = 0
+        self.restarts = 0
+        self.bytes = 0
+        self.delays_ms = deque(maxlen=max_samples)    # envio → recebido
+        self.capture_ms = deque(maxlen=max_samples)   # captura → recebido
+        self.base_delay_ms = None
+
+    def reset_sequence(self):
+        """Nova conexão ou silêncio do emissor: um seq menor a seguir é um reinício"""
+        self.resync = True
+
+    def accept(self, frame):
+        """Contabiliza o quadro; retorna False se ele chegou atrasado (fora de ordem)"""
+        if self.last_seq is not None:
+            gap = frame.seq - self.last_seq
+            restarted = (self.resync or self.last_seq - frame.seq >= STREAM_RESTART_GAP
+                         or frame.recv_ts - self.last_recv_ts >= STREAM_RESTART_IDLE_S)
+            if gap <= 0 and not restarted:
+                self.late += 1
+                return False
+            if gap > 0:
+                self.lost += gap - 1
+            else:
+                self.restarts += 1
+        self.last_seq = frame.seq
+        self.last_recv_ts = frame.recv_ts
+        self.resync = False
+        self.received += 1
+        self.bytes += frame.size
+        delay = (frame.recv_ts - frame.send_ts) * 1000
+        self.delays_ms.append(delay)
+        self.capture_ms.append((frame.recv_ts - frame.capture_ts) * 1000)
+        self.base_delay_ms = delay if self.base_delay_ms is None else min(self.base_delay_ms, delay)
+        return True
+
+    def loss_rate(self):
+        total = self.received + self.lost
+        return self.lost / total if total else 0.0
+
+    def summary(self):
+        def pct(values, q):
+            return float(np.percentile(values, q)) if values else float("nan")
+        base = self.base_delay_ms or 0.0
+        return {
+            "received": self.received,
+            "lost": self.lost,
+            "late": self.late,
+            "loss_rate": self.loss_rate(),
+            "bytes_per_frame": self.bytes / self.received if self.received else 0.0,
+            "delay_p50_ms": pct(self.delays_ms, 50),
+            "delay_p95_ms": pct(self.delays_ms, 95),
+            "extra_p50_ms": pct(self.delays_ms, 50) - base,
+            "extra_p95_ms": pct(self.delays_ms, 95) - base,
+            "capture_p50_ms": pct(self.capture_ms, 50),
+            "capture_p95_ms": pct(self.capture_ms, 95),
+        }
+
+    def format_summary(self):
+        s = self.summary()
+        return (f"📡 {s['received']} frames ({s['bytes_per_frame']:.0f} bytes/frame), "
+                f"perdidos {s['lost']} ({s['loss_rate']:.1%}), fora de ordem {s['late']}\n"
+                f"   rede p50/p95: {s['delay_p50_ms']:.1f} / {s['delay_p95_ms']:.1f} ms "
+                f"(acima do mínimo: {s['extra_p50_ms']:.1f} / {s['extra_p95_ms']:.1f} ms)\n"
+                f"   captura → recebido p50/p95: {s['capture_p50_ms']:.1f} / {s['capture_p95_ms']:.1f} ms")
+
+
+class LandmarkReceiver:
+    def __init__(self, url):
+        self.url = url
+        self.protocol, self.host, self.port = parse_endpoint(url)
+        self.stats = StreamStats()
+        self.conn = None
+        self.buffer = bytearray()
+        if self.protocol == "udp":
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((self.host, self.port))
+        if self.protocol == "tcp":
+            self.sock.listen(1)
+
+    def _read_udp(self, timeout):
+        self.sock.settimeout(timeout)
+        data, _ = self.sock.recvfrom(MAX_FRAME_SIZE)
+        return data
+
+    def _fill(self, size, deadline):
+        """Garante ``size`` bytes no buffer sem consumi-los (timeout não perde dados)"""
+        while len(self.buffer) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout()
+            self.conn.settimeout(remaining)
+            chunk = self.conn.recv(65536)
+            if not chunk:
+                raise ConnectionResetError("emissor desconectou")
+            self.buffer += chunk
+
+    def _read_tcp(self, timeout):
+        if self.conn is None:
+            self.sock.settimeout(timeout)
+            self.conn, _ = self.sock.accept()
+            self.conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.buffer.clear()
+            self.stats.reset_sequence()
+        deadline = time.monotonic() + timeout
+        try:
+            # o cabeçalho só sai do buffer junto com o corpo: um timeout no
+            # meio do quadro deixa tudo para a próxima leitura
+            self._fill(HEADER.size, deadline)
+            size = HEADER.size + decode_header(self.buffer)[0] * HAND_SIZE
+            self._fill(size, deadline)
+            data = bytes(self.buffer[:size])
+            del self.buffer[:size]
+            return data
+        except (ConnectionResetError, ValueError):
+            self.conn.close()
+            self.conn = None
+            raise
+
+    def receive(self, timeout=STREAM_TIMEOUT_S):
+        """Próximo quadro em ordem (``StreamFrame``) ou None se nada chegou a tempo"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                data = self._read_udp(remaining) if self.protocol == "udp" else self._read_tcp(remaining)
+                frame = decode_frame(data)
+            except socket.timeout:
+                self.stats.reset_sequence()
+                return None
+            except (ConnectionResetError, ValueError, struct.error):
+                continue  # quadro corrompido ou conexão caiu: espera o próximo
+            if self.stats.accept(frame):
+                return frame
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        self.sock.close()
+
+
+# ===== Teste sem câmera =====
+def send_trace(path, url, drop=0.0, speed=1.0, seed=0):
+    """Envia uma trilha gravada (``replay.py``) no ritmo original"""
+    _, frames, _ = load_trace(path)
+    results = frames_to_results(frames)
+    sender = LandmarkSender(url)
+    rng = random.Random(seed)
+    start = time.monotonic()
+    first_ms = frames[0]["ts_ms"] if frames else 0
+    try:
+        for fr, res in zip(frames, results):
+            due = start + (fr["ts_ms"] - first_ms) / 1000 / speed
+            time.sleep(max(due - time.monotonic(), 0.0))
+            if drop and rng.random() < drop:
+                sender.seq += 1  # perda simulada: o número de sequência avança
+                continue
+            sender.send(res, time.time())
+    finally:
+        sender.close()
+    return sender
+
+
+def listen(url, duration=0.0):
+    """Só recebe e mede (sem filtro nem teclado)"""
+    receiver = LandmarkReceiver(url)
+    print(f"📡 Aguardando landmarks em {url}...")
+    start = last_report = time.monotonic()
+    try:
+        while not duration or time.monotonic() - start < duration:
+            receiver.receive()
+            if time.monotonic() - last_report >= STREAM_REPORT_S and receiver.stats.received:
+                last_report = time.monotonic()
+                print(receiver.stats.format_summary())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        receiver.close()
+    print(receiver.stats.format_summary())
+    return receiver.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Envio de landmarks do WaveControl pela rede")
+    sub = parser.add_subparsers(dest="command", required=True)
+    snd = sub.add_parser("send", help="envia uma trilha gravada no ritmo original")
+    snd.add_argument("trace", help="arquivo .jsonl (replay.py record/synth)")
+    snd.add_argument("--to", required=True, help="udp://host:porta ou tcp://host:porta")
+    snd.add_argument("--drop", type=float, default=0.0, help="fração de quadros descartados (perda simulada)")
+    snd.add_argument("--speed", type=float, default=1.0, help="velocidade da reprodução")
+    lst = sub.add_parser("listen", help="recebe e mede perdas e atrasos")
+    lst.add_argument("url", help="udp://host:porta ou tcp://host:porta")
+    lst.add_argument("--duration", type=float, default=0, help="segundos (0 = até Ctrl+C)")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "send":
+            sender = send_trace(args.trace, args.to, args.drop, args.speed)
+            print(sender.format_summary())
+        else:
+            listen(args.url, args.duration)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Backend de inferência com interpretador TFLite direto (XNNPACK).
+
+Carrega os modelos de detecção de palma e de landmarks que já vêm no
+pacote do MediaPipe em interpretadores TFLite com número de threads
+configurável (o delegate XNNPACK é aplicado pelo interpretador para modelos
+float). Implementa o próprio loop palma → landmarks:
+
+1. detecção de palma (192x192, letterbox) só quando há menos mãos
+   rastreadas que ``max_num_hands``;
+2. recorte rotacionado da mão (224x224) e inferência dos 21 landmarks;
+3. a ROI do próximo frame sai dos landmarks atuais (rastreamento), como
+   no grafo do MediaPipe.
+
+A saída é o mesmo ``HandsResult`` dos outros backends.
+"""
+import math
+import os
+import time
+
+import cv2
+import numpy as np
+import mediapipe as mp
+
+from backends import InferenceBackend, HandsResult, landmark_list_from_array, MIN_DET, MIN_TRK
+
+try:
+    from ai_edge_litert.interpreter import Interpreter
+except ImportError:
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tensorflow.lite.python.interpreter import Interpreter
+        except ImportError:
+            Interpreter = None
+
+# ===== Configurações =====
+MP_MODULES = os.path.join(os.path.dirname(mp.__file__), "modules")
+PALM_MODEL = os.path.join(MP_MODULES, "palm_detection", "palm_detection_lite.tflite")
+LANDMARK_MODEL = os.path.join(MP_MODULES, "hand_landmark", "hand_landmark_lite.tflite")
+TFLITE_THREADS = 4
+
+PALM_SIZE = 192
+LANDMARK_SIZE = 224
+PALM_NMS_IOU = 0.3
+# índices dos keypoints da palma / landmarks usados para a rotação
+PALM_WRIST, PALM_MIDDLE = 0, 2
+LM_WRIST, LM_MIDDLE_MCP = 0, 9
+# landmarks usados para a ROI de rastreamento (palma + base dos dedos)
+ROI_LANDMARKS = [0, 1, 2, 3, 5, 6, 9, 10, 13, 14, 17, 18]
+
+
+def _ssd_anchors():
+    """Âncoras SSD do palm_detection (4 camadas, strides 8/16/16/16)"""
+    anchors = []
+    for stride, per_cell in ((8, 2), (16, 6)):
+        grid = PALM_SIZE // stride
+        ys, xs = np.mgrid[0:grid, 0:grid]
+        centers = np.stack([(xs + 0.5) / grid, (ys + 0.5) / grid], axis=-1).reshape(-1, 2)
+        anchors.append(np.repeat(centers, per_cell, axis=0))
+    return np.concatenate(anchors).astype(np.float32)
+
+ANCHORS = _ssd_anchors()
+
+
+def _normalize_angle(angle):
+    return angle - 2 * math.pi * math.floor((angle + math.pi) / (2 * math.pi))
+
+
+def _rotation(x0, y0, x1, y1):
+    """Rotação que deixa o vetor (x0,y0)→(x1,y1) apontando para cima"""
+    return _normalize_angle(math.pi / 2 - math.atan2(-(y1 - y0), x1 - x0))
+
+
+def _transform_rect(cx, cy, w, h, angle, scale, shift_y):
+    """Desloca e expande a ROI como o RectTransformationCalculator (em pixels)"""
+    cx -= h * shift_y * math.sin(angle)
+    cy += h * shift_y * math.cos(angle)
+    size = max(w, h) * scale
+    return cx, cy, size, angle
+
+
+class TFLiteBackend(InferenceBackend):
+    name = "tflite"
+
+    def __init__(self, max_num_hands=1, num_threads=TFLITE_THREADS,
+                 min_detection_confidence=MIN_DET, min_tracking_confidence=MIN_TRK,
+                 palm_model=PALM_MODEL, landmark_model=LANDMARK_MODEL):
+        if Interpreter is None:
+            raise RuntimeError("Nenhum interpretador TFLite encontrado (instale ai-edge-litert ou tflite-runtime)")
+        self.max_num_hands = max_num_hands
+        self.num_threads = num_threads
+        self.min_det = min_detection_confidence
+        self.min_trk = min_tracking_confidence
+        self.palm = self._load(palm_model)
+        self.landmark = self._load(landmark_model)
+        self.palm_in = self.palm.get_input_details()[0]["index"]
+        self.palm_out = {d["name"]: d["index"] for d in self.palm.get_output_details()}
+        self.landmark_in = self.landmark.get_input_details()[0]["index"]
+        self.landmark_out = {d["name"]: d["index"] for d in self.landmark.get_output_details()}
+        self.rois = []  # ROIs rastreadas: (cx, cy, size, angle) em pixels
+
+    def _load(self, path):
+        interpreter = Interpreter(model_path=path, num_threads=self.num_threads)
+        interpreter.allocate_tensors()
+        return interpreter
+
+    # ----- detecção de palma -----
+    def _detect_palms(self, rgb):
+        height, width = rgb.shape[:2]
+        scale = PALM_SIZE / max(width, height)
+        new_w, new_h = int(round(width * scale)), int(round(height * scale))
+        pad_x, pad_y = (PALM_SIZE - new_w) // 2, (PALM_SIZE - new_h) // 2
+        tensor = np.zeros((PALM_SIZE, PALM_SIZE, 3), np.float32)
+        resized = cv2.resize(rgb, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        tensor[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = resized * (2.0 / 255.0) - 1.0
+
+        self.palm.set_tensor(self.palm_in, tensor[None])
+        self.palm.invoke()
+        raw_boxes = self.palm.get_tensor(self.palm_out["Identity"])[0]
+        raw_scores = self.palm.get_tensor(self.palm_out["Identity_1"])[0, :, 0]
+
+        scores = 1.0 / (1.0 + np.exp(-np.clip(raw_scores, -100.0, 100.0)))
+        keep = np.flatnonzero(scores >= self.min_det)
+        if keep.size == 0:
+            return []
+        raw = raw_boxes[keep] / PALM_SIZE
+        anchors = ANCHORS[keep]
+        cx = raw[:, 0] + anchors[:, 0]
+        cy = raw[:, 1] + anchors[:, 1]
+        w, h = raw[:, 2], raw[:, 3]
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+        kps = raw[:, 4:].reshape(-1, 7, 2) + anchors[:, None, :]
+
+        # coordenadas do tensor (0..1) → pixels da imagem original
+        def to_px(points):
+            out = points * PALM_SIZE
+            out[..., 0] = (out[..., 0] - pad_x) / scale
+            out[..., 1] = (out[..., 1] - pad_y) / scale
+            return out
+
+        boxes = to_px(boxes.reshape(-1, 2, 2)).reshape(-1, 4)
+        kps = to_px(kps)
+        return self._weighted_nms(boxes, kps, scores[keep])
+
+    def _weighted_nms(self, boxes, kps, scores):
+        detections = []
+        order = np.argsort(-scores)
+        while order.size and len(detections) < self.max_num_hands:
+            top = boxes[order[0]]
+            x1 = np.maximum(top[0], boxes[order, 0])
+            y1 = np.maximum(top[1], boxes[order, 1])
+            x2 = np.minimum(top[2], boxes[order, 2])
+            y2 = np.minimum(top[3], boxes[order, 3])
+            inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+            areas = (boxes[order, 2] - boxes[order, 0]) * (boxes[order, 3] - boxes[order, 1])
+            top_area = (top[2] - top[0]) * (top[3] - top[1])
+            iou = inter / np.maximum(areas + top_area - inter, 1e-6)
+            group = order[iou > PALM_NMS_IOU]
+            weights = scores[group][:, None]
+            box = (boxes[group] * weights).sum(0) / weights.sum()
+            kp = (kps[group] * weights[:, :, None]).sum(0) / weights.sum()
+            detections.append((box, kp))
+            order = order[iou <= PALM_NMS_IOU]
+        return detections
+
+    @staticmethod
+    def _palm_to_roi(box, kp):
+        angle = _rotation(kp[PALM_WRIST, 0], kp[PALM_WRIST, 1], kp[PALM_MIDDLE, 0], kp[PALM_MIDDLE, 1])
+        cx, cy = (box[0] + box[2]) / 2, (box[1] + box[3]) / 2
+        w, h = box[2] - box[0], box[3] - box[1]
+        return _transform_rect(cx, cy, w, h, angle, scale=2.6, shift_y=-0.5)
+
+    @staticmethod
+    def _landmarks_to_roi(points):
+        """ROI de rastreamento a partir dos landmarks (em pixels)"""
+        angle = _rotation(points[LM_WRIST, 0], points[LM_WRIST, 1],
+                          points[LM_MIDDLE_MCP, 0], points[LM_MIDDLE_MCP, 1])
+        subset = points[ROI_LANDMARKS, :2]
+        center = (subset.min(0) + subset.max(0)) / 2
+        cos, sin = math.cos(-angle), math.sin(-angle)
+        rel = subset - center
+        rotated = np.stack([rel[:, 0] * cos - rel[:, 1] * sin, rel[:, 0] * sin + rel[:, 1] * cos], axis=1)
+        lo, hi = rotated.min(0), rotated.max(0)
+        mid = (lo + hi) / 2
+        cos, sin = math.cos(angle), math.sin(angle)
+        cx = center[0] + mid[0] * cos - mid[1] * sin
+        cy = center[1] + mid[0] * sin + mid[1] * cos
+        w, h = hi - lo
+        return _transform_rect(cx, cy, w, h, angle, scale=2.0, shift_y=-0.1)
+
+    # ----- landmarks -----
+    @staticmethod
+    def _roi_matrix(roi):
+        """Matriz afim que leva o quadrado de saída (224x224) para a ROI"""
+        cx, cy, size, angle = roi
+        cos, sin = math.cos(angle), math.sin(angle)
+        s = size / LANDMARK_SIZE
+        return np.array([[cos * s, -sin * s, cx - (cos - sin) * size / 2],
+                         [sin * s, cos * s, cy - (sin + cos) * size / 2]], np.float64)
+
+    def _run_landmarks(self, rgb, roi):
+        matrix = self._roi_matrix(roi)
+        crop = cv2.warpAffine(rgb, matrix, (LANDMARK_SIZE, LANDMARK_SIZE),
+                              flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP,
+                              borderMode=cv2.BORDER_CONSTANT)
+        self.landmark.set_tensor(self.landmark_in, (crop.astype(np.float32) / 255.0)[None])
+        self.landmark.invoke()
+        presence = float(self.landmark.get_tensor(self.landmark_out["Identity_1"]).ravel()[0])
+        if presence < self.min_trk:
+            return None
+        handed_score = float(self.landmark.get_tensor(self.landmark_out["Identity_2"]).ravel()[0])
+        raw = self.landmark.get_tensor(self.landmark_out["Identity"]).reshape(21, 3)
+        points = np.empty((21, 3), np.float64)
+        points[:, 0] = matrix[0, 0] * raw[:, 0] + matrix[0, 1] * raw[:, 1] + matrix[0, 2]
+        points[:, 1] = matrix[1, 0] * raw[:, 0] + matrix[1, 1] * raw[:, 1] + matrix[1, 2]
+        points[:, 2] = raw[:, 2] * roi[2] / LANDMARK_SIZE
+        return points, "Right" if handed_score > 0.5 else "Left"
+
+    def _finish_warmup(self):
+        self.rois = []
+
+    def process(self, rgb, timestamp_ms=None):
+        start = time.perf_counter()
+        height, width = rgb.shape[:2]
+        rois = list(self.rois)
+        if len(rois) < self.max_num_hands:
+            for box, kp in self._detect_palms(rgb):
+                roi = self._palm_to_roi(box, kp)
+                # ignora palmas que já estão sendo rastreadas
+                if all(math.hypot(roi[0] - r[0], roi[1] - r[1]) > r[2] / 4 for r in rois):
+                    rois.append(roi)
+
+        landmarks, handedness, self.rois = [], [], []
+        for roi in rois[:self.max_num_hands]:
+            found = self._run_landmarks(rgb, roi)
+            if found is None:
+                continue
+            points, label = found
+            self.rois.append(self._landmarks_to_roi(points))
+            normalized = points / np.array([width, height, width], np.float64)
+            landmarks.append(landmark_list_from_array(normalized))
+            handedness.append(label)
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        return HandsResult(landmarks, handedness, timestamp_ms, latency_ms)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Rastreamento de várias mãos com filtro de gestos por mão.
+
+Cada mão detectada recebe um ID estável, associado frame a frame pelo
+centróide dos landmarks (vizinho mais próximo, guloso). Cada trilha tem o
+seu próprio ``GestureFilter``, então uma segunda pessoa entrando no quadro
+não contamina a janela de histórico da mão que está controlando os slides.
+
+A política de controle decide qual trilha pode disparar ações:
+
+- ``first``: a trilha mais antiga ainda ativa (padrão);
+- ``largest``: a mão maior (mais próxima da câmera);
+- ``right`` / ``left``: a primeira mão com essa lateralidade;
+- ``any``: qualquer trilha com gesto estável (a mais antiga primeiro).
+
+Cada trilha também tem um ``SwipeDetector``; ``track.swipe_action`` traz a
+ação do swipe detectado no frame atual (ou None).
+
+A máscara de dedos de cada trilha guarda o frame anterior (histerese por
+dedo) e o rastreador conta quantas vezes a classificação bruta de uma mão
+muda de um frame para o seguinte (``flicker_rate``): quanto menor, menor a
+janela do filtro pode ser sem gerar disparos falsos.
+"""
+import time
+
+from gestures import (GestureFilter, SwipeDetector, apply_hysteresis, finger_bits,
+                      ACTION_TABLE, DEFAULT_TUNING, GESTURE_WINDOW_SIZE, CONSISTENCY_THRESHOLD, SWIPE_TABLE)
+
+# ===== Configurações =====
+TRACK_MAX_DISTANCE = 0.15   # distância máxima (coord. normalizadas) para manter o ID
+TRACK_MAX_MISSING = 5       # frames sem a mão antes de descartar a trilha
+HAND_POLICIES = ("first", "largest", "right", "left", "any")
+
+
+def landmark_centroid(landmarks):
+    xs = [p.x for p in landmarks]
+    ys = [p.y for p in landmarks]
+    return sum(xs) / len(xs), sum(ys) / len(ys), (max(xs) - min(xs)) * (max(ys) - min(ys))
+
+
+class HandTrack:
+    def __init__(self, track_id, window_size, threshold):
+        self.id = track_id
+        self.filter = GestureFilter(window_size, threshold)
+        self.centroid = None
+        self.area = 0.0
+        self.handed = "Right"
+        self.landmarks = None   # NormalizedLandmarkList do frame atual (ou None)
+        self.detection = None   # índice da mão no resultado do frame atual
+        self.raw_action = "neutral"
+        self.mask = 0              # máscara de dedos do frame anterior (histerese)
+        self.previous_raw = None   # classificação bruta do frame anterior (None = sem mão)
+        self.swipe = SwipeDetector()
+        self.swipe_gesture = None  # "swipe_left"/"swipe_right" detectado neste frame
+        self.swipe_action = None
+        self.missing = 0
+
+    def update(self, detection, landmarks, handed, centroid, area):
+        self.detection = detection
+        self.landmarks = landmarks
+        self.handed = handed
+        self.centroid = centroid
+        self.area = area
+        self.missing = 0
+
+
+class HandTracker:
+    def __init__(self, policy="first", window_size=GESTURE_WINDOW_SIZE,
+                 threshold=CONSISTENCY_THRESHOLD, max_distance=TRACK_MAX_DISTANCE,
+                 max_missing=TRACK_MAX_MISSING, tuning=None):
+        if policy not in HAND_POLICIES:
+            raise ValueError(f"Política de mão desconhecida: {policy}")
+        self.policy = policy
+        self.window_size = window_size
+        self.threshold = threshold
+        self.tuning = tuning or DEFAULT_TUNING  # margens e histerese dos dedos
+        self.max_distance = max_distance
+        self.max_missing = max_missing
+        self.tracks = []  # em ordem de criação (mais antiga primeiro)
+        self.next_id = 1
+        self.raw_frames = 0   # frames com a mesma mão no frame anterior
+        self.raw_changes = 0  # desses, quantos mudaram de classificação bruta
+
+    def reset(self):
+        """Descarta as trilhas e zera a oscilação (nova sessão ou câmera reconectada)"""
+        self.tracks = []
+        self.raw_frames = 0
+        self.raw_changes = 0
+
+    def flicker_rate(self):
+        """Fração dos frames em que a classificação bruta de uma mão mudou"""
+        return self.raw_changes / self.raw_frames if self.raw_frames else 0.0
+
+    def update(self, res, action_table=None, swipe_table=None, raw_masks=None):
+        """Associa as mãos do resultado às trilhas e alimenta seus filtros
+
+        ``raw_masks`` (opcional) traz as máscaras ``(entra, mantém)`` de cada
+        mão do resultado, na mesma ordem (ver ``gestures.finger_bits``);
+        usado pelo ``tune.py``, que classifica todos os frames de uma vez.
+        """
+        action_table = action_table or ACTION_TABLE
+        swipe_table = SWIPE_TABLE if swipe_table is None else swipe_table
+        if res is not None and res.timestamp_ms is not None:
+            now = res.timestamp_ms / 1000
+        else:
+            now = time.monotonic()
+        detections = []
+        if res is not None and res.multi_hand_landmarks:
+            for i, lm in enumerate(res.multi_hand_landmarks):
+                handed = res.multi_handedness[i] if i < len(res.multi_handedness) else "Right"
+                cx, cy, area = landmark_centroid(lm.landmark)
+                detections.append((lm, handed, (cx, cy), area))
+
+        # pares (distância, trilha, detecção) do mais próximo ao mais distante
+        pairs = []
+        for t_idx, track in enumerate(self.tracks):
+            for d_idx, (_, _, centroid, _) in enumerate(detections):
+                dx = centroid[0] - track.centroid[0]
+                dy = centroid[1] - track.centroid[1]
+                dist = (dx * dx + dy * dy) ** 0.5
+                if dist <= self.max_distance:
+                    pairs.append((dist, t_idx, d_idx))
+        pairs.sort()
+        if len(self.tracks) == 1 and len(detections) == 1:
+            # sem ambiguidade: mantém o ID mesmo em movimentos rápidos (swipes)
+            pairs = [(0.0, 0, 0)]
+
+        matched_tracks, matched_dets = set(), set()
+        for _, t_idx, d_idx in pairs:
+            if t_idx in matched_tracks or d_idx in matched_dets:
+                continue
+            matched_tracks.add(t_idx)
+            matched_dets.add(d_idx)
+            self.tracks[t_idx].update(d_idx, *detections[d_idx])
+
+        for t_idx, track in enumerate(self.tracks):
+            if t_idx not in matched_tracks:
+                track.landmarks = track.detection = None
+                track.missing += 1
+        for d_idx, det in enumerate(detections):
+            if d_idx not in matched_dets:
+                track = HandTrack(self.next_id, self.window_size, self.threshold)
+                self.next_id += 1
+                track.update(d_idx, *det)
+                self.tracks.append(track)
+        self.tracks = [t for t in self.tracks if t.missing <= self.max_missing]
+
+        # classificação e filtro por mão (mão ausente conta como neutro)
+        for track in self.tracks:
+            if track.landmarks is not None:
+                if raw_masks is not None:
+                    enter, keep = raw_masks[track.detection]
+                else:
+                    enter, keep = finger_bits(track.landmarks.landmark, track.handed, self.tuning)
+                track.mask = apply_hysteresis(enter, keep, track.mask)
+                track.raw_action = action_table[track.mask]
+                if track.previous_raw is not None:
+                    self.raw_frames += 1
+                    self.raw_changes += track.raw_action != track.previous_raw
+                track.previous_raw = track.raw_action
+            else:
+                track.raw_action = "neutral"
+                track.mask = 0
+                track.previous_raw = None
+            track.filter.add(track.raw_action)
+
+            track.swipe_gesture = track.swipe_action = None
+            if swipe_table:
+                lm = track.landmarks.landmark if track.landmarks is not None else None
+                track.swipe_gesture = track.swipe.update(now, lm)
+                track.swipe_action = swipe_table.get(track.swipe_gesture)
+                if track.swipe_action:
+                    # a pose durante o movimento não vira gesto estático logo depois
+                    track.filter.clear()
+        return self.tracks
+
+    def active(self):
+        """Trilha que pode disparar ações segundo a política (ou None)"""
+        # trilhas momentaneamente ausentes continuam na disputa: o filtro
+        # delas recebe "neutral", então não disparam, mas não cedem o controle
+        if not self.tracks:
+            return None
+        if self.policy == "largest":
+            return max(self.tracks, key=lambda t: t.area)
+        if self.policy in ("right", "left"):
+            label = self.policy.capitalize()
+            return next((t for t in self.tracks if t.handed == label), None)
+        if self.policy == "any":
+            return next((t for t in self.tracks if t.filter.stable() != "neutral"), self.tracks[0])
+        return self.tracks[0]
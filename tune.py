@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""Varredura offline dos parâmetros do filtro de gestos do WaveControl.
+
+Reproduz trilhas rotuladas (ver ``replay.py``) para cada combinação de
+janela do filtro, limiar de consistência, margens dos dedos e histerese, e
+mede a latência de detecção, a taxa de disparos falsos dos gestos
+estáticos e a oscilação da classificação bruta.
+
+O teste dos dedos é vetorizado (``gestures.finger_masks``): todas as mãos
+de uma trilha são testadas de uma vez por combinação de margens, gerando
+as máscaras "entra" e "mantém" da histerese. O rastreamento, a histerese,
+o filtro e a lógica de disparo são os mesmos do loop principal
+(``replay.replay``). As combinações são distribuídas num pool de
+processos; cada processo carrega as trilhas uma única vez.
+
+Ao final, as combinações na fronteira de Pareto (latência p50, falsos
+positivos/min, fração de gestos perdidos) são listadas, e a escolhida — a
+mais rápida dentro dos limites de ``--max-fp`` e ``--max-miss`` — é gravada
+na seção ``"tuning"`` de uma cópia da configuração de gestos.
+
+Uso:
+  python3 tune.py sessao.jsonl sintetico.jsonl --out gestures_ajustado.json
+  python3 tune.py sessao.jsonl --window 6 8 10 --threshold 0.7 0.8 --jobs 4
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from gestures import (DEFAULT_TUNING, build_swipe_table, find_gesture_config, finger_masks,
+                      load_gesture_config, load_tuning)
+from replay import LABEL_TOLERANCE_MS, evaluate, frames_to_results, load_trace, replay
+from tracking import HAND_POLICIES, HandTracker
+
+# ===== Configurações =====
+TUNE_WINDOWS = [4, 6, 8, 10, 12]
+TUNE_THRESHOLDS = [0.6, 0.7, 0.75, 0.8, 0.9]
+TUNE_FINGER_MARGINS = [0.15, 0.25, 0.35]  # frações do tamanho da mão
+TUNE_THUMB_MARGINS = [0.15, 0.25, 0.35]
+TUNE_HYSTERESIS = [0.0, 0.1, 0.2]
+TUNE_MAX_FP_PER_MIN = 0.5    # limite de falsos positivos/min para a escolha
+TUNE_MAX_MISS = 0.1          # fração máxima de gestos perdidos para a escolha
+TUNE_OUT = "gestures_ajustado.json"
+
+_traces = None  # trilhas preparadas, por processo do pool
+
+
+class PreparedTrace:
+    """Trilha pronta para vários replays: resultados e mãos empilhadas"""
+
+    def __init__(self, path, action_table):
+        _, frames, labels = load_trace(path)
+        self.path = path
+        self.results = frames_to_results(frames)
+        static_actions = set(action_table) - {"neutral"}
+        self.labels = [label for label in labels if label["gesture"] in static_actions]
+        self.duration_s = (frames[-1]["ts_ms"] - frames[0]["ts_ms"]) / 1000 if len(frames) > 1 else 0.0
+        hands = [h for fr in frames for h in fr["hands"]]
+        self.points = np.array([h["landmarks"] for h in hands], np.float32).reshape(-1, 21, 3)
+        self.right = np.array([h["handed"] == "Right" for h in hands], bool)
+        self.offsets = np.cumsum([0] + [len(fr["hands"]) for fr in frames])
+
+    def raw_masks(self, finger_margin, thumb_margin, hysteresis):
+        """Máscaras (entra, mantém) por frame e por mão"""
+        enter = finger_masks(self.points, self.right, finger_margin, thumb_margin).tolist()
+        keep = finger_masks(self.points, self.right, finger_margin - hysteresis,
+                            thumb_margin - hysteresis).tolist()
+        masks = list(zip(enter, keep))
+        return [masks[a:b] for a, b in zip(self.offsets[:-1], self.offsets[1:])]
+
+
+def _init_worker(paths, gestures_path, policy, tolerance_ms):
+    global _traces
+    action_table, _, bindings = load_gesture_config(gestures_path)
+    _traces = {
+        "items": [PreparedTrace(p, action_table) for p in paths],
+        "action_table": action_table,
+        "swipe_table": build_swipe_table(bindings),
+        "policy": policy,
+        "tolerance_ms": tolerance_ms,
+    }
+
+
+def _run_unit(unit):
+    """Avalia todos os limiares de uma janela + margens + histerese"""
+    window_size, thresholds, finger_margin, thumb_margin, hysteresis = unit
+    ctx = _traces
+    raw = [t.raw_masks(finger_margin, thumb_margin, hysteresis) for t in ctx["items"]]
+    rows = []
+    for threshold in thresholds:
+        labels = hits = false_positives = raw_frames = raw_changes = 0
+        latencies, duration_s = [], 0.0
+        for trace, raw_masks in zip(ctx["items"], raw):
+            tracker = HandTracker(ctx["policy"], window_size, threshold)
+            events, _ = replay(trace.results, tracker, ctx["action_table"], ctx["swipe_table"], raw_masks)
+            raw_frames += tracker.raw_frames
+            raw_changes += tracker.raw_changes
+            events = [e for e in events if not e[1].startswith("swipe_")]
+            for s in evaluate(events, trace.labels, ctx["tolerance_ms"]).values():
+                labels += s["labels"]
+                hits += s["hits"]
+                false_positives += s["false_positives"]
+                latencies += s["latencies"]
+            duration_s += trace.duration_s
+        rows.append({
+            "window_size": window_size,
+            "threshold": threshold,
+            "finger_margin": finger_margin,
+            "thumb_margin": thumb_margin,
+            "hysteresis": hysteresis,
+            "labels": labels,
+            "latency_p50_ms": float(np.percentile(latencies, 50)) if latencies else float("inf"),
+            "latency_p95_ms": float(np.percentile(latencies, 95)) if latencies else float("inf"),
+            "fp_per_min": false_positives / (duration_s / 60) if duration_s > 0 else 0.0,
+            "miss_rate": (labels - hits) / labels if labels else 0.0,
+            "flicker": raw_changes / raw_frames if raw_frames else 0.0,
+        })
+    return rows
+
+
+def objectives(row):
+    return row["latency_p50_ms"], row["fp_per_min"], row["miss_rate"]
+
+
+def pareto_front(rows):
+    """Combinações que nenhuma outra supera em todos os objetivos"""
+    front = []
+    for row in rows:
+        obj = objectives(row)
+        dominated = any(all(o <= v for o, v in zip(objectives(other), obj)) and objectives(other) != obj
+                        for other in rows)
+        if not dominated:
+            front.append(row)
+    return sorted(front, key=objectives)
+
+
+def choose(front, max_fp=TUNE_MAX_FP_PER_MIN, max_miss=TUNE_MAX_MISS):
+    """A mais rápida dentro dos limites; sem nenhuma, a que menos erra"""
+    ok = [r for r in front if r["fp_per_min"] <= max_fp and r["miss_rate"] <= max_miss]
+    if ok:
+        return min(ok, key=objectives)
+    return min(front, key=lambda r: (r["miss_rate"] + r["fp_per_min"], r["latency_p50_ms"]))
+
+
+def sweep(paths, windows, thresholds, finger_margins, thumb_margins, hysteresis, gestures_path=None,
+          policy="first", tolerance_ms=LABEL_TOLERANCE_MS, jobs=None):
+    """Avalia a grade inteira; retorna as linhas na ordem da grade"""
+    units = [(w, thresholds, fm, tm, h)
+             for fm, tm, h, w in itertools.product(finger_margins, thumb_margins, hysteresis, windows)]
+    initargs = (paths, gestures_path, policy, tolerance_ms)
+    if jobs == 1:
+        _init_worker(*initargs)
+        return [row for unit in units for row in _run_unit(unit)]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as pool:
+        return [row for rows in pool.map(_run_unit, units) for row in rows]
+
+
+def is_current(row, tuning):
+    return all(row[k] == tuning[k] for k in DEFAULT_TUNING)
+
+
+def print_rows(rows, tuning, chosen):
+    print(f"{'janela':>6} {'limiar':>6} {'margem':>6} {'polegar':>7} {'histerese':>9} "
+          f"{'latência p50/p95 (ms)':>22} {'falsos+/min':>11} {'perdidos':>8} {'oscilação':>9}")
+    for r in rows:
+        mark = "⭐" if r is chosen else ("•" if is_current(r, tuning) else " ")
+        print(f"{r['window_size']:>6} {r['threshold']:>6.2f} {r['finger_margin']:>6.2f} {r['thumb_margin']:>7.2f} "
+              f"{r['hysteresis']:>9.2f} {r['latency_p50_ms']:>10.0f} /{r['latency_p95_ms']:>9.0f} "
+              f"{r['fp_per_min']:>11.2f} {r['miss_rate']:>8.0%} {r['flicker']:>9.1%} {mark}")
+
+
+def write_config(path, gestures_path, tuning):
+    """Copia a configuração de gestos com a seção "tuning" escolhida"""
+    source = gestures_path or find_gesture_config()
+    config = {}
+    if source:
+        with open(source, encoding="utf-8") as f:
+            config = json.load(f)
+    config["tuning"] = tuning
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura offline dos parâmetros do filtro de gestos")
+    parser.add_argument("traces", nargs="+", help="trilhas .jsonl rotuladas (replay.py record/synth)")
+    parser.add_argument("--gestures", help="arquivo JSON com a tabela de gestos (base da saída)")
+    parser.add_argument("--window", nargs="+", type=int, default=TUNE_WINDOWS, help="janelas do filtro (frames)")
+    parser.add_argument("--threshold", nargs="+", type=float, default=TUNE_THRESHOLDS,
+                        help="limiares de consistência")
+    parser.add_argument("--finger-margin", nargs="+", type=float, default=TUNE_FINGER_MARGINS,
+                        help="margens ponta/articulação dos dedos (frações do tamanho da mão)")
+    parser.add_argument("--thumb-margin", nargs="+", type=float, default=TUNE_THUMB_MARGINS,
+                        help="margens do polegar (frações do tamanho da mão)")
+    parser.add_argument("--hysteresis", nargs="+", type=float, default=TUNE_HYSTERESIS,
+                        help="histereses por dedo (frações do tamanho da mão)")
+    parser.add_argument("--hand-policy", choices=HAND_POLICIES, default="first")
+    parser.add_argument("--tolerance", type=int, default=LABEL_TOLERANCE_MS,
+                        help="ms após o fim do rótulo em que a detecção ainda vale (padrão: %(default)s)")
+    parser.add_argument("--max-fp", type=float, default=TUNE_MAX_FP_PER_MIN,
+                        help="falsos positivos/min aceitos na escolha (padrão: %(default)s)")
+    parser.add_argument("--max-miss", type=float, default=TUNE_MAX_MISS,
+                        help="fração de gestos perdidos aceita na escolha (padrão: %(default)s)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="processos do pool (padrão: nº de CPUs)")
+    parser.add_argument("--all", action="store_true", help="lista todas as combinações, não só a fronteira")
+    parser.add_argument("--report", help="grava todas as combinações (JSON) com a fronteira marcada")
+    parser.add_argument("--out", default=TUNE_OUT, help="configuração de gestos gerada (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    try:
+        tuning = load_tuning(args.gestures)
+    except (OSError, ValueError) as e:
+        print(f"❌ Erro na tabela de gestos: {e}")
+        return 1
+
+    combos = (len(args.window) * len(args.threshold) * len(args.finger_margin) * len(args.thumb_margin)
+              * len(args.hysteresis))
+    print(f"🔧 {combos} combinações em {len(args.traces)} trilha(s), {args.jobs} processo(s)")
+    start = time.perf_counter()
+    try:
+        rows = sweep(args.traces, args.window, args.threshold, args.finger_margin, args.thumb_margin,
+                     args.hysteresis, args.gestures, args.hand_policy, args.tolerance, args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"❌ Erro ao ler as trilhas: {e}")
+        return 1
+    print(f"⏱️  {time.perf_counter() - start:.1f} s")
+    if not any(r["labels"] for r in rows):
+        print("❌ As trilhas não têm rótulos de gestos estáticos")
+        return 1
+
+    front = pareto_front(rows)
+    chosen = choose(front, args.max_fp, args.max_miss)
+    print(f"\n📈 Fronteira de Pareto ({len(front)} de {len(rows)}; ⭐ escolhida, • atual):")
+    print_rows(front, tuning, chosen)
+    current = next((r for r in rows if is_current(r, tuning)), None)
+    if args.all:
+        print("\n📋 Todas as combinações:")
+        print_rows(rows, tuning, chosen)
+    elif current is not None and current not in front:
+        print("\n• Configuração atual (fora da fronteira):")
+        print_rows([current], tuning, chosen)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            report = [{k: (v if v != float("inf") else None) for k, v in dict(r, pareto=r in front).items()}
+                      for r in rows]
+            json.dump(report, f, indent=2)
+        print(f"📝 Relatório: {args.report}")
+    write_config(args.out, args.gestures, {k: chosen[k] for k in DEFAULT_TUNING})
+    print(f"💾 Configuração escolhida gravada em {args.out} "
+          f"(use --gestures {args.out} ou copie a seção \"tuning\")")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())